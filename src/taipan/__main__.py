@@ -1,11 +1,75 @@
 """Main entry point for Taipan."""
 
+import argparse
+import json
+
+from taipan.store.autosave import Autosaver
 from taipan.ui.app import TaipanApp
 
 def main():
     """Run the Taipan game."""
-    app = TaipanApp()
-    app.run()
+    parser = argparse.ArgumentParser(description="Play Taipan!")
+    parser.add_argument("--profile-alloc", metavar="REPORT",
+                        help="Profile allocations while playing and write a JSON"
+                             " report")
+    parser.add_argument("--new", action="store_true",
+                        help="Start a new game instead of resuming the last one")
+    parser.add_argument("--no-splash", action="store_true",
+                        help="Skip the splash screens")
+    parser.add_argument("--export", metavar="DATASET",
+                        help="Record every turn into a columnar dataset for analysis")
+    parser.add_argument("--record", metavar="FILE",
+                        help="Record the session for replay, e.g. to attach to a"
+                             " bug report")
+    parser.add_argument("--world", type=int, metavar="PORTS",
+                        help="Start a grand campaign in a generated world of PORTS"
+                             " ports")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for the generated world and economy")
+    parser.add_argument("--economy", type=int, metavar="SHIPS",
+                        help="Trade against an economy of SHIPS NPC merchants")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile_alloc:
+        from taipan.bench.alloc import AllocationProfiler, print_report
+        profiler = AllocationProfiler()
+        profiler.start()
+
+    autosaver = Autosaver()
+    exporter = None
+    if args.export:
+        from taipan.store.columnar import TurnWriter
+        exporter = TurnWriter(args.export)
+    recorder = None
+    if args.record:
+        from taipan.store.recording import Recorder
+        recorder = Recorder(args.record)
+    world = None
+    if args.world:
+        from taipan.models.world import World
+        world = World.generate(args.world, args.seed)
+    economy = None
+    if args.economy:
+        from taipan.models.economy import NpcEconomy
+        economy = NpcEconomy(args.economy, args.seed)
+    app = TaipanApp(autosaver=autosaver, resume=not args.new and not args.world,
+                    splash=not args.no_splash, exporter=exporter, recorder=recorder,
+                    world=world, economy=economy)
+    try:
+        app.run()
+    finally:
+        autosaver.close()  # Finish writing the last save
+        if exporter is not None:
+            exporter.close()
+        if recorder is not None:
+            recorder.close()
+        if profiler is not None:
+            profiler.stop()
+            report = profiler.report()
+            with open(args.profile_alloc, "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            print_report(report)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,278 @@
+"""Allocation profiling by screen and by engine command.
+
+While profiling, every screen's ``compose`` and ``_render_*`` methods, the
+app's ``update_status`` and every ``GameEngine`` command run inside a
+window keyed like ``TradeScreen._render_cargo`` or ``GameEngine.buy_cargo``.
+For each window the profiler records:
+
+- ``bytes``/``sites``: memory still held when the call returns, by the line
+  that allocated it (what a render builds, e.g. its ``Table`` and ``Panel``),
+- ``peak``: the most memory the call had allocated at once, which also
+  counts temporaries it freed before returning,
+- ``gc_collections``/``gc_seconds``: garbage collections, and the pause
+  they caused, that the window's allocations triggered.
+
+Play a profiled game, script one, or compare two reports:
+
+    python -m taipan --profile-alloc alloc.json
+    python -m taipan.bench.alloc --scenario new_game -o alloc.json
+    python -m taipan.bench.alloc --diff before.json after.json
+"""
+
+import argparse
+import asyncio
+import functools
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from textual.screen import Screen
+
+from taipan.bench.loadtest import SCENARIOS
+from taipan.models.game_engine import GameEngine
+from taipan.ui.headless import play
+
+COMMANDS = (
+    "start_game", "buy", "sell", "buy_cargo", "sell_cargo", "travel_to",
+    "travel_to_port", "deposit_money", "withdraw_money", "borrow_money",
+    "repay_debt", "repair_ship", "add_gun", "remove_gun",
+)
+TOP_SITES = 10
+TOLERANCE = 0.25  # Relative growth in bytes per call that counts as a regression
+
+
+def _empty_window() -> Dict[str, Any]:
+    """Create the counters for one window key."""
+    return {"calls": 0, "bytes": 0, "peak": 0, "gc_collections": 0,
+            "gc_seconds": 0.0, "sites": {}}
+
+
+class AllocationProfiler:
+    """Attributes allocations and GC pauses to screens and engine commands."""
+
+    def __init__(self, frames: int = 1):
+        """Initialize the profiler, tracing ``frames`` stack frames per allocation."""
+        self.frames = frames
+        self.windows: Dict[str, Dict[str, Any]] = {}
+        self._current: Optional[str] = None
+        self._gc_start = 0.0
+        self._patched: List[tuple] = []
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+
+    @contextmanager
+    def window(self, key: str) -> Iterator[None]:
+        """Profile a block of code under a key; nested windows fold into the outer."""
+        if self._current is not None or not tracemalloc.is_tracing():
+            yield
+            return
+        self._current = key
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+            _, peak = tracemalloc.get_traced_memory()
+            self._current = None
+            stats = self.windows.setdefault(key, _empty_window())
+            stats["calls"] += 1
+            stats["peak"] = max(stats["peak"], peak)
+            sites = stats["sites"]
+            for stat in snapshot.statistics("lineno"):
+                frame = stat.traceback[0]
+                site = f"{frame.filename}:{frame.lineno}"
+                size, count = sites.get(site, (0, 0))
+                sites[site] = (size + stat.size, count + stat.count)
+                stats["bytes"] += stat.size
+
+    def _on_gc(self, phase: str, info: Dict[str, int]) -> None:
+        """Charge a garbage collection to the window that triggered it."""
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+            return
+        key = self._current or "(outside windows)"
+        stats = self.windows.setdefault(key, _empty_window())
+        stats["gc_collections"] += 1
+        stats["gc_seconds"] += time.perf_counter() - self._gc_start
+
+    def _wrap(self, owner: type, name: str, key: str) -> None:
+        """Run a method inside a window, for as long as the profiler runs."""
+        method = owner.__dict__[name]
+        profiler = self
+
+        if name == "compose":
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                with profiler.window(key):
+                    widgets = list(method(*args, **kwargs))
+                return iter(widgets)
+        else:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                with profiler.window(key):
+                    return method(*args, **kwargs)
+
+        setattr(owner, name, wrapper)
+        self._patched.append((owner, name, method))
+
+    def _instrument(self) -> None:
+        """Wrap the screens, the app and the engine commands."""
+        from taipan.ui import app, port, screens, splash, trade, travel  # noqa: F401
+
+        pending = list(Screen.__subclasses__())
+        while pending:
+            cls = pending.pop()
+            pending.extend(cls.__subclasses__())
+            if not cls.__module__.startswith("taipan."):
+                continue
+            for name in list(cls.__dict__):
+                if name == "compose" or name.startswith("_render_"):
+                    self._wrap(cls, name, f"{cls.__name__}.{name}")
+
+        update_status = app.TaipanApp.update_status
+        profiler = self
+
+        @functools.wraps(update_status)
+        def timed_update_status(self) -> None:
+            with profiler.window(f"{type(self.screen).__name__}.update_status"):
+                update_status(self)
+
+        app.TaipanApp.update_status = timed_update_status
+        self._patched.append((app.TaipanApp, "update_status", update_status))
+
+        for name in COMMANDS:
+            self._wrap(GameEngine, name, f"GameEngine.{name}")
+
+    def start(self) -> None:
+        """Start tracing allocations and collections."""
+        self._instrument()
+        gc.callbacks.append(self._on_gc)
+        tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        """Stop tracing and restore the wrapped methods."""
+        tracemalloc.stop()
+        gc.callbacks.remove(self._on_gc)
+        for owner, name, method in reversed(self._patched):
+            setattr(owner, name, method)
+        self._patched.clear()
+
+    def report(self, top: int = TOP_SITES) -> Dict[str, Any]:
+        """Get the results, keeping each window's ``top`` allocation sites."""
+        windows = {}
+        for key, stats in sorted(self.windows.items()):
+            sites = sorted(stats["sites"].items(), key=lambda s: -s[1][0])[:top]
+            windows[key] = {
+                **stats,
+                "sites": [{"site": s, "bytes": b, "count": c} for s, (b, c) in sites],
+            }
+        return {"windows": windows}
+
+
+def grouped(report: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Total a report per screen and per engine command."""
+    groups: Dict[str, Dict[str, float]] = {}
+    for key, stats in report["windows"].items():
+        owner, _, name = key.partition(".")
+        if not name:
+            group = owner
+        elif owner == "GameEngine":
+            group = f"command {name}"
+        else:
+            group = f"screen {owner}"
+        totals = groups.setdefault(
+            group, {"calls": 0, "bytes": 0, "gc_collections": 0, "gc_seconds": 0.0}
+        )
+        for field in totals:
+            totals[field] += stats[field]
+    return groups
+
+
+def print_report(report: Dict[str, Any], out=sys.stdout) -> None:
+    """Print the totals per screen and command, then the top sites per window."""
+    print(f"{'':<34}{'calls':>7}{'KiB':>10}{'GCs':>6}{'GC ms':>9}", file=out)
+    for group, totals in sorted(grouped(report).items(), key=lambda g: -g[1]["bytes"]):
+        print(f"{group:<34}{totals['calls']:>7}{totals['bytes'] / 1024:>10.1f}"
+              f"{totals['gc_collections']:>6}{totals['gc_seconds'] * 1000:>9.1f}",
+              file=out)
+    for key, stats in report["windows"].items():
+        if not stats["sites"]:
+            continue
+        print(f"\n{key}: {stats['bytes'] / max(1, stats['calls']) / 1024:.1f} KiB/call,"
+              f" peak {stats['peak'] / 1024:.1f} KiB", file=out)
+        for site in stats["sites"][:5]:
+            kib = site["bytes"] / 1024
+            print(f"  {kib:>9.1f} KiB {site['count']:>7}  {site['site']}", file=out)
+
+
+def diff(
+    before: Dict[str, Any], after: Dict[str, Any], tolerance: float = TOLERANCE
+) -> List[str]:
+    """List the windows whose bytes per call grew by more than ``tolerance``."""
+    grew = []
+    for key, stats in sorted(after["windows"].items()):
+        old = before["windows"].get(key)
+        if not old or not old["calls"] or not stats["calls"]:
+            continue
+        old_rate = old["bytes"] / old["calls"]
+        new_rate = stats["bytes"] / stats["calls"]
+        if new_rate > old_rate * (1 + tolerance):
+            grew.append(
+                f"{key}: {old_rate / 1024:.1f} -> {new_rate / 1024:.1f} KiB/call"
+            )
+    return grew
+
+
+def profile(run: Callable[[], Any], frames: int = 1) -> Dict[str, Any]:
+    """Run a callable under the profiler and return the report."""
+    profiler = AllocationProfiler(frames)
+    profiler.start()
+    try:
+        run()
+    finally:
+        profiler.stop()
+    return profiler.report()
+
+
+def main() -> None:
+    """Profile a scripted session's allocations, or diff two reports."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--scenario", default="trade", choices=sorted(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=1, help="Stack depth per site")
+    parser.add_argument("-o", "--output", help="Write the report as JSON")
+    parser.add_argument("--diff", nargs=2, metavar=("BEFORE", "AFTER"))
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    if args.diff:
+        with open(args.diff[0]) as f:
+            before = json.load(f)
+        with open(args.diff[1]) as f:
+            after = json.load(f)
+        grew = diff(before, after, args.tolerance)
+        for line in grew:
+            print(line)
+        if grew:
+            sys.exit(1)
+        print("No allocation regressions")
+        return
+
+    report = profile(
+        lambda: asyncio.run(play(SCENARIOS[args.scenario], (100, 60))),
+        args.frames,
+    )
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Autopilot check: the UI stays responsive while the firm runs itself.
+
+Starts the autopilot with no pause between voyages, the heaviest load it
+can put on the app, and meanwhile times keys typed into the command line
+and how late the event loop wakes from short sleeps. Then presses Esc and
+checks the helm comes back at once, with no voyage landing afterwards.
+
+    python -m taipan.bench.autopilot --seconds 2
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from textual import events
+
+from taipan.bench.loadtest import summarize
+from taipan.models.game_engine import GameEngine
+from taipan.ui import autopilot
+from taipan.ui.widgets import CommandLine
+
+TICK = 0.005  # Seconds the loop-lag probe sleeps for
+
+
+async def _press(app, key: str, done) -> float:
+    """Post a key press and time it until ``done()`` says it took effect."""
+    before = time.perf_counter()
+    app.post_message(events.Key(key, key if len(key) == 1 else None))
+    while not done():
+        await asyncio.sleep(0)
+    return time.perf_counter() - before
+
+
+async def _probe(lags: List[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes from short sleeps."""
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - before - TICK)
+
+
+async def measure(seconds: float = 2.0, voyages: int = 100000) -> Dict:
+    """Type during an unpaced autopilot run, then take the helm back."""
+    from taipan.ui.app import TaipanApp
+
+    pace, autopilot.PACE = autopilot.PACE, 0.0
+    samples: Dict[str, List[float]] = {"key": [], "lag": []}
+    try:
+        app = TaipanApp()
+        async with app.run_test(size=(100, 60)) as pilot:
+            app.start_game(GameEngine.new_game("Autopilot", "cash"))
+            await pilot.pause()
+            line = app.screen.query_one(CommandLine)
+            line.focus()
+            cash = app.engine.state.player.cash
+            app.run_command_line(f"a {voyages}")
+
+            stop = asyncio.Event()
+            probe = asyncio.create_task(_probe(samples["lag"], stop))
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                typed = len(line.value)
+                samples["key"].append(
+                    await _press(line, "x", lambda: len(line.value) > typed)
+                )
+                await asyncio.sleep(TICK)
+            stop.set()
+            await probe
+            sailed = app.autopilot.done
+
+            handback = await _press(app, "escape", lambda: app.autopilot is None)
+            state = app.engine.state
+            await asyncio.sleep(0.2)
+            return {
+                "samples": samples,
+                "voyages": sailed,
+                "voyages_per_second": sailed / seconds,
+                "cash": (cash, app.engine.state.player.cash),
+                "handback_ms": handback * 1000,
+                "landed_after": app.engine.state is not state,
+            }
+    finally:
+        autopilot.PACE = pace
+
+
+def main() -> None:
+    """Check that keys stay fast while the autopilot sails, and that Esc stops it."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    result = asyncio.run(measure(args.seconds))
+    print(f"{result['voyages']:,} voyages in {args.seconds:.1f}s"
+          f" ({result['voyages_per_second']:,.0f}/s), cash"
+          f" {result['cash'][0]:,} -> {result['cash'][1]:,}")
+    for name, values in result["samples"].items():
+        summary = summarize(values)
+        print(f"{name:<4} p50 {summary['p50']:6.1f}ms  p90 {summary['p90']:6.1f}ms"
+              f"  max {summary['max']:6.1f}ms  ({summary['count']} samples)")
+    print(f"helm back in {result['handback_ms']:.1f}ms;"
+          f" voyages landed after: {result['landed_after']}")
+    if result["landed_after"] or not result["voyages"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
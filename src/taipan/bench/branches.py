@@ -0,0 +1,79 @@
+"""Branching check: how many speculative branches a game can try per second.
+
+Forks a game, plays a short speculative turn on the branch (sell, buy and
+sail) and discards or commits it, as the autopilot and "what if" tools do.
+Checks that a branch which only reads shares every state node with the
+game, and compares against deep-copying the game for every try.
+
+    python -m taipan.bench.branches --branches 20000
+"""
+
+import argparse
+import copy
+import time
+from typing import Dict
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+
+
+def _turn(engine: GameEngine) -> None:
+    """Play one speculative turn: sell the hold, buy opium and sail on."""
+    for commodity, amount in engine.state.player.ship.hold.items():
+        if amount:
+            engine.sell_cargo(commodity, amount)
+    engine.buy_cargo(Commodity.OPIUM, 1)
+    ports = engine.state.ports
+    here = engine.state.get_current_port_index()
+    engine.travel_to_port(ports[here % (len(ports) - 1) + 1])
+
+
+def measure(branches: int = 20000) -> Dict[str, float]:
+    """Time forked and deep-copied tries; return tries per second."""
+    engine = GameEngine.new_game("Branches", "cash")
+
+    start = time.perf_counter()
+    for i in range(branches):
+        branch = engine.fork()
+        _turn(branch)
+        if i % 10:
+            engine.discard(branch)
+        else:
+            engine.commit(branch)
+    forked = time.perf_counter() - start
+
+    engine = GameEngine.new_game("Branches", "cash")
+    start = time.perf_counter()
+    for i in range(branches):
+        trial = GameEngine(state=copy.deepcopy(engine.state), config=engine.config)
+        _turn(trial)
+        if not i % 10:
+            engine = trial
+    copied = time.perf_counter() - start
+
+    # A branch that only reads shares everything with its parent.
+    idle = engine.fork()
+    idle.sell_cargo(Commodity.SILK, 10 ** 6)  # Fails, so nothing is copied
+    shared = idle.state is engine.state and idle.state.player is engine.state.player
+    engine.discard(idle)
+    return {"fork": branches / forked, "deepcopy": branches / copied,
+            "shared": float(shared)}
+
+
+def main() -> None:
+    """Compare speculative tries per second on forks and on deep copies."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--branches", type=int, default=20000)
+    args = parser.parse_args()
+
+    rates = measure(args.branches)
+    print(f"fork/commit  {rates['fork']:>10,.0f} branches/s")
+    print(f"deepcopy     {rates['deepcopy']:>10,.0f} branches/s"
+          f"  ({rates['fork'] / rates['deepcopy']:.1f}x slower)")
+    if not rates["shared"]:
+        print("a failed trade copied shared state")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
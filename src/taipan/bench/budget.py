@@ -0,0 +1,74 @@
+"""Frame-budget check: quality steps down on a slow link and back up after.
+
+Plays a headless game whose frame writes are slowed down to a multiple of
+the frame budget, as a congested SSH link does, until the app reaches its
+lowest quality level; then removes the delay and counts the frames until
+it is back at full quality.
+
+    python -m taipan.bench.budget --slowdown 2
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from taipan.models.game_engine import GameEngine
+from taipan.net.metrics import QUALITY_CHANGES
+from taipan.ui import quality
+
+
+async def replay(slowdown: float = 2.0, limit: int = 1000) -> Dict[str, List[str]]:
+    """Paint frames through a slow link and then a fast one, recording the levels."""
+    from taipan.ui.app import TaipanApp
+
+    delay = {"seconds": 0.0}
+
+    class SlowApp(TaipanApp):
+        """App whose frame writes take as long as ``delay`` says."""
+
+        def _display(self, screen, renderable) -> None:
+            """Write a frame, then wait as a slow link would."""
+            super()._display(screen, renderable)
+            if renderable is not None:
+                time.sleep(delay["seconds"])
+
+    levels: Dict[str, List[str]] = {"slow": [], "fast": []}
+    app = SlowApp()
+    async with app.run_test(size=(100, 60)) as pilot:
+        app.start_game(GameEngine.new_game("Budget", "cash"))
+        await pilot.pause()
+        for phase, seconds, target in (
+            ("slow", app.quality.budget * slowdown, quality.BARE),
+            ("fast", 0.0, quality.FULL),
+        ):
+            delay["seconds"] = seconds
+            while app.quality.level != target and len(levels[phase]) < limit:
+                app.screen.refresh()
+                await pilot.pause()
+                levels[phase].append(quality.LEVELS[app.quality.level])
+    return levels
+
+
+def main() -> None:
+    """Check that quality follows the frame budget down and back up."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--slowdown", type=float, default=2.0,
+                        help="Frame write time as a multiple of the budget")
+    args = parser.parse_args()
+
+    levels = asyncio.run(replay(args.slowdown))
+    down, up = levels["slow"], levels["fast"]
+    print(f"down to {down[-1]} after {len(down)} slow frames;"
+          f" back to {up[-1]} after {len(up)} fast frames")
+    for (level,), count in sorted(QUALITY_CHANGES.totals().items()):
+        print(f"  taipan_quality_changes{{level={level!r}}} {count:.0f}")
+    expected_down = (quality.DOWN_AFTER + 1) * quality.BARE
+    expected_up = (quality.UP_AFTER + 1) * quality.BARE
+    if (down[-1] != "bare" or len(down) > expected_down
+            or up[-1] != "full" or len(up) > expected_up):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Key-burst replay for the trade screen.
+
+Queues a burst of keystrokes on a headless app all at once, as a paste or a
+held key over SSH does, and checks that the screen keeps up: repaints and
+recomputations must stay within one per frame, and the last key must show
+on screen within the latency budget.
+
+    python -m taipan.bench.burst --keys 1000 --max-latency 1.0
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import time
+from typing import Dict
+
+from textual import constants, events
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.ui.throttle import FRAME_RATE
+
+
+async def replay(keys: int = 1000) -> Dict[str, float]:
+    """Replay a burst of digit keys into the trade amount and measure it."""
+    from taipan.ui.app import TaipanApp
+    from taipan.ui.trade import TradeScreen
+
+    app = TaipanApp()
+    async with app.run_test(size=(100, 60)) as pilot:
+        app.engine = GameEngine.new_game("Burst", "cash")
+        screen = TradeScreen(app.engine.state)
+        screen.selected_cargo = Commodity.GENERAL
+        await app.push_screen(screen)
+        screen.query_one("#amount-input").focus()
+        await pilot.pause()
+
+        renders = 0
+        display = app._display
+
+        def counted_display(*args, **kwargs):
+            nonlocal renders
+            renders += 1
+            return display(*args, **kwargs)
+
+        app._display = counted_display
+        text = "".join(itertools.islice(itertools.cycle("1234567890"), keys))
+        throttle = screen._amount_throttle
+        requests, runs = throttle.requests, throttle.runs
+
+        start = time.perf_counter()
+        for character in text:
+            app.post_message(events.Key(character, character))
+        while screen.trade_amount != int(text):
+            await asyncio.sleep(0.001)
+        latency = time.perf_counter() - start
+        await pilot.pause()
+
+    return {
+        "keys": keys,
+        "latency": latency,
+        "renders": renders,
+        "changes": throttle.requests - requests,
+        "recomputes": throttle.runs - runs,
+    }
+
+
+def check(result: Dict[str, float], max_latency: float) -> Dict[str, bool]:
+    """Check a replay against the frame caps and the latency budget."""
+    # One frame of slack for the frame in flight when the burst began, and
+    # one for the settling pause after it.
+    frames = result["latency"] + 2 / constants.MAX_FPS
+    return {
+        "latency": result["latency"] <= max_latency,
+        "renders": result["renders"] <= math.ceil(frames * constants.MAX_FPS) + 2,
+        "recomputes": (result["recomputes"]
+                       <= math.ceil(result["latency"] * FRAME_RATE) + 1),
+    }
+
+
+def main() -> None:
+    """Replay a key burst and fail if the UI falls behind."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--max-latency", type=float, default=1.0, help="Seconds")
+    args = parser.parse_args()
+
+    result = asyncio.run(replay(args.keys))
+    passed = check(result, args.max_latency)
+    print(f"{result['keys']} keys in {result['latency'] * 1000:.0f}ms: "
+          f"{result['changes']} changes handled, {result['recomputes']} recomputes, "
+          f"{result['renders']} repaints")
+    for name, ok in passed.items():
+        print(f"  {name:<11} {'ok' if ok else 'FAILED'}")
+    if not all(passed.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
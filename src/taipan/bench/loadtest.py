@@ -0,0 +1,185 @@
+"""Load test that drives many headless Taipan sessions through scripted input.
+
+Each session plays a scenario, a script of steps for
+``taipan.ui.headless.play``, against its own headless ``TaipanApp``. The
+default, ``voyage``, starts a game, trades and sails. Sessions are spread
+across worker processes so CPU time can be measured per session; RSS is
+each worker's peak. The JSON report has stable keys, so two releases can
+be compared with ``--compare``.
+
+    python -m taipan.bench.loadtest --sessions 64 --workers 8 -o report.json
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+from taipan.ui.headless import NEW_GAME, Step, play
+
+SCENARIOS: Dict[str, List[Step]] = {"new_game": NEW_GAME}
+# A new game, then a round of trading through the orders line.
+SCENARIOS["trade"] = SCENARIOS["new_game"] + [
+    ("press", "colon"),
+    ("type", "b g 20; t 2"),
+    ("press", "enter"),
+    ("type", "s g all; b a all; t 1"),
+    ("press", "enter"),
+    ("type", "s a all; d all"),
+    ("press", "enter"),
+]
+# A new game, then a visit to each screen: trade, then sail somewhere.
+SCENARIOS["voyage"] = SCENARIOS["new_game"] + [
+    ("click", "#trade-button"),
+    ("screen", "TradeScreen"),
+    ("click", "#amount-input"),
+    ("type", "10"),
+    ("click", "#back-button"),
+    ("screen", "PortScreen"),
+    ("focus", "#travel-button"),  # Scrolled out of view in the actions panel
+    ("press", "enter"),
+    ("screen", "TravelScreen"),
+    ("press", "2"),
+    ("click", "#travel-button"),
+    ("screen", "PortScreen"),
+] + SCENARIOS["trade"][len(SCENARIOS["new_game"]):]
+DEFAULT_SCENARIO = "voyage"
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Get a nearest-rank percentile of some samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Summarize latency samples in milliseconds."""
+    if not samples:
+        return {}
+    summary = {f"p{p}": percentile(samples, p) * 1000 for p in PERCENTILES}
+    summary["max"] = max(samples) * 1000
+    summary["count"] = len(samples)
+    return summary
+
+
+def run_session(scenario: str, size: Tuple[int, int]) -> Dict:
+    """Run one session in this process and measure its CPU time and peak RSS."""
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    result = asyncio.run(play(SCENARIOS[scenario], size))
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    result["wall"] = time.perf_counter() - start
+    result["cpu"] = ((after.ru_utime - before.ru_utime)
+                     + (after.ru_stime - before.ru_stime))
+    # ru_maxrss is the process's peak so far, not this session's: a pool
+    # worker that has run other sessions reports the largest of them. It is
+    # in kilobytes on Linux and bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    result["peak_rss_mb"] = after.ru_maxrss * scale / 2**20
+    return result
+
+
+def run(
+    scenario: str = DEFAULT_SCENARIO,
+    sessions: int = 16,
+    workers: int = 4,
+    size: Tuple[int, int] = (100, 60),
+) -> Dict:
+    """Run many sessions in parallel and build the latency report."""
+    keys: Dict[str, List[float]] = {}
+    transitions: Dict[str, List[float]] = {}
+    cpu: List[float] = []
+    wall: List[float] = []
+    rss: List[float] = []
+    failures = 0
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_session, scenario, size) for _ in range(sessions)]
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as error:  # Report failures, keep the rest
+                print(f"Session failed: {error}", file=sys.stderr)
+                failures += 1
+                continue
+            for name, samples in result["keys"].items():
+                keys.setdefault(name, []).extend(samples)
+            for name, samples in result["transitions"].items():
+                transitions.setdefault(name, []).extend(samples)
+            cpu.append(result["cpu"])
+            wall.append(result["wall"])
+            rss.append(result["peak_rss_mb"])
+
+    return {
+        "scenario": scenario,
+        "sessions": sessions,
+        "workers": workers,
+        "size": list(size),
+        "failures": failures,
+        "elapsed_s": time.perf_counter() - start,
+        "keys_ms": {name: summarize(s) for name, s in sorted(keys.items())},
+        "transitions_ms": {
+            name: summarize(s) for name, s in sorted(transitions.items())
+        },
+        "session_cpu_ms": summarize(cpu),
+        "session_wall_ms": summarize(wall),
+        # Each worker's peak over every session it ran, not per session.
+        "worker_peak_rss_mb": {
+            "max": max(rss, default=0.0),
+            "mean": sum(rss) / len(rss) if rss else 0.0,
+        },
+    }
+
+
+def compare(old: Dict, new: Dict, prefix: str = "") -> List[str]:
+    """List the numeric differences between two reports."""
+    lines = []
+    for key in sorted(set(old) | set(new)):
+        a, b = old.get(key), new.get(key)
+        name = f"{prefix}{key}"
+        if isinstance(a, dict) or isinstance(b, dict):
+            lines.extend(compare(a or {}, b or {}, f"{name}."))
+        elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            lines.append(f"{name:<50} {a:>10.2f} {b:>10.2f} {change:>8}")
+        elif a != b:
+            lines.append(f"{name:<50} {a!s:>10} {b!s:>10}")
+    return lines
+
+
+def main() -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), default=DEFAULT_SCENARIO
+    )
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--height", type=int, default=60)
+    parser.add_argument("-o", "--output", help="Write the report to this file")
+    parser.add_argument("--compare", help="Diff against an earlier report")
+    args = parser.parse_args()
+
+    report = run(args.scenario, args.sessions, args.workers, (args.width, args.height))
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare(json.load(f), report)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Session recording check: size, live overhead and seek speed.
+
+Plays a scripted session through a real (non-headless) driver that drops
+its output, with a ``Recorder`` attached, timing every call the live
+session makes into the recorder. Then opens the recording and seeks to
+random moments, checking the game view against what the session saw and
+timing each seek against decoding linearly from the start.
+
+    python -m taipan.bench.replay --seconds 20 --interval 2
+"""
+
+import argparse
+import asyncio
+import bisect
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from textual.drivers.headless_driver import HeadlessDriver
+
+from taipan.bench.loadtest import summarize
+from taipan.models.game_engine import GameEngine
+from taipan.store import recording
+from taipan.store.recording import Recorder, Recording
+
+ORDERS = ["b o all", "s o all; b s all", "s s all; b a all", "s a all; b g all",
+          "s g all", "d all", "w all"]
+SCREENS = ["trade", "travel"]
+
+
+class SinkDriver(HeadlessDriver):
+    """Driver that renders like a terminal but throws the output away."""
+
+    @property
+    def is_headless(self) -> bool:
+        """Render every frame, as for a real terminal."""
+        return False
+
+    def write(self, data: str) -> None:
+        """Drop the data."""
+
+
+def _timed(samples: List[float], method):
+    """Wrap a recorder method to time each call."""
+    def timed(*args):
+        start = time.perf_counter()
+        method(*args)
+        samples.append(time.perf_counter() - start)
+    return timed
+
+
+async def _script(app, seconds: float, truth: List[Tuple[float, Tuple[int, ...]]],
+                  started: float) -> None:
+    """Play orders and move between screens for ``seconds``."""
+    await asyncio.sleep(0.5)
+    app.start_game(GameEngine.new_game("Replay", "cash"))
+    ports = len(app.engine.state.ports) - 1
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        roll = random.random()
+        if roll < 0.2 and len(app.screen_stack) < 3:
+            app.push_screen(random.choice(SCREENS))
+        elif roll < 0.4 and len(app.screen_stack) > 2:
+            app.pop_screen()
+        else:
+            order = random.choice(ORDERS + [f"t {random.randint(1, ports)}"])
+            app.run_command_line(order)
+        truth.append((time.monotonic() - started, recording._view(app.engine.state)))
+        await asyncio.sleep(random.uniform(0.01, 0.1))
+    app.exit()
+
+
+async def record(path: str, seconds: float, interval: float) -> Dict:
+    """Record a scripted session and time the recorder's share of it."""
+    from taipan.ui.app import TaipanApp
+
+    recorder = Recorder(path, interval=interval)
+    samples: Dict[str, List[float]] = {"output": [], "command": []}
+    recorder.output = _timed(samples["output"], recorder.output)
+    recorder.command = _timed(samples["command"], recorder.command)
+    raw = {"bytes": 0}
+    output = recorder.output
+
+    def counted(data: str) -> None:
+        raw["bytes"] += len(data)
+        output(data)
+
+    recorder.output = counted
+    app = TaipanApp(recorder=recorder)
+    truth: List[Tuple[float, Tuple[int, ...]]] = []
+    app.driver_class = SinkDriver
+    recorder.attach(app)  # Again, now over the sink driver
+
+    async def auto_pilot(pilot) -> None:
+        await _script(app, seconds, truth, recorder._start)
+
+    start = time.perf_counter()
+    await app.run_async(headless=False, size=(100, 40), auto_pilot=auto_pilot)
+    played = time.perf_counter() - start
+    recorder.close()
+    return {"samples": samples, "raw_bytes": raw["bytes"], "played": played,
+            "truth": truth}
+
+
+def seek(path: str, truth: List[Tuple[float, Tuple[int, ...]]], seeks: int) -> Dict:
+    """Seek to random moments, checking the view and timing against linear decoding."""
+    replay = Recording(path)
+    times = [when for when, _ in truth]
+    samples: Dict[str, List[float]] = {"seek": [], "linear": []}
+    mismatches = 0
+    for _ in range(seeks):
+        # Stay clear of the millisecond rounding around each command.
+        index = random.randrange(len(truth) - 1)
+        when = (times[index] + times[index + 1]) / 2
+        if times[index + 1] - times[index] < 0.004:
+            continue
+        start = time.perf_counter()
+        position = replay.seek(when)
+        samples["seek"].append(time.perf_counter() - start)
+        expected = truth[bisect.bisect_right(times, when) - 1][1]
+        if tuple(position.view.values()) != expected:
+            mismatches += 1
+
+        start = time.perf_counter()
+        for chunk in range(bisect.bisect_right(replay.starts, when)):
+            for _ in replay.events(chunk):
+                pass
+        samples["linear"].append(time.perf_counter() - start)
+    return {"samples": samples, "mismatches": mismatches, "chunks": len(replay.chunks),
+            "duration": replay.duration}
+
+
+def main() -> None:
+    """Record a scripted session, then check and time seeking in it."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--interval", type=float, default=recording.INTERVAL)
+    parser.add_argument("--seeks", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.rec")
+        recorded = asyncio.run(record(path, args.seconds, args.interval))
+        size = os.path.getsize(path)
+        sought = seek(path, recorded["truth"], args.seeks)
+
+    raw = recorded["raw_bytes"]
+    print(f"{sought['duration']:.1f}s session, {len(recorded['truth']):,} orders,"
+          f" {sought['chunks']} keyframes")
+    print(f"raw output {raw / 1024:,.0f} KiB, recording {size / 1024:,.0f} KiB"
+          f" ({raw / max(1, size):.1f}x smaller)")
+    calls = recorded["samples"]
+    live = sum(map(sum, calls.values()))
+    print(f"recorder time on the event loop {live * 1000:.1f}ms"
+          f" ({live / recorded['played'] * 100:.2f}% of the session)")
+    for name, values in list(calls.items()) + list(sought["samples"].items()):
+        summary = summarize(values)
+        print(f"{name:<8} p50 {summary['p50'] * 1000:8.1f}us"
+              f"  p99 {summary['p99'] * 1000:8.1f}us"
+              f"  max {summary['max'] * 1000:8.1f}us  ({summary['count']} calls)")
+    print(f"view mismatches: {sought['mismatches']}")
+    if sought["mismatches"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Headless screen benchmarks for the Taipan UI.
+
+Every screen is mounted in a headless ``TaipanApp`` at several terminal
+sizes, including a narrow phone-like one, and timed for:
+
+- ``compose``: building the screen's widget tree,
+- ``first_paint``: from pushing the screen until it is laid out and idle,
+- ``rerender``: redrawing its panels after the game state changes,
+- ``revisit``: for pooled screens, pushing the same instance again after
+  the game changed, which costs a rebind instead of a rebuild.
+
+Results can be saved as a baseline and later runs checked against it:
+
+    python -m taipan.bench.screens --save-baseline benchmarks/screens.json
+    python -m taipan.bench.screens --baseline benchmarks/screens.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from textual.screen import Screen
+from textual.widgets import Static
+
+from taipan.bench.loadtest import summarize
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.models.game_state import GameState
+
+SIZES: Dict[str, Tuple[int, int]] = {
+    "desktop": (120, 40),
+    "terminal": (80, 24),
+    "phone": (40, 30),
+}
+
+TOLERANCE = 0.25  # Relative slowdown of a p50 that counts as a regression
+
+
+def screen_factories() -> Dict[str, Callable[[GameState], Screen]]:
+    """Get a constructor for every screen, keyed by module and class name."""
+    from taipan.ui import port, screens, splash, trade, travel
+
+    return {
+        "splash.ShipSplash": lambda state: splash.ShipSplash(),
+        "splash.CreditsSplash": lambda state: splash.CreditsSplash(),
+        "screens.WelcomeScreen": lambda state: screens.WelcomeScreen(),
+        "screens.PortScreen": lambda state: screens.PortScreen(),
+        "port.PortScreen": port.PortScreen,
+        "trade.TradeScreen": trade.TradeScreen,
+        "travel.TravelScreen": travel.TravelScreen,
+    }
+
+
+def rerender(screen: Screen) -> int:
+    """Redraw every ``#<name>-panel`` Static from its ``_render_<name>`` method."""
+    count = 0
+    for panel in screen.query(Static):
+        if panel.id and panel.id.endswith("-panel"):
+            render = getattr(screen, f"_render_{panel.id[:-6]}", None)
+            if render is not None:
+                panel.update(render())
+                count += 1
+    if not count:
+        screen.refresh(layout=True)
+    return count
+
+
+async def _settle(pilot) -> None:
+    """Process pending messages and paint, without idling like ``pause``."""
+    await pilot._wait_for_screen()
+    pilot.app.screen._on_timer_update()
+
+
+async def _measure(
+    factory: Callable[[GameState], Screen], size: Tuple[int, int], rounds: int
+) -> Dict[str, List[float]]:
+    """Mount a screen ``rounds`` times and collect timings in seconds."""
+    from taipan.ui.app import TaipanApp
+    from taipan.ui.pool import StateScreen
+
+    samples: Dict[str, List[float]] = {"compose": [], "first_paint": [], "rerender": []}
+    app = TaipanApp()
+    async with app.run_test(size=size) as pilot:
+        app.engine = GameEngine.new_game("Benchmark", "cash")
+        await pilot.pause()
+        for _ in range(rounds):
+            screen = factory(app.engine.state)
+            compose = screen.compose
+
+            def timed_compose(compose=compose):
+                start = time.perf_counter()
+                widgets = list(compose())
+                samples["compose"].append(time.perf_counter() - start)
+                return iter(widgets)
+
+            screen.compose = timed_compose
+
+            start = time.perf_counter()
+            await app.push_screen(screen)
+            await _settle(pilot)
+            samples["first_paint"].append(time.perf_counter() - start)
+
+            app.engine.buy_cargo(Commodity.GENERAL, 1)
+            start = time.perf_counter()
+            rerender(screen)
+            await _settle(pilot)
+            samples["rerender"].append(time.perf_counter() - start)
+
+            if isinstance(screen, StateScreen):
+                app.install_screen(screen, "revisit")
+                app.pop_screen()
+                await pilot.pause()
+                app.engine.buy_cargo(Commodity.GENERAL, 1)
+                start = time.perf_counter()
+                await app.push_screen("revisit")
+                await _settle(pilot)
+                samples.setdefault("revisit", []).append(time.perf_counter() - start)
+
+            app.pop_screen()
+            await pilot.pause()
+            app.uninstall_screen("revisit")
+    return samples
+
+
+def run(rounds: int = 5) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Benchmark every screen at every size."""
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name, factory in screen_factories().items():
+        for size_name, size in SIZES.items():
+            samples = asyncio.run(_measure(factory, size, rounds))
+            results[f"{name}@{size_name}"] = {
+                phase: summarize(values) for phase, values in samples.items()
+            }
+    return results
+
+
+def regressions(
+    baseline: Dict, results: Dict, tolerance: float = TOLERANCE
+) -> List[str]:
+    """List the p50 timings that got slower than the baseline allows."""
+    slower = []
+    for key, phases in sorted(results.items()):
+        for phase, summary in phases.items():
+            old = baseline.get(key, {}).get(phase, {}).get("p50")
+            new = summary.get("p50")
+            if old and new and new > old * (1 + tolerance):
+                slower.append(f"{key} {phase}: {old:.2f}ms -> {new:.2f}ms")
+    return slower
+
+
+def main() -> None:
+    """Run the screen benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--baseline", help="Fail if slower than this baseline")
+    parser.add_argument("--save-baseline", help="Store the results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    results = run(args.rounds)
+    for key, phases in sorted(results.items()):
+        timings = "  ".join(
+            f"{phase} {summary['p50']:7.2f}ms" for phase, summary in phases.items()
+        )
+        print(f"{key:<36} {timings}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(json.load(f), results, args.tolerance)
+        if slower:
+            print("\nRegressions:\n" + "\n".join(slower))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Time from launch to a playable port screen, for new and returning players.
+
+A new player walks the splash screens and the welcome dialog, with input
+scripted as fast as the app accepts it; a returning player resumes the
+last save and goes straight to the port.
+
+    python -m taipan.bench.startup --rounds 10
+"""
+
+import argparse
+import asyncio
+import tempfile
+from typing import Dict, List, Tuple
+
+from taipan.bench.loadtest import summarize
+from taipan.models.game_engine import GameEngine
+from taipan.store.autosave import Autosaver
+from taipan.ui.headless import NEW_GAME, play
+
+RESUME = [("screen", "PortScreen")]
+
+
+def _to_port(result: Dict) -> float:
+    """Total the screen transitions from launch until the port was ready."""
+    return sum(samples[0] for samples in result["transitions"].values())
+
+
+async def measure(
+    rounds: int = 10, size: Tuple[int, int] = (100, 60)
+) -> Dict[str, List[float]]:
+    """Time both paths to the port screen ``rounds`` times, in seconds."""
+    samples: Dict[str, List[float]] = {"new": [], "resume": []}
+    with tempfile.TemporaryDirectory() as directory:
+        autosaver = Autosaver(directory)
+        try:
+            autosaver.save("autosave", GameEngine.new_game("Startup", "cash"))
+            autosaver.flush()
+            for _ in range(rounds):
+                result = await play(NEW_GAME, size)
+                samples["new"].append(_to_port(result))
+                result = await play(RESUME, size, autosaver=autosaver, resume=True)
+                samples["resume"].append(_to_port(result))
+        finally:
+            autosaver.close()
+    return samples
+
+
+def main() -> None:
+    """Compare launch-to-port times for a new game and a resumed one."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = asyncio.run(measure(args.rounds))
+    for path, values in samples.items():
+        summary = summarize(values)
+        print(f"{path:<7} p50 {summary['p50']:7.1f}ms  p90 {summary['p90']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""World-size check: port lookups, travel pages and voyages as the map grows.
+
+For worlds from the classic eight ports up to a grand campaign, times port
+lookups and spatial queries against the linear scans they replace, checks
+that the answers agree, turns travel screen pages in a headless app, and
+plays autopilot voyages.
+
+    python -m taipan.bench.world --sizes 1000,10000,100000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List
+
+from rich.table import Table
+
+from taipan.models.game_engine import GameEngine
+from taipan.models.world import World
+from taipan.sim.autopilot import voyage
+
+
+def _per_call(fn: Callable[[], object], calls: int) -> float:
+    """Time a function in microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def _page_turns(world: World, pages: int, deep: bool = False) -> float:
+    """Time turning the travel screen's pages, in milliseconds per page.
+
+    With ``deep``, turns them halfway down the list instead of from the top.
+    """
+    from taipan.ui.app import TaipanApp
+
+    app = TaipanApp()
+    async with app.run_test(size=(100, 70)) as pilot:
+        app.start_game(GameEngine.new_game("World", "cash", world=world))
+        await pilot.pause()
+        app.push_screen("travel")
+        await pilot.pause()
+        screen = app.screen
+        if deep:
+            screen.page = screen.pages // 2
+            screen.rebind(screen.game_state)
+        turns = min(pages, screen.pages - 1 - screen.page) or 1
+        start = time.perf_counter()
+        for _ in range(turns):
+            screen.action_page(1)
+        return (time.perf_counter() - start) / turns * 1000
+
+
+def measure(count: int, seed: int = 0, calls: int = 200) -> Dict[str, float]:
+    """Measure one world size."""
+    start = time.perf_counter()
+    world = World.generate(count, seed) if count > 7 else World.classic()
+    generated = time.perf_counter() - start
+    engine = GameEngine.new_game("World", "cash", world=world)
+    state = engine.state
+    here = state.current_port
+    last = world.ports[-1].name
+    others = [p for p in world.ports if p.name not in ("At Sea", here.name)]
+
+    def by_distance() -> List:
+        return sorted(others, key=lambda p: world.distance(here, p))
+
+    def within() -> List:
+        return [p for p in by_distance() if world.distance(here, p) <= 3.0]
+
+    def full_table() -> Table:
+        # What the travel screen built on every redraw before it paged.
+        table = Table()
+        for index, port in enumerate(state.ports):
+            table.add_row(str(index), port.name)
+        return table
+
+    def names(ports: List) -> List[str]:
+        return [p.name for p in ports]
+
+    agree = (names(world.nearest(here, 10)) == names(by_distance()[:10])
+             and names(world.within(here, 3.0)) == names(within()))
+    results = {
+        "ports": len(world.ports) - 1,
+        "generate_ms": generated * 1000,
+        "by_name_us": _per_call(lambda: state.get_port_by_name(last), calls),
+        "scan_name_us": _per_call(
+            lambda: next(p for p in state.ports if p.name == last), calls // 10 or 1),
+        "nearest10_us": _per_call(lambda: world.nearest(here, 10), calls),
+        "within3_us": _per_call(lambda: world.within(here, 3.0), calls),
+        "scan_nearest_us": _per_call(by_distance, calls // 10 or 1),
+        "full_table_ms": _per_call(full_table, 3) / 1000,
+        "page_ms": asyncio.run(_page_turns(world, 20)),
+        "deep_page_ms": asyncio.run(_page_turns(world, 20, deep=True)),
+        "voyage_us": _per_call(lambda: voyage(engine), calls),
+        "agree": agree,
+    }
+    return results
+
+
+def main() -> None:
+    """Compare port lookups and voyages across world sizes."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sizes", default="7,1000,10000,100000",
+                        help="Comma-separated trading port counts; 7 is the classic"
+                             " world")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = [measure(int(size), args.seed) for size in args.sizes.split(",")]
+    keys = [k for k in rows[0] if k != "agree"]
+    print(f"{'':<16}" + "".join(f"{row['ports']:>12,}" for row in rows))
+    for key in keys[1:]:
+        print(f"{key:<16}" + "".join(f"{row[key]:>12,.1f}" for row in rows))
+    if not all(row["agree"] for row in rows):
+        print("spatial queries disagree with linear scans")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
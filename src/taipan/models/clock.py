@@ -0,0 +1,61 @@
+"""Game clock and timed effects for Taipan."""
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+# The game counts time in days (ticks) from 1 January 1860, with 30-day months.
+DAYS_PER_MONTH = 30
+MONTHS_PER_YEAR = 12
+START_YEAR = 1860
+
+
+def calendar(tick: int) -> Tuple[int, int, int]:
+    """Convert a tick count to a (day, month, year) date."""
+    months, day = divmod(tick, DAYS_PER_MONTH)
+    years, month = divmod(months, MONTHS_PER_YEAR)
+    return day + 1, month + 1, START_YEAR + years
+
+
+@dataclass(frozen=True, order=True)
+class Timer:
+    """An effect due to fire at a given tick."""
+    due: int
+    seq: int
+    effect: str = field(compare=False)
+    data: Any = field(default=None, compare=False)
+
+
+@dataclass
+class TimerQueue:
+    """Min-heap of pending timers, ordered by due tick then scheduling order."""
+    heap: List[Timer] = field(default_factory=list)
+    seq: int = 0
+
+    def schedule(self, due: int, effect: str, data: Any = None) -> Timer:
+        """Schedule an effect to fire at tick ``due``."""
+        timer = Timer(due, self.seq, effect, data)
+        self.seq += 1
+        heapq.heappush(self.heap, timer)
+        return timer
+
+    def cancel(self, effect: str) -> int:
+        """Cancel every pending timer for an effect and return how many."""
+        remaining = [t for t in self.heap if t.effect != effect]
+        cancelled = len(self.heap) - len(remaining)
+        if cancelled:
+            heapq.heapify(remaining)
+            self.heap = remaining
+        return cancelled
+
+    def next_due(self) -> Optional[int]:
+        """Get the tick of the earliest pending timer."""
+        return self.heap[0].due if self.heap else None
+
+    def pop(self) -> Timer:
+        """Remove and return the earliest pending timer."""
+        return heapq.heappop(self.heap)
+
+    def __len__(self) -> int:
+        """Get the number of pending timers."""
+        return len(self.heap)
@@ -0,0 +1,203 @@
+"""Terse command lines in the style of the original game.
+
+A line holds commands separated by ``;``, and ``all`` stands for the most
+the player can manage::
+
+    b o 50      buy 50 opium             s s all     sell all the silk
+    d 10000     deposit 10000            w all       withdraw everything
+    l 500       borrow 500 from Wu       r all       repay as much debt as possible
+    g 2         buy two guns             t 3         sail to port 3 (Nagasaki)
+    a 10        let the autopilot sail ten voyages (last on a line)
+
+The whole line is parsed before anything runs, so a typo changes nothing.
+As in the original game, Wu lends at most twice the player's cash.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+
+ALL = None  # Amount meaning "as much as possible"
+
+# Verb letter -> whether it takes a commodity letter first.
+VERBS = {"b": True, "s": True, "d": False, "w": False, "l": False, "r": False,
+         "g": False, "t": False, "a": False}
+AUTOPILOT = "a"  # Runs in the background, so the app starts it after the rest
+LENDING_RATIO = 2  # Wu lends at most this many times the player's cash
+MAX_BALANCE = 2 ** 63 - 1  # Largest cash or debt the turn log's columns hold
+
+
+class CommandError(ValueError):
+    """A command that cannot be parsed or carried out."""
+
+    def __init__(self, message: str, done: int = 0):
+        """Initialize with the number of commands that ran before the failure."""
+        super().__init__(message)
+        self.done = done
+
+
+@dataclass(frozen=True)
+class Command:
+    """One parsed command."""
+    verb: str
+    commodity: Optional[Commodity] = None
+    amount: Optional[int] = ALL
+    text: str = ""
+
+
+def _parse_amount(word: str, text: str) -> Optional[int]:
+    """Parse a count, or ``all``."""
+    if word == "all":
+        return ALL
+    try:
+        amount = int(word)
+    except ValueError:
+        raise CommandError(f"{text}: '{word}' is not an amount") from None
+    if amount < 0:
+        raise CommandError(f"{text}: amount cannot be negative")
+    return amount
+
+
+def parse(line: str) -> List[Command]:
+    """Parse a command line."""
+    commands = []
+    for order in line.split(";"):
+        words = order.lower().split()
+        text = " ".join(words)
+        if not words:
+            continue
+        verb, args = words[0], words[1:]
+        if verb not in VERBS:
+            raise CommandError(f"{text}: unknown command '{verb}'")
+
+        commodity = None
+        if VERBS[verb]:
+            if not args:
+                raise CommandError(f"{text}: which cargo?")
+            letters = {c.get_letter().lower(): c for c in Commodity}
+            if args[0] not in letters:
+                raise CommandError(f"{text}: unknown cargo '{args[0]}'")
+            commodity = letters[args[0]]
+            args = args[1:]
+
+        if len(args) > 1:
+            raise CommandError(f"{text}: too many words")
+        if verb == "g":
+            amount = _parse_amount(args[0], text) if args else 1
+        elif not args:
+            raise CommandError(f"{text}: how much?")
+        else:
+            amount = _parse_amount(args[0], text)
+        if amount is ALL and verb in ("l", "g", "t", AUTOPILOT):
+            raise CommandError(f"{text}: 'all' is not allowed here")
+        if commands and commands[-1].verb == AUTOPILOT:
+            raise CommandError(
+                f"{commands[-1].text}: the autopilot must be the last order"
+            )
+        commands.append(Command(verb, commodity, amount, text))
+    return commands
+
+
+def _affordable(engine: GameEngine, commodity: Commodity) -> int:
+    """Get the most of a commodity the player can buy right now."""
+    player = engine.state.player
+    affordable = player.cash // engine.get_price(commodity)
+    return min(player.ship.get_available_space(), affordable)
+
+
+def _buy(engine: GameEngine, command: Command) -> Optional[str]:
+    """Buy cargo."""
+    if command.amount is not ALL:
+        if engine.buy_cargo(command.commodity, command.amount):
+            return None
+        if not engine.state.player.ship.can_load(command.amount):
+            return "Not enough cargo space"
+        return "Not enough cash"
+    amount = _affordable(engine, command.commodity)
+    # The price may move between quoting and buying, so back off until it fits.
+    while amount > 0 and not engine.buy_cargo(command.commodity, amount):
+        amount = min(amount - 1, _affordable(engine, command.commodity))
+    return None if amount > 0 else "Cannot buy any"
+
+
+def _sell(engine: GameEngine, command: Command) -> Optional[str]:
+    """Sell cargo."""
+    held = engine.state.player.ship.hold[command.commodity]
+    amount = held if command.amount is ALL else command.amount
+    return None if engine.sell_cargo(command.commodity, amount) else "Not enough cargo"
+
+
+def _deposit(engine: GameEngine, command: Command) -> Optional[str]:
+    """Deposit cash in the bank."""
+    amount = engine.state.player.cash if command.amount is ALL else command.amount
+    return None if engine.deposit_money(amount) else "Not enough cash"
+
+
+def _withdraw(engine: GameEngine, command: Command) -> Optional[str]:
+    """Withdraw cash from the bank."""
+    amount = engine.state.player.bank if command.amount is ALL else command.amount
+    return None if engine.withdraw_money(amount) else "Not enough in the bank"
+
+
+def _borrow(engine: GameEngine, command: Command) -> Optional[str]:
+    """Borrow from Elder Brother Wu."""
+    player = engine.state.player
+    if command.amount > LENDING_RATIO * player.cash:
+        return f"Wu will lend at most {LENDING_RATIO * player.cash}"
+    if max(player.cash, player.debt) + command.amount > MAX_BALANCE:
+        return "Wu cannot lend that much"
+    engine.borrow_money(command.amount)
+    return None
+
+
+def _repay(engine: GameEngine, command: Command) -> Optional[str]:
+    """Repay Elder Brother Wu."""
+    player = engine.state.player
+    if command.amount is ALL:
+        amount = min(player.cash, player.debt)
+    else:
+        amount = command.amount
+    if player.cash < amount:
+        return "Not enough cash"
+    engine.repay_debt(amount)
+    return None
+
+
+def _guns(engine: GameEngine, command: Command) -> Optional[str]:
+    """Buy guns."""
+    for _ in range(command.amount):
+        if not engine.add_gun():
+            return "Not enough cash"
+    return None
+
+
+def _travel(engine: GameEngine, command: Command) -> Optional[str]:
+    """Sail to another port."""
+    port = engine.state.get_port_by_index(command.amount)
+    if port is None or port.name == "At Sea":
+        return "No such port"
+    if not engine.travel_to_port(port):
+        return f"Already in {port.name}"
+    return None
+
+
+HANDLERS = {"b": _buy, "s": _sell, "d": _deposit, "w": _withdraw, "l": _borrow,
+            "r": _repay, "g": _guns, "t": _travel}
+
+
+def execute(engine: GameEngine, commands: List[Command]) -> int:
+    """Run commands in order, stopping at the first that fails.
+
+    Returns how many ran. Commands before a failure keep their effect, just
+    as if they had been entered one at a time. The autopilot is left to the
+    caller.
+    """
+    for done, command in enumerate(commands):
+        if command.verb not in HANDLERS:
+            raise CommandError(f"{command.text}: cannot be run here", done)
+        error = HANDLERS[command.verb](engine, command)
+        if error is not None:
+            raise CommandError(f"{command.text}: {error}", done)
+    return len(commands)
@@ -0,0 +1,57 @@
+"""Game balance configuration for Taipan."""
+
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Tuple
+
+from taipan.models.commodity import Commodity
+from taipan.models.port import BASE_PRICES
+
+
+def _default_base_prices() -> Dict[Commodity, Tuple[int, ...]]:
+    """Copy the stock base prices."""
+    return {c: tuple(prices) for c, prices in BASE_PRICES.items()}
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """Tunable balance constants, gathered in one place.
+
+    Configs compare and hash by value, so they can key caches and sets.
+    """
+    base_prices: Dict[Commodity, Tuple[int, ...]] = field(
+        default_factory=_default_base_prices
+    )
+    enemy_strength_growth: float = 1.05  # Per voyage
+    enemy_damage_growth: float = 1.02    # Per voyage
+    gun_cost: int = 1000
+    gun_space: int = 10                  # Cargo units each gun takes up
+    ship_capacity: int = 60
+    warehouse_capacity: int = 10000
+    cash_start_cash: int = 1000          # "1000 Cash" start
+    guns_start_cash: int = 400           # "5 Guns and 400 Cash" start
+    guns_start_guns: int = 5
+
+    def __hash__(self) -> int:
+        """Hash by value, reading the price table as sorted tuples."""
+        prices = sorted((c.value, tuple(p)) for c, p in self.base_prices.items())
+        rest = (getattr(self, f.name) for f in fields(self) if f.name != "base_prices")
+        return hash((tuple(prices), *rest))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain JSON-compatible data."""
+        data = asdict(self)
+        data["base_prices"] = {c.name: list(p) for c, p in self.base_prices.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GameConfig':
+        """Create a config from ``to_dict`` output."""
+        data = dict(data)
+        if "base_prices" in data:
+            data["base_prices"] = {
+                Commodity[name]: tuple(p) for name, p in data["base_prices"].items()
+            }
+        return cls(**data)
+
+
+DEFAULT_CONFIG = GameConfig()
@@ -0,0 +1,173 @@
+"""Simulated NPC merchant economy for Taipan."""
+
+from typing import Optional
+
+import numpy as np
+
+from taipan.models.commodity import Commodity
+from taipan.models.port import BASE_PRICES, PORT_NAMES
+
+COMMODITIES = list(Commodity)
+# Index 0 is "At Sea", which NPCs pass through but never trade at.
+TRADING_PORTS = np.arange(1, len(PORT_NAMES))
+PORT_INDEX = {name: i for i, name in enumerate(PORT_NAMES)}
+
+
+class NpcEconomy:
+    """A population of NPC trading ships whose flows set port prices.
+
+    Every ship is a row in a set of arrays (position, destination, days to
+    arrival, cash and cargo per commodity), so a whole tick is a handful of
+    vectorized numpy operations regardless of how many ships there are.
+
+    Each port keeps a stock of every commodity. Ships arriving at a port sell
+    their cargo into the stock, buy the commodity with the best spread to
+    another port, and sail for wherever that commodity is dearest. Prices
+    follow stock relative to its equilibrium level, and stocks drift back
+    towards equilibrium, so heavy traffic moves prices without running away.
+    Players' trades go through the same stocks with ``trade``.
+
+    The economy covers the classic ports only; the generated ports of a
+    grand campaign keep their own base prices.
+    """
+
+    CAPACITY = 50      # Cargo units per NPC ship
+    MAX_VOYAGE = 5     # Longest voyage in ticks
+    RESTOCK = 0.05     # Fraction of the gap to equilibrium stock closed per tick
+    MAX_TAKE = 0.25    # Largest fraction of a port's stock bought in one tick
+    ELASTICITY = 0.5   # Price response to stock imbalance
+    PRICE_BAND = 4.0   # Prices stay within base / band and base * band
+
+    def __init__(self, ships: int = 10000, seed: Optional[int] = None):
+        """Initialize the economy with ``ships`` NPCs docked at random ports."""
+        self.rng = np.random.default_rng(seed)
+        n_ports = len(PORT_NAMES)
+
+        # Rows are ports, columns commodities.
+        self.base = np.array(
+            [[BASE_PRICES[c][p] for c in COMMODITIES] for p in range(n_ports)],
+            dtype=np.float64,
+        )
+        # Enough stock at every market to fill a few ships' worth of holds.
+        cells = len(TRADING_PORTS) * len(COMMODITIES)
+        self.equilibrium = np.full_like(
+            self.base, 2.0 * self.CAPACITY * max(1, ships) / cells
+        )
+        self.equilibrium[0] = 0.0
+        self.stock = self.equilibrium.copy()
+        self.prices = self.base.copy()
+
+        self.position = self.rng.choice(TRADING_PORTS, ships)
+        self.destination = self.position.copy()
+        self.eta = np.zeros(ships, dtype=np.int64)
+        self.cash = np.full(ships, 1000.0)
+        self.cargo = np.zeros((ships, len(COMMODITIES)), dtype=np.int64)
+        self.ticks = 0
+        self.revision = 0  # Bumped whenever prices may have changed
+
+    @property
+    def ships(self) -> int:
+        """Get the number of NPC ships."""
+        return len(self.position)
+
+    def covers(self, port: str) -> bool:
+        """Check whether the economy sets prices at a port."""
+        return port in PORT_INDEX
+
+    def price(self, port: str, commodity: Commodity) -> int:
+        """Get the current price of a commodity at a covered port."""
+        return max(1, int(round(self.prices[PORT_INDEX[port], commodity.value - 1])))
+
+    def trade(self, port: str, commodity: Commodity, amount: int) -> None:
+        """Fill a player's trade from a port's stock; ``amount`` < 0 sells.
+
+        Trades at ports the economy does not cover have no effect.
+        """
+        if port not in PORT_INDEX:
+            return
+        cell = (PORT_INDEX[port], commodity.value - 1)
+        self.stock[cell] = max(1.0, self.stock[cell] - amount)
+        self._reprice()
+
+    def _flows(self, ports: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        """Sum per-ship commodity amounts into a (port, commodity) matrix."""
+        n_ports, n_goods = self.base.shape
+        cells = (ports[:, None] * n_goods + np.arange(n_goods)).ravel()
+        totals = np.bincount(cells, weights=amounts.ravel(),
+                             minlength=n_ports * n_goods)
+        return totals.reshape(n_ports, n_goods)
+
+    def step(self) -> None:
+        """Advance every NPC ship and port by one tick."""
+        # Ships at sea close in on their destination.
+        sailing = self.eta > 0
+        self.eta[sailing] -= 1
+        arrived = sailing & (self.eta == 0)
+        self.position[arrived] = self.destination[arrived]
+        self.position[sailing & ~arrived] = 0
+
+        docked = np.flatnonzero(self.eta == 0)
+        if len(docked):
+            ports = self.position[docked]
+            local = self.prices[ports]
+
+            # Sell everything in the hold.
+            sold = self.cargo[docked]
+            self.cash[docked] += (sold * local).sum(axis=1)
+            self.cargo[docked] = 0
+
+            # Buy the commodity with the best markup at its dearest port.
+            best_price = self.prices[TRADING_PORTS].max(axis=0)
+            markup = best_price / local
+            goods = markup.argmax(axis=1)
+            unit = local[np.arange(len(docked)), goods]
+            amount = np.minimum(self.CAPACITY, self.cash[docked] // unit)
+            amount[markup.max(axis=1) <= 1.0] = 0
+            bought = np.zeros(sold.shape)
+            bought[np.arange(len(docked)), goods] = amount
+
+            # Rather than emptying a market, ration it across the buyers.
+            wanted = self._flows(ports, bought)
+            fill = np.minimum(
+                1.0, np.divide(
+                    self.MAX_TAKE * self.stock, wanted,
+                    out=np.ones_like(wanted), where=wanted > 0,
+                )
+            )
+            amount = np.floor(amount * fill[ports, goods]).astype(np.int64)
+            bought = np.zeros_like(sold)
+            bought[np.arange(len(docked)), goods] = amount
+            self.cash[docked] -= amount * unit
+            self.cargo[docked] = bought
+
+            # Head for the port paying most for what is in the hold.
+            dearest = TRADING_PORTS[self.prices[TRADING_PORTS][:, goods].argmax(axis=0)]
+            wander = self.rng.choice(TRADING_PORTS, len(docked))
+            self.destination[docked] = np.where(amount > 0, dearest, wander)
+            self.eta[docked] = self.rng.integers(1, self.MAX_VOYAGE + 1, len(docked))
+
+            self.stock += self._flows(ports, sold) - self._flows(ports, bought)
+
+        # Stocks drift back to equilibrium and prices follow stock.
+        self.stock += self.RESTOCK * (self.equilibrium - self.stock)
+        self._reprice()
+        self.ticks += 1
+
+    def _reprice(self) -> None:
+        """Set every price from its port's stock."""
+        np.maximum(self.stock, 1.0, out=self.stock)
+        ratio = np.divide(
+            self.equilibrium, self.stock,
+            out=np.ones_like(self.stock), where=self.equilibrium > 0,
+        )
+        self.prices = np.clip(
+            self.base * ratio ** self.ELASTICITY,
+            np.maximum(1.0, self.base / self.PRICE_BAND),
+            self.base * self.PRICE_BAND,
+        )
+        self.revision += 1
+
+    def advance(self, ticks: int) -> None:
+        """Advance the economy by several ticks."""
+        for _ in range(ticks):
+            self.step()
@@ -0,0 +1,222 @@
+"""Random event tables for Taipan."""
+
+import random
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from taipan.models.game_state import GameState
+
+
+class Event(Enum):
+    """Random events that can happen to the player."""
+    NOTHING = auto()
+    STORM = auto()
+    PIRATES = auto()
+    LI_YUEN = auto()
+    ROBBERY = auto()
+    PRICE_SHOCK = auto()
+    WU_WARNING = auto()
+
+    def __str__(self) -> str:
+        """Convert Event enum to display string."""
+        if self == Event.LI_YUEN:
+            return "Li Yuen"
+        if self == Event.WU_WARNING:
+            return "Wu's Warning"
+        return self.name.replace('_', ' ').capitalize()
+
+
+# What the player is told when an event strikes
+MESSAGES = {
+    Event.STORM: "Storm, Taipan! The ship took a battering.",
+    Event.PIRATES: "Pirates attacked, Taipan! The ship took damage.",
+    Event.LI_YUEN: "Li Yuen's fleet boarded us and took half the cargo!",
+    Event.ROBBERY: "You've been beaten up and robbed of some cash, Taipan!",
+    Event.PRICE_SHOCK: "Taipan! Prices have gone wild here!",
+    Event.WU_WARNING: "Elder Brother Wu warns you to mind your debts.",
+}
+
+
+@dataclass(frozen=True)
+class EventRule:
+    """One row of an event probability table.
+
+    ``chance`` is the probability per draw before the gun multiplier is
+    applied. The rule only applies at ``ports`` and in ``months`` when those
+    are given, and only once the player has at least ``min_cash``.
+    """
+    event: Event
+    chance: float
+    ports: Optional[FrozenSet[str]] = None
+    months: Optional[FrozenSet[int]] = None
+    min_cash: int = 0
+    gun_factor: float = 1.0
+
+    def weight(self, port: str, month: int, cash: int, guns: int) -> float:
+        """Get the probability of this rule firing for the given inputs."""
+        if self.ports is not None and port not in self.ports:
+            return 0.0
+        if self.months is not None and month not in self.months:
+            return 0.0
+        if cash < self.min_cash:
+            return 0.0
+        return self.chance * self.gun_factor ** guns
+
+
+_rng = random.Random()
+
+# Odds follow the original C code where it has them.
+DEFAULT_EVENTS: Tuple[EventRule, ...] = (
+    EventRule(Event.STORM, 1 / 10, ports=frozenset({"At Sea"})),
+    EventRule(Event.PIRATES, 1 / 10, ports=frozenset({"At Sea"}), gun_factor=1.05),
+    EventRule(Event.LI_YUEN, 1 / 20, ports=frozenset({"At Sea"}), gun_factor=0.97),
+    EventRule(Event.PRICE_SHOCK, 1 / 9),
+    EventRule(Event.ROBBERY, 1 / 20, min_cash=25000),
+    EventRule(Event.WU_WARNING, 1 / 4, ports=frozenset({"Hong Kong"}), min_cash=10000),
+)
+
+
+class AliasTable:
+    """Walker/Vose alias table for O(1) sampling from a discrete distribution."""
+
+    def __init__(self, outcomes: Sequence[Event], weights: Sequence[float]):
+        """Build the table in O(n) from non-negative weights."""
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("Need one weight per outcome")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("Weights must not all be zero")
+
+        n = len(weights)
+        scaled = [w * n / total for w in weights]
+        self.outcomes = tuple(outcomes)
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        self._outcomes = np.empty(n, dtype=object)
+        self._outcomes[:] = self.outcomes
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left over is 1.0 up to rounding error.
+        self._prob = np.array(self.prob)
+        self._alias = np.array(self.alias)
+
+    def sample(self, rng: random.Random) -> Event:
+        """Draw one outcome in O(1)."""
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        if u - i < self.prob[i]:
+            return self.outcomes[i]
+        return self.outcomes[self.alias[i]]
+
+    def sample_many(self, u: np.ndarray) -> np.ndarray:
+        """Draw one outcome per uniform in ``[0, 1)``, vectorized."""
+        u = u * len(self._prob)
+        i = u.astype(np.int64)
+        picks = np.where(u - i < self._prob[i], i, self._alias[i])
+        return self._outcomes[picks]
+
+
+class EventScheduler:
+    """Draws random events from declarative rules via cached alias tables.
+
+    Rules only depend on port, month, cash and guns, and cash only matters
+    relative to the ``min_cash`` thresholds. A table is therefore compiled
+    once per distinct (port, month, cash bracket, guns) key and reused until
+    one of those inputs changes.
+    """
+
+    MAX_TABLES = 1024
+
+    def __init__(self, rules: Iterable[EventRule] = DEFAULT_EVENTS):
+        """Initialize the scheduler with a set of rules."""
+        self.rules = tuple(rules)
+        self._cash_thresholds = sorted({r.min_cash for r in self.rules if r.min_cash})
+        self._tables: Dict[Hashable, AliasTable] = {}
+
+    def _key(
+        self, state: GameState, port: Optional[str] = None
+    ) -> Tuple[str, int, int, int]:
+        """Get the inputs a table for this state depends on, at its port or another."""
+        player = state.player
+        return (
+            port or state.current_port.name,
+            state.month,
+            bisect_right(self._cash_thresholds, player.cash),
+            player.ship.guns,
+        )
+
+    def _compile(self, key: Tuple[str, int, int, int]) -> AliasTable:
+        """Build the alias table for a key."""
+        port, month, bracket, guns = key
+        # Any cash inside the bracket gives the same weights.
+        cash = self._cash_thresholds[bracket - 1] if bracket else 0
+        outcomes = [Event.NOTHING]
+        weights = [0.0]
+        for rule in self.rules:
+            w = rule.weight(port, month, cash, guns)
+            if w > 0:
+                outcomes.append(rule.event)
+                weights.append(w)
+        total = sum(weights)
+        if total > 1.0:
+            weights = [w / total for w in weights]
+        else:
+            weights[0] = 1.0 - total
+        return AliasTable(outcomes, weights)
+
+    def _table(self, key: Tuple[str, int, int, int]) -> AliasTable:
+        """Get the alias table for a key, compiling it on first use."""
+        table = self._tables.get(key)
+        if table is None:
+            if len(self._tables) >= self.MAX_TABLES:
+                self._tables.clear()
+            table = self._tables[key] = self._compile(key)
+        return table
+
+    def table_for(self, state: GameState, port: Optional[str] = None) -> AliasTable:
+        """Get the compiled alias table for a state, at its port or another."""
+        return self._table(self._key(state, port))
+
+    def draw(
+        self,
+        state: GameState,
+        rng: Optional[random.Random] = None,
+        port: Optional[str] = None,
+    ) -> Event:
+        """Draw the next event for a single game, at its port or another."""
+        return self.table_for(state, port).sample(rng or _rng)
+
+    def draw_batch(
+        self,
+        states: Sequence[GameState],
+        rng: Optional[np.random.Generator] = None,
+        port: Optional[str] = None,
+    ) -> List[Event]:
+        """Draw one event for each of many games in a single call.
+
+        States are grouped by table key, and each group is sampled in one
+        vectorized pass over uniforms drawn for the whole batch at once.
+        """
+        rng = rng or np.random.default_rng()
+        groups: Dict[Hashable, List[int]] = {}
+        for i, state in enumerate(states):
+            groups.setdefault(self._key(state, port), []).append(i)
+
+        u = rng.random(len(states))
+        results = np.empty(len(states), dtype=object)
+        for key, indices in groups.items():
+            picks = np.array(indices)
+            results[picks] = self._table(key).sample_many(u[picks])
+        return results.tolist()
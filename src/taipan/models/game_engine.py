@@ -1,52 +1,295 @@
 """Game engine for Taipan."""
 
+import copy
 import random
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, TypeVar
 
+from .clock import DAYS_PER_MONTH, Timer, TimerQueue
+from .config import DEFAULT_CONFIG, GameConfig
+from .events import Event, EventScheduler
 from .game_state import GameState, Port, Commodity, Player, Ship
+from .market import Order, OrderBuffer, SharedMarket
+from .world import World
+
+if TYPE_CHECKING:
+    from .economy import NpcEconomy
+
+T = TypeVar("T")
+
+
+def _private_copy(obj: T, owner: object) -> T:
+    """Shallow-copy a shared state node and stamp it with its new owner."""
+    obj = copy.copy(obj)
+    obj._owner = owner
+    return obj
+
 
 @dataclass
 class GameEngine:
-    """Handles core game logic and state transitions."""
+    """Handles core game logic and state transitions.
+
+    The state tree is copy-on-write: ``fork`` shares every node with the new
+    branch in O(1), and each engine copies a node (and the path above it)
+    the first time it mutates something it does not own.
+    """
     
     state: GameState
+    config: GameConfig = field(default=DEFAULT_CONFIG, repr=False, compare=False)
+    parent: Optional['GameEngine'] = field(default=None, repr=False, compare=False)
+    events: EventScheduler = field(
+        default_factory=EventScheduler, repr=False, compare=False
+    )
+    market: Optional[SharedMarket] = field(default=None, repr=False, compare=False)
+    economy: Optional['NpcEconomy'] = field(default=None, repr=False, compare=False)
+    session: str = ""
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
+    voyage_events: List[Event] = field(default_factory=list, repr=False, compare=False)
+    effect_handlers: Dict[str, Callable[['GameEngine', Timer], None]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    listeners: List[Callable[['GameEngine', str], None]] = field(
+        default_factory=list, repr=False, compare=False
+    )
+    _token: object = field(
+        default_factory=object, init=False, repr=False, compare=False
+    )
+    _spent: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Claim the state tree if nobody owns it yet."""
+        if getattr(self.state, "_owner", None) is None:
+            self.state._owner = self._token
+            self.state.player._owner = self._token
+            self.state.player.ship._owner = self._token
+            self.state.timers._owner = self._token
+
+    def _mutable_state(self) -> GameState:
+        """Get the game state, copying it first if it is shared."""
+        if getattr(self.state, "_owner", None) is not self._token:
+            self.state = _private_copy(self.state, self._token)
+        return self.state
+
+    def _mutable_player(self) -> Player:
+        """Get the player, copying it first if it is shared."""
+        state = self._mutable_state()
+        if getattr(state.player, "_owner", None) is not self._token:
+            player = _private_copy(state.player, self._token)
+            player.warehouse = dict(player.warehouse)
+            player.hold = dict(player.hold)
+            state.player = player
+        return state.player
+
+    def _mutable_ship(self) -> Ship:
+        """Get the player's ship, copying it first if it is shared."""
+        player = self._mutable_player()
+        if getattr(player.ship, "_owner", None) is not self._token:
+            ship = _private_copy(player.ship, self._token)
+            ship.hold = dict(ship.hold)
+            player.ship = ship
+        return player.ship
+
+    def _mutable_rng(self) -> random.Random:
+        """Get the random number generator, copying it first if it is shared."""
+        owner = getattr(self.rng, "_owner", None)
+        if owner is None:
+            self.rng._owner = self._token  # Handed in from outside; claim it
+        elif owner is not self._token:
+            rng = random.Random.__new__(random.Random)
+            rng.setstate(self.rng.getstate())
+            rng._owner = self._token
+            self.rng = rng
+        return self.rng
+
+    def _mutable_timers(self) -> TimerQueue:
+        """Get the timer queue, copying it first if it is shared."""
+        state = self._mutable_state()
+        if getattr(state.timers, "_owner", None) is not self._token:
+            timers = _private_copy(state.timers, self._token)
+            timers.heap = list(timers.heap)
+            state.timers = timers
+        return state.timers
+
+    def fork(self) -> 'GameEngine':
+        """Branch off a speculative copy of the game in O(1).
+
+        Parent and branch share the whole state tree until one of them
+        writes to it; both sides copy lazily from then on. The random number
+        generator is shared the same way, so speculating never uses up the
+        draws of the game it was forked from.
+        """
+        if getattr(self.rng, "_owner", None) is None:
+            self.rng._owner = self._token  # Shared from now on
+        self._token = object()
+        # Branches are speculative: they price from the live market but hold
+        # their orders until committed, and listeners never hear of them.
+        return GameEngine(
+            state=self.state,
+            config=self.config,
+            parent=self,
+            events=self.events,
+            market=OrderBuffer(self.market) if self.market is not None else None,
+            economy=self.economy,
+            rng=self.rng,
+            effect_handlers=self.effect_handlers,
+        )
+
+    def commit(self, branch: 'GameEngine', command: Optional[str] = None) -> None:
+        """Adopt a branch's state as the current state of this game.
+
+        The game carries on from the branch's random draws, and the branch's
+        held orders go to the market. With a ``command``, listeners hear of the
+        adoption as that command.
+        """
+        if branch.parent is not self:
+            raise ValueError("Branch was not forked from this engine")
+        # Both sides keep a reference, so neither may write in place anymore.
+        self.state = branch.state
+        self._token = object()
+        if getattr(branch.rng, "_owner", None) is branch._token:
+            branch.rng._owner = self._token  # The branch is done drawing
+        self.rng = branch.rng
+        branch._token = object()
+        if isinstance(branch.market, OrderBuffer):
+            branch.market.release()
+        branch.parent = None
+        branch._spent = True
+        if command is not None:
+            self._notify(command)
+
+    def discard(self, branch: 'GameEngine') -> None:
+        """Drop a branch without applying its changes."""
+        if branch.parent is not self:
+            raise ValueError("Branch was not forked from this engine")
+        branch._token = object()
+        branch.parent = None
+        branch._spent = True
+
+    @property
+    def is_branch(self) -> bool:
+        """Check whether this is a branch, live or already committed or discarded.
+
+        Only the real game may move the world: advance the economy or
+        trade with it.
+        """
+        return self.parent is not None or self._spent
     
     @classmethod
-    def new_game(cls, firm_name: str, starting_option: str) -> 'GameEngine':
-        """Start a new game."""
+    def new_game(
+        cls,
+        firm_name: str,
+        starting_option: str,
+        config: GameConfig = DEFAULT_CONFIG,
+        world: Optional[World] = None,
+    ) -> 'GameEngine':
+        """Start a new game, in the classic world unless another is given."""
         # Create player with initial state based on starting option
-        player = Player()
+        player = Player(warehouse_capacity=config.warehouse_capacity)
         player.firm_name = firm_name
+        player.ship.capacity = config.ship_capacity
         
         if starting_option == "cash":
-            player.cash = 1000
+            player.cash = config.cash_start_cash
         elif starting_option == "guns":
-            player.cash = 400
-            player.ship.guns = 5
-            player.ship.capacity = 10  # Each gun takes 10 units of cargo space
+            player.cash = config.guns_start_cash
+            player.ship.guns = config.guns_start_guns
+            # Each gun takes up cargo space
+            player.ship.capacity -= config.guns_start_guns * config.gun_space
         
         # Initialize game state with the configured player
-        state = GameState(player=player)
-        return cls(state=state)
+        state = GameState(player=player, world=world or World.classic())
+        return cls(state=state, config=config)
     
     def start_game(self, firm_name: str, initial_choice: str) -> None:
         """Initialize a new game with player's choices."""
-        self.state.player.firm_name = firm_name
+        player = self._mutable_player()
+        player.firm_name = firm_name
         
         # Initial setup based on player's choice
         if initial_choice.lower() == "cash":
-            self.state.player.cash = 1000
-            self.state.player.debt = 5000  # Start with debt if choosing cash
+            player.cash = self.config.cash_start_cash
+            player.debt = 5000  # Start with debt if choosing cash
         else:  # guns
-            self.state.player.ship.guns = 5
-            self.state.player.cash = 400
+            self._mutable_ship().guns = self.config.guns_start_guns
+            player.cash = self.config.guns_start_cash
+        self._notify("start_game")
             
         # No need to update prices as they are calculated dynamically
     
+    def schedule(self, delay: int, effect: str, data=None) -> Timer:
+        """Schedule an effect to fire ``delay`` days from now."""
+        return self._mutable_timers().schedule(self.state.tick + delay, effect, data)
+
+    def cancel(self, effect: str) -> int:
+        """Cancel every pending timer for an effect."""
+        if not any(t.effect == effect for t in self.state.timers.heap):
+            return 0
+        return self._mutable_timers().cancel(effect)
+
+    def advance_time(self, days: int) -> List[Timer]:
+        """Advance the clock and fire the timers that fall due, in order.
+
+        Costs O(timers fired * log pending), however many days pass.
+        """
+        state = self._mutable_state()
+        target = state.tick + days
+        fired = []
+        while True:
+            due = state.timers.next_due()
+            if due is None or due > target:
+                break
+            timer = self._mutable_timers().pop()
+            state.tick = max(state.tick, timer.due)
+            handler = self.effect_handlers.get(timer.effect)
+            if handler is not None:
+                handler(self, timer)
+            fired.append(timer)
+            # A handler may have replaced the state through commit.
+            state = self._mutable_state()
+        state.tick = target
+        # Only the real game moves the world; branches just read its prices.
+        if self.economy is not None and not self.is_branch:
+            self.economy.advance(days)
+        return fired
+
+    def get_price(self, commodity: Commodity) -> int:
+        """Get the price of a commodity at the current port.
+
+        Reading a price never changes the game: without a market or an
+        economy that covers the port, e.g. at a generated port, it fluctuates
+        from day to day but holds within a day.
+        """
+        port = self.state.current_port
+        if self.market is not None and self.market.covers(port.name):
+            price = self.market.price(port.name, commodity)
+        elif self.economy is not None and self.economy.covers(port.name):
+            price = self.economy.price(port.name, commodity)
+        else:
+            price = port.get_price(commodity, self.config.base_prices, self.state.tick)
+        shock = self.state.price_shock
+        if shock is not None and shock[0] == commodity:
+            price = max(1, round(price * shock[1]))
+        return price
+
+    def _report_trade(self, commodity: Commodity, amount: int) -> None:
+        """Report a filled trade to the shared market or the economy, if any.
+
+        A market passes its orders on to its own economy once per tick.
+        """
+        port = self.state.current_port.name
+        if self.market is not None and self.market.covers(port):
+            self.market.submit(Order(self.session, port, commodity, amount))
+        elif self.economy is not None and not self.is_branch:
+            self.economy.trade(port, commodity, amount)
+
+    def _notify(self, command: str) -> None:
+        """Tell listeners that a command has changed the game."""
+        for listener in self.listeners:
+            listener(self, command)
+
     def can_buy(self, commodity: Commodity, amount: int) -> Tuple[bool, str]:
         """Check if player can buy the specified amount."""
-        price = self.state.current_port.get_price(commodity)
+        price = self.get_price(commodity)
         total_cost = price * amount
         
         if total_cost > self.state.player.cash:
@@ -64,11 +307,13 @@ class GameEngine:
         if not can_buy:
             return False
             
-        price = self.state.current_port.get_price(commodity)
+        price = self.get_price(commodity)
         total_cost = price * amount
         
-        self.state.player.cash -= total_cost
-        self.state.player.ship.hold[commodity] += amount
+        self._mutable_player().cash -= total_cost
+        self._mutable_ship().hold[commodity] += amount
+        self._report_trade(commodity, amount)
+        self._notify("buy")
         return True
     
     def can_sell(self, commodity: Commodity, amount: int) -> Tuple[bool, str]:
@@ -83,11 +328,13 @@ class GameEngine:
         if not can_sell:
             return False
             
-        price = self.state.current_port.get_price(commodity)
+        price = self.get_price(commodity)
         total_value = price * amount
         
-        self.state.player.cash += total_value
-        self.state.player.ship.hold[commodity] -= amount
+        self._mutable_player().cash += total_value
+        self._mutable_ship().hold[commodity] -= amount
+        self._report_trade(commodity, -amount)
+        self._notify("sell")
         return True
     
     def travel_to(self, destination: Port) -> None:
@@ -95,17 +342,17 @@ class GameEngine:
         if destination == self.state.current_port:
             return
             
-        self.state.current_port = destination
+        state = self._mutable_state()
+        state.current_port = destination
         
-        # Advance time
-        self.state.month += 1
-        if self.state.month > 12:
-            self.state.month = 1
-            self.state.year += 1
+        # A voyage takes a month
+        self.advance_time(DAYS_PER_MONTH)
+        state = self._mutable_state()
             
         # Increase difficulty over time
-        self.state.enemy_strength *= 1.05
-        self.state.enemy_damage *= 1.02
+        state.enemy_strength *= self.config.enemy_strength_growth
+        state.enemy_damage *= self.config.enemy_damage_growth
+        self._notify("travel_to")
     
     def visit_bank(self) -> None:
         """Handle bank interactions in Hong Kong."""
@@ -115,18 +362,51 @@ class GameEngine:
         # Bank logic will be implemented here
         pass
     
+    def roll_event(self, port: Optional[str] = None) -> Event:
+        """Draw the random event for the current turn, at a port or at sea."""
+        return self.events.draw(self.state, self._mutable_rng(), port)
+
+    def apply_event(self, event: Event) -> None:
+        """Apply an event's effect to the game."""
+        state = self.state
+        rng = self._mutable_rng()
+        if event is Event.STORM:
+            ship = self._mutable_ship()
+            ship.damage += rng.randint(1, max(1, ship.capacity // 10))
+        elif event is Event.PIRATES:
+            # Each gun fends off a point of damage.
+            hit = state.enemy_strength * state.enemy_damage * rng.uniform(0.5, 1.5)
+            ship = self._mutable_ship()
+            ship.damage += max(0, round(hit) - ship.guns)
+        elif event is Event.LI_YUEN:
+            if not state.li_yuen_visited:  # His protection was paid for
+                hold = self._mutable_ship().hold
+                for commodity in hold:
+                    hold[commodity] -= hold[commodity] // 2
+        elif event is Event.ROBBERY:
+            # As in the original: up to cash / 1.4
+            stolen = int(state.player.cash / 1.4 * rng.random())
+            self._mutable_player().cash -= stolen
+        elif event is Event.PRICE_SHOCK:
+            factor = rng.uniform(2.0, 5.0)
+            if rng.random() < 0.5:
+                factor = 1 / factor
+            commodity = rng.choice(list(Commodity))
+            self._mutable_state().price_shock = (commodity, factor)
+        elif event is Event.WU_WARNING:
+            self._mutable_state().wu_warning = True
+
     def handle_li_yuen(self) -> None:
         """Handle Li Yuen encounters in Hong Kong."""
         if (self.state.current_port.name == "Hong Kong" and 
             not self.state.li_yuen_visited and 
             self.state.player.cash > 0):
             # Li Yuen encounter logic will be implemented here
-            self.state.li_yuen_visited = True 
+            self._mutable_state().li_yuen_visited = True 
 
     def buy_cargo(self, commodity: Commodity, amount: int) -> bool:
         """Buy cargo at current port."""
-        port = self.state.current_port
-        price = port.get_price(commodity)
+        price = self.get_price(commodity)
         total_cost = price * amount
 
         if self.state.player.cash < total_cost:
@@ -135,20 +415,25 @@ class GameEngine:
         if not self.state.player.ship.can_load(amount):
             return False
 
-        self.state.player.cash -= total_cost
-        self.state.player.ship.load_cargo(commodity, amount)
+        self._mutable_player().cash -= total_cost
+        self._mutable_ship().load_cargo(commodity, amount)
+        self._report_trade(commodity, amount)
+        self._notify("buy_cargo")
         return True
 
     def sell_cargo(self, commodity: Commodity, amount: int) -> bool:
         """Sell cargo at current port."""
-        if not self.state.player.ship.unload_cargo(commodity, amount):
+        # Check first, so a sale that fails does not copy a shared ship.
+        if self.state.player.ship.hold[commodity] < amount:
             return False
+        self._mutable_ship().unload_cargo(commodity, amount)
 
-        port = self.state.current_port
-        price = port.get_price(commodity)
+        price = self.get_price(commodity)
         total_value = price * amount
 
-        self.state.player.cash += total_value
+        self._mutable_player().cash += total_value
+        self._report_trade(commodity, -amount)
+        self._notify("sell_cargo")
         return True
 
     def travel_to_port(self, port: Port) -> bool:
@@ -156,37 +441,65 @@ class GameEngine:
         if port == self.state.current_port:
             return False
 
-        self.state.current_port = port
-        self.state.advance_time(1)  # Travel takes 1 day
+        days = self.state.world.passage_days(self.state.current_port, port)
+        state = self._mutable_state()
+        state.current_port = port
+        state.price_shock = None
+        self.advance_time(days)  # A day in the classic game
+        # One roll for the passage and one for the arrival.
+        self.voyage_events = [self.roll_event("At Sea"), self.roll_event()]
+        for event in self.voyage_events:
+            self.apply_event(event)
+        self._notify("travel_to_port")
         return True
 
     def deposit_money(self, amount: int) -> bool:
         """Deposit money in bank."""
-        return self.state.player.deposit(amount)
+        if not self._mutable_player().deposit(amount):
+            return False
+        self._notify("deposit_money")
+        return True
 
     def withdraw_money(self, amount: int) -> bool:
         """Withdraw money from bank."""
-        return self.state.player.withdraw(amount)
+        if not self._mutable_player().withdraw(amount):
+            return False
+        self._notify("withdraw_money")
+        return True
 
     def borrow_money(self, amount: int) -> None:
         """Borrow money from Elder Brother Wu."""
-        self.state.player.borrow(amount)
+        self._mutable_player().borrow(amount)
+        self._notify("borrow_money")
 
     def repay_debt(self, amount: int) -> None:
         """Repay debt to Elder Brother Wu."""
-        self.state.player.repay(amount)
+        self._mutable_player().repay(amount)
+        self._notify("repay_debt")
+
+    def repair_ship(self, cost: int) -> bool:
+        """Repair all of the ship's damage for a price."""
+        if self.state.player.cash < cost:
+            return False
+        self._mutable_player().cash -= cost
+        ship = self._mutable_ship()
+        ship.repair(ship.damage)
+        self._notify("repair_ship")
+        return True
 
     def add_gun(self) -> bool:
         """Add a gun to the ship."""
-        if self.state.player.cash < 1000:  # Cost of a gun
+        if self.state.player.cash < self.config.gun_cost:
             return False
-        self.state.player.cash -= 1000
-        self.state.player.ship.add_gun()
+        self._mutable_player().cash -= self.config.gun_cost
+        self._mutable_ship().add_gun(self.config.gun_space)
+        self._notify("add_gun")
         return True
 
     def remove_gun(self) -> bool:
         """Remove a gun from the ship."""
         if self.state.player.ship.guns == 0:
             return False
-        self.state.player.ship.remove_gun()
+        self._mutable_ship().remove_gun(self.config.gun_space)
+        self._notify("remove_gun")
         return True 
\ No newline at end of file
@@ -1,40 +1,97 @@
 """Core game state models for Taipan."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import random
 
+from taipan.models.clock import Timer, TimerQueue, calendar
 from taipan.models.player import Player
 from taipan.models.port import Port
 from taipan.models.ship import Ship
+from taipan.models.world import World
 from taipan.models.commodity import Commodity
 
 @dataclass
 class GameState:
     """Current state of the game."""
     player: Player
-    ports: List[Port] = field(default_factory=Port.initialize_ports)
+    world: World = field(default_factory=World.classic)
     current_port: Port = field(init=False)
     ship: Ship = field(default_factory=Ship)
-    day: int = 1
-    month: int = 1
-    year: int = 1860
+    tick: int = 0
+    timers: TimerQueue = field(default_factory=TimerQueue)
     li_yuen_visited: bool = False
     wu_warning: bool = False
     wu_bailout: int = 0
     enemy_strength: float = 20.0
     enemy_damage: float = 0.5
+    # A commodity whose price is multiplied here until the ship sails on
+    price_shock: Optional[Tuple[Commodity, float]] = None
 
     def __post_init__(self):
         """Initialize the game state."""
         self.current_port = self.ports[1]  # Start in Hong Kong
 
+    @property
+    def ports(self) -> List[Port]:
+        """Get every port in the world, indexed as ``Port.get_port_index``."""
+        return self.world.ports
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain JSON-compatible data.
+
+        Timer data is stored as-is, so it must be JSON-compatible too.
+        """
+        return {
+            "player": self.player.to_dict(),
+            "world": self.world.to_dict(),
+            "current_port": self.get_current_port_index(),
+            "ship": self.ship.to_dict(),
+            "tick": self.tick,
+            "timers": {
+                "heap": [[t.due, t.seq, t.effect, t.data] for t in self.timers.heap],
+                "seq": self.timers.seq,
+            },
+            "li_yuen_visited": self.li_yuen_visited,
+            "wu_warning": self.wu_warning,
+            "wu_bailout": self.wu_bailout,
+            "enemy_strength": self.enemy_strength,
+            "enemy_damage": self.enemy_damage,
+            "price_shock": (
+                [self.price_shock[0].name, self.price_shock[1]]
+                if self.price_shock else None
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GameState':
+        """Create a game state from ``to_dict`` output."""
+        state = cls(
+            player=Player.from_dict(data["player"]),
+            # Saves from before generated worlds always had the classic ports.
+            world=World.from_dict(data.get("world")),
+            ship=Ship.from_dict(data["ship"]),
+            tick=data["tick"],
+            # The heap was saved in heap order, so it is still a valid heap.
+            timers=TimerQueue(
+                heap=[Timer(*t) for t in data["timers"]["heap"]],
+                seq=data["timers"]["seq"],
+            ),
+            li_yuen_visited=data["li_yuen_visited"],
+            wu_warning=data["wu_warning"],
+            wu_bailout=data["wu_bailout"],
+            enemy_strength=data["enemy_strength"],
+            enemy_damage=data["enemy_damage"],
+        )
+        state.current_port = state.ports[data["current_port"]]
+        shock = data.get("price_shock")
+        if shock:
+            state.price_shock = (Commodity[shock[0]], shock[1])
+        return state
+
     def get_port_by_name(self, name: str) -> Optional[Port]:
         """Get a port by its name."""
-        for port in self.ports:
-            if port.name == name:
-                return port
-        return None
+        return self.world.port(name)
 
     def get_port_by_index(self, index: int) -> Optional[Port]:
         """Get a port by its index."""
@@ -44,21 +101,31 @@ class GameState:
 
     def get_current_port_index(self) -> int:
         """Get the index of the current port."""
-        for i, port in enumerate(self.ports):
-            if port.name == self.current_port.name:
-                return i
-        raise ValueError("Current port not found in ports list")
+        return self.current_port.get_port_index()
 
     def set_current_port(self, port: Port) -> None:
         """Set the current port."""
         self.current_port = port
 
+    @property
+    def day(self) -> int:
+        """Get the day of the month."""
+        return calendar(self.tick)[0]
+
+    @property
+    def month(self) -> int:
+        """Get the month of the year."""
+        return calendar(self.tick)[1]
+
+    @property
+    def year(self) -> int:
+        """Get the year."""
+        return calendar(self.tick)[2]
+
     def advance_time(self, days: int) -> None:
-        """Advance the game time by the specified number of days."""
-        self.day += days
-        while self.day > 30:
-            self.day -= 30
-            self.month += 1
-            if self.month > 12:
-                self.month = 1
-                self.year += 1 
\ No newline at end of file
+        """Advance the game time by the specified number of days.
+
+        This only moves the clock; ``GameEngine.advance_time`` also fires
+        the timers that fall due.
+        """
+        self.tick += days
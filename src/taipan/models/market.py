@@ -0,0 +1,198 @@
+"""Shared multiplayer market for Taipan."""
+
+import asyncio
+import math
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from taipan.models.commodity import Commodity
+from taipan.models.port import BASE_PRICES, PORT_NAMES
+
+if TYPE_CHECKING:
+    from taipan.models.economy import NpcEconomy
+
+Quotes = Dict[Tuple[str, Commodity], int]
+
+
+@dataclass(frozen=True)
+class Order:
+    """A filled trade reported to the market.
+
+    ``amount`` is positive for a buy and negative for a sell.
+    """
+    session: str
+    port: str
+    commodity: Commodity
+    amount: int
+
+
+class OrderBuffer:
+    """A market as a speculative branch sees it.
+
+    Prices are the live market's; the branch's orders wait in ``orders``
+    until the branch is committed and ``release`` submits them, so a
+    discarded branch never moves the market.
+    """
+
+    def __init__(self, market: 'SharedMarket'):
+        """Initialize an empty buffer in front of a market."""
+        self.market = market
+        self.orders: List[Order] = []
+
+    def covers(self, port: str) -> bool:
+        """Check whether the live market quotes a port."""
+        return self.market.covers(port)
+
+    def price(self, port: str, commodity: Commodity) -> int:
+        """Get the live market's price of a commodity at a port."""
+        return self.market.price(port, commodity)
+
+    def submit(self, order: Order) -> None:
+        """Hold an order back until the branch is committed."""
+        self.orders.append(order)
+
+    def release(self) -> None:
+        """Submit every held order to the market."""
+        orders, self.orders = self.orders, []
+        for order in orders:
+            self.market.submit(order)
+
+
+class SharedMarket:
+    """Port prices shared by every session trading in the same world.
+
+    Sessions fill their trades at the published quote and report them with
+    ``submit``, which only appends to a queue and never blocks. Once per tick
+    the queued orders are grouped by (port, commodity), buys are crossed
+    against sells in O(orders), and the net imbalance moves the price along
+    an impact curve before it drifts back toward the base price. Only the
+    markets with orders or still drifting back are touched. The new quotes
+    are then swapped in as one immutable dict and pushed to subscribers.
+
+    With an ``NpcEconomy`` attached, each tick's net orders are filled from
+    its port stocks, the economy advances once, and its prices replace the
+    static base prices as the anchor.
+
+    The market quotes the classic ports only; orders for any other port are
+    ignored.
+    """
+
+    IMPACT = 0.05       # Relative price move per DEPTH units of net demand
+    DEPTH = 100
+    REVERSION = 0.1     # Fraction of the gap to the base price closed per tick
+    MAX_MOVE = 0.5      # Largest relative move in a single tick
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        economy: Optional['NpcEconomy'] = None,
+    ):
+        """Initialize the market at the base prices."""
+        self.rng = rng or random.Random()
+        self.economy = economy
+        self.tick_count = 0
+        self._orders: Deque[Order] = deque()
+        self._base: Dict[Tuple[str, Commodity], int] = {
+            (port, commodity): prices[i]
+            for commodity, prices in BASE_PRICES.items()
+            for i, port in enumerate(PORT_NAMES)
+        }
+        self._levels = {key: float(base) for key, base in self._base.items()}
+        self._moving: Set[Tuple[str, Commodity]] = set()  # Away from their base
+        self.quotes: Quotes = {
+            key: self._quote(level) for key, level in self._levels.items()
+        }
+        self._subscribers: List[Callable[[int, Quotes], None]] = []
+
+    def covers(self, port: str) -> bool:
+        """Check whether the market quotes a port."""
+        return (port, Commodity.OPIUM) in self._base
+
+    def price(self, port: str, commodity: Commodity) -> int:
+        """Get the current published price of a commodity at a covered port."""
+        return self.quotes[(port, commodity)]
+
+    def submit(self, order: Order) -> None:
+        """Queue a filled trade for the next tick. Safe from any thread."""
+        self._orders.append(order)
+
+    def subscribe(self, callback: Callable[[int, Quotes], None]) -> None:
+        """Call ``callback(tick, quotes)`` after every tick."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[int, Quotes], None]) -> None:
+        """Stop publishing to a subscriber."""
+        self._subscribers.remove(callback)
+
+    def _drain(self) -> List[Order]:
+        """Take every order queued so far."""
+        orders = []
+        try:
+            while True:
+                orders.append(self._orders.popleft())
+        except IndexError:
+            return orders
+
+    def match(self, orders: List[Order]) -> Dict[Tuple[str, Commodity], int]:
+        """Cross buys against sells and return net demand per market."""
+        net: Dict[Tuple[str, Commodity], int] = {}
+        for order in orders:
+            key = (order.port, order.commodity)
+            net[key] = net.get(key, 0) + order.amount
+        return net
+
+    def tick(self) -> Quotes:
+        """Match this tick's orders and publish the resulting prices."""
+        net = self.match(self._drain())
+        for key in net.keys() - self._base.keys():
+            del net[key]  # A port the market does not quote
+        if self.economy is not None:
+            for (port, commodity), amount in net.items():
+                self.economy.trade(port, commodity, amount)
+            self.economy.step()
+            keys = set(self._levels)  # Every anchor has moved
+        else:
+            keys = self._moving | net.keys()
+        changed: Quotes = {}
+        for key in keys:
+            if self.economy is not None:
+                base = self.economy.price(*key)
+            else:
+                base = self._base[key]
+            move = self.IMPACT * net.get(key, 0) / self.DEPTH
+            move = max(-self.MAX_MOVE, min(self.MAX_MOVE, move))
+            level = self._levels[key] * math.exp(move)
+            level += self.REVERSION * (base - level)
+            if abs(level - base) < 0.5:
+                level = float(base)  # Settled; nothing to revert until the next order
+                self._moving.discard(key)
+            else:
+                self._moving.add(key)
+            self._levels[key] = level
+            changed[key] = self._quote(level)
+
+        quotes = self.quotes
+        if changed:
+            quotes = dict(quotes)
+            quotes.update(changed)
+        self.publish(self.tick_count + 1, quotes)
+        return quotes
+
+    def publish(self, tick: int, quotes: Quotes) -> None:
+        """Swap in a tick's quotes and push them to subscribers."""
+        self.tick_count = tick
+        self.quotes = quotes
+        for callback in list(self._subscribers):
+            callback(tick, quotes)
+
+    def _quote(self, level: float) -> int:
+        """Round a price level to a quote with a small random fluctuation."""
+        return max(1, round(level) + self.rng.randint(-2, 2))
+
+    async def run(self, interval: float = 1.0) -> None:
+        """Tick forever on the running event loop."""
+        while True:
+            await asyncio.sleep(interval)
+            self.tick()
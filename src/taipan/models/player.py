@@ -1,7 +1,7 @@
 """Player model for Taipan."""
 
-from dataclasses import dataclass, field
-from typing import Dict
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict
 
 from taipan.models.commodity import Commodity
 from taipan.models.ship import Ship
@@ -20,14 +20,32 @@ class Player:
         default_factory=lambda: {c: 0 for c in Commodity}
     )
     ship: Ship = field(default_factory=lambda: Ship(capacity=60))
-    month: int = 1
-    year: int = 1860
+    warehouse_capacity: int = 10000
     li_yuen_visited: bool = False
     wu_warning: bool = False
     wu_bailout: int = 0
     enemy_strength: float = 20.0  # Base health of enemies
     enemy_damage: float = 0.5    # Damage dealt by enemies
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain JSON-compatible data."""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["warehouse"] = {c.name: n for c, n in self.warehouse.items()}
+        data["hold"] = {c.name: n for c, n in self.hold.items()}
+        data["ship"] = self.ship.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Player':
+        """Create a player from ``to_dict`` output."""
+        data = dict(data)
+        data["warehouse"] = {
+            Commodity[name]: n for name, n in data["warehouse"].items()
+        }
+        data["hold"] = {Commodity[name]: n for name, n in data["hold"].items()}
+        data["ship"] = Ship.from_dict(data["ship"])
+        return cls(**data)
+
     def get_total_cargo(self) -> int:
         """Get total amount of cargo in hold."""
         return self.ship.get_total_cargo()
@@ -38,7 +56,7 @@ class Player:
 
     def get_warehouse_available(self) -> int:
         """Get amount of warehouse space available."""
-        return 10000 - self.get_warehouse_used()
+        return self.warehouse_capacity - self.get_warehouse_used()
 
     def can_afford(self, amount: int) -> bool:
         """Check if player can afford an amount."""
@@ -1,8 +1,9 @@
 """Port model for Taipan."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import List, Mapping, Optional, Sequence, Tuple
 import random
+import zlib
 
 from taipan.models.commodity import Commodity
 
@@ -20,33 +21,64 @@ BASE_PRICES = {
     Commodity.GENERAL: [1, 10, 11, 12, 13, 14, 15, 16],
 }
 
+# Where the original game's ports lie, in degrees east and north
+PORT_POSITIONS = {
+    "Hong Kong": (114.2, 22.3), "Shanghai": (121.5, 31.2), "Nagasaki": (129.9, 32.7),
+    "Saigon": (106.7, 10.8), "Manila": (121.0, 14.6), "Singapore": (103.8, 1.3),
+    "Batavia": (106.8, -6.2),
+}
+
 @dataclass
 class Port:
-    """Port location and trading information."""
+    """Port location and trading information.
+
+    Ports are told apart by name alone. Ports of a generated world also
+    carry their index in the world and their own base prices.
+    """
     name: str
+    index: int = field(default=-1, compare=False)
+    x: float = field(default=0.0, compare=False)
+    y: float = field(default=0.0, compare=False)
+    prices: Optional[Tuple[int, ...]] = field(default=None, compare=False, repr=False)
+
+    def base_price(
+        self,
+        commodity: Commodity,
+        base_prices: Mapping[Commodity, Sequence[int]] = BASE_PRICES,
+    ) -> int:
+        """Get the price a commodity settles around here."""
+        if self.prices is not None:
+            return self.prices[commodity.value - 1]
+        return base_prices[commodity][self.get_port_index()]
+
+    def get_price(
+        self,
+        commodity: Commodity,
+        base_prices: Mapping[Commodity, Sequence[int]] = BASE_PRICES,
+        day: Optional[int] = None,
+    ) -> int:
+        """Get current price for a commodity.
 
-    def get_price(self, commodity: Commodity) -> int:
-        """Get current price for a commodity."""
-        port_index = self.get_port_index()
-        base_price = BASE_PRICES[commodity][port_index]
-        fluctuation = random.randint(-2, 2)  # Small random fluctuation
-        return max(1, base_price + fluctuation)
+        On a given ``day`` the fluctuation is fixed, so the price holds
+        steady until time passes; without one it is drawn afresh.
+        """
+        if day is None:
+            fluctuation = random.randint(-2, 2)  # Small random fluctuation
+        else:
+            key = f"{self.name}:{commodity.name}:{day}".encode()
+            fluctuation = zlib.crc32(key) % 5 - 2
+        return max(1, self.base_price(commodity, base_prices) + fluctuation)
 
     def get_port_index(self) -> int:
-        """Get the port's index in the original game's port list."""
+        """Get the port's index in its world's port list."""
+        if self.index >= 0:
+            return self.index
         return PORT_NAMES.index(self.name)
 
     @classmethod
     def initialize_ports(cls) -> List['Port']:
         """Initialize all ports in the game."""
-        ports = [
-            cls(name="At Sea"),
-            cls(name="Hong Kong"),
-            cls(name="Shanghai"),
-            cls(name="Nagasaki"),
-            cls(name="Saigon"),
-            cls(name="Manila"),
-            cls(name="Singapore"),
-            cls(name="Batavia"),
+        return [
+            cls(name, i, *PORT_POSITIONS.get(name, (0.0, 0.0)))
+            for i, name in enumerate(PORT_NAMES)
         ]
-        return ports 
\ No newline at end of file
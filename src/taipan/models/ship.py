@@ -1,7 +1,7 @@
 """Ship model for Taipan."""
 
-from dataclasses import dataclass, field
-from typing import Dict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict
 
 from taipan.models.commodity import Commodity
 
@@ -15,6 +15,19 @@ class Ship:
         default_factory=lambda: {c: 0 for c in Commodity}
     )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain JSON-compatible data."""
+        data = asdict(self)
+        data["hold"] = {c.name: n for c, n in self.hold.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Ship':
+        """Create a ship from ``to_dict`` output."""
+        data = dict(data)
+        data["hold"] = {Commodity[name]: n for name, n in data["hold"].items()}
+        return cls(**data)
+
     def get_total_cargo(self) -> int:
         """Get total amount of cargo in hold."""
         return sum(self.hold.values())
@@ -63,13 +76,13 @@ class Ship:
         if self.damage < 0:
             self.damage = 0
 
-    def add_gun(self) -> None:
+    def add_gun(self, space: int = 10) -> None:
         """Add a gun to the ship."""
         self.guns += 1
-        self.capacity -= 10  # Each gun takes 10 units of cargo space
+        self.capacity -= space  # Each gun takes up cargo space
 
-    def remove_gun(self) -> None:
+    def remove_gun(self, space: int = 10) -> None:
         """Remove a gun from the ship."""
         if self.guns > 0:
             self.guns -= 1
-            self.capacity += 10  # Recover 10 units of cargo space 
\ No newline at end of file
+            self.capacity += space  # Recover the gun's cargo space 
\ No newline at end of file
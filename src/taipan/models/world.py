@@ -0,0 +1,212 @@
+"""The map: which ports there are, where they lie, and how far apart.
+
+The classic game has the eight ports of ``PORT_NAMES``. A generated world
+("grand campaign") keeps those and scatters thousands more across the
+seas around them in archipelagos, each with its own base prices. Prices
+follow smooth gradients across the map, so neighbouring ports quote alike
+and long hauls pay.
+
+Positions are in degrees of longitude and latitude. Every lookup is
+sub-linear in the number of ports: names and indices through dicts and
+lists, and places through a uniform grid of cells holding a few ports each.
+"""
+
+import functools
+import heapq
+import math
+import random
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from taipan.models.commodity import Commodity
+from taipan.models.port import BASE_PRICES, Port
+
+SAIL_PER_DAY = 2.0  # Degrees a ship covers in a day
+PORTS_PER_CELL = 4  # Grid density the spatial index aims for
+ARCHIPELAGO = 20  # Ports per island group in a generated world
+
+_SYLLABLES = (
+    "ba", "da", "ka", "la", "ma", "na", "pa", "sa", "ta", "wa", "be", "ke", "le",
+    "me", "ne", "se", "te", "bi", "ki", "li", "mi", "ni", "si", "ti", "bo", "ko",
+    "lo", "mo", "no", "po", "so", "to", "bu", "ku", "lu", "mu", "nu", "pu", "su",
+    "tu", "an", "ang", "ong", "un", "ai", "ao", "hai", "jin", "lan", "pin",
+)
+
+
+class SpatialGrid:
+    """Uniform grid of points for nearest-neighbour and range queries."""
+
+    def __init__(self, points: List[Tuple[int, float, float]], cell: float):
+        """Index ``(key, x, y)`` points in square cells ``cell`` wide."""
+        self.cell = cell
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, int]]] = {}
+        for key, x, y in points:
+            self.cells.setdefault(self._cell(x, y), []).append((x, y, key))
+        if self.cells:
+            xs = [cx for cx, _ in self.cells]
+            ys = [cy for _, cy in self.cells]
+            self._extent = max(max(xs) - min(xs), max(ys) - min(ys)) + 1
+        else:
+            self._extent = 0
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        """Get the cell holding a position."""
+        return (math.floor(x / self.cell), math.floor(y / self.cell))
+
+    def _ring(
+        self, cx: int, cy: int, r: int
+    ) -> Iterator[List[Tuple[float, float, int]]]:
+        """Yield the occupied cells at Chebyshev distance ``r`` from a cell."""
+        if r == 0:
+            cells = [(cx, cy)]
+        else:
+            cells = [(cx + dx, cy + dy) for dx in range(-r, r + 1) for dy in (-r, r)]
+            cells += [(cx + dx, cy + dy) for dx in (-r, r) for dy in range(-r + 1, r)]
+        for cell in cells:
+            found = self.cells.get(cell)
+            if found:
+                yield found
+
+    def nearest(self, x: float, y: float, k: int) -> List[int]:
+        """Get the keys of the ``k`` points nearest a position, nearest first.
+
+        Searches outward ring by ring and stops once no unvisited cell can
+        hold anything closer, so it visits O(k) points in an even spread.
+        The k best so far sit in a max-heap, so each point costs O(log k).
+        """
+        cx, cy = self._cell(x, y)
+        best: List[Tuple[float, int]] = []  # (-distance², -key); farthest on top
+        for r in range(self._extent + 1):
+            for points in self._ring(cx, cy, r):
+                for px, py, key in points:
+                    entry = (-((px - x) ** 2 + (py - y) ** 2), -key)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+            # Every cell outside ring r is at least r cells away.
+            if len(best) >= k and -best[0][0] <= (r * self.cell) ** 2:
+                break
+        return [-key for _, key in sorted(best, reverse=True)]
+
+    def within(self, x: float, y: float, radius: float) -> List[int]:
+        """Get the keys of the points within ``radius`` of a position, nearest first."""
+        x0, y0 = self._cell(x - radius, y - radius)
+        x1, y1 = self._cell(x + radius, y + radius)
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for px, py, key in self.cells.get((cx, cy), ()):
+                    d = (px - x) ** 2 + (py - y) ** 2
+                    if d <= radius * radius:
+                        found.append((d, key))
+        return [key for _, key in sorted(found)]
+
+
+class World:
+    """The ports of a game, indexed by name and by place."""
+
+    def __init__(self, ports: List[Port], seed: Optional[int] = None):
+        """Index a list of ports; ``seed`` is set for generated worlds."""
+        self.ports = ports
+        self.seed = seed
+        self._by_name = {port.name: port for port in ports}
+        trading = [(i, p.x, p.y) for i, p in enumerate(ports) if p.name != "At Sea"]
+        xs = [x for _, x, _ in trading] or [0.0]
+        ys = [y for _, _, y in trading] or [0.0]
+        area = max(1.0, (max(xs) - min(xs)) * (max(ys) - min(ys)))
+        cell = math.sqrt(area * PORTS_PER_CELL / max(1, len(trading)))
+        self.grid = SpatialGrid(trading, cell)
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def classic(cls) -> 'World':
+        """Get the eight ports of the original game."""
+        return cls(Port.initialize_ports())
+
+    @classmethod
+    @functools.lru_cache(maxsize=4)
+    def generate(cls, count: int, seed: int = 0) -> 'World':
+        """Generate a world of ``count`` trading ports around the classic ones."""
+        rng = random.Random(seed)
+        ports = Port.initialize_ports()
+        names = {port.name for port in ports}
+        extra = max(0, count - (len(ports) - 1))
+        side = max(40.0, math.sqrt(extra) * 0.6)  # Degrees; roughly even spacing
+        centre_x, centre_y = 116.0, 12.0  # The South China Sea
+        groups = [(centre_x + rng.uniform(-side, side) / 2,
+                   centre_y + rng.uniform(-side, side) / 2)
+                  for _ in range(max(1, extra // ARCHIPELAGO))]
+        waves = {c: (rng.uniform(0.05, 0.2), rng.uniform(0.05, 0.2),
+                     rng.uniform(0, math.tau), rng.uniform(0, math.tau))
+                 for c in Commodity}
+        for index in range(len(ports), len(ports) + extra):
+            gx, gy = rng.choice(groups)
+            x = gx + rng.gauss(0, side / 40)
+            y = gy + rng.gauss(0, side / 40)
+            prices = []
+            for commodity in Commodity:
+                fx, fy, px, py = waves[commodity]
+                classic = BASE_PRICES[commodity][1:]
+                mean = sum(classic) / len(classic)
+                swing = (math.sin(x * fx + px) + math.cos(y * fy + py)) * 2.5
+                prices.append(max(1, round(mean + swing + rng.uniform(-1, 1))))
+            name = _port_name(rng, names)
+            names.add(name)
+            ports.append(Port(name=name, index=index, x=x, y=y, prices=tuple(prices)))
+        return cls(ports, seed)
+
+    @property
+    def generated(self) -> bool:
+        """Whether this is a generated world rather than the classic one."""
+        return self.seed is not None
+
+    def port(self, name: str) -> Optional[Port]:
+        """Get a port by its name."""
+        return self._by_name.get(name)
+
+    def distance(self, a: Port, b: Port) -> float:
+        """Get the distance between two ports in degrees."""
+        return math.hypot(a.x - b.x, a.y - b.y)
+
+    def passage_days(self, a: Port, b: Port) -> int:
+        """Get the days a passage between two ports takes.
+
+        The classic game sails anywhere in a day; generated worlds sail at
+        ``SAIL_PER_DAY``.
+        """
+        if not self.generated or a.name == "At Sea" or b.name == "At Sea":
+            return 1
+        return max(1, math.ceil(self.distance(a, b) / SAIL_PER_DAY))
+
+    def nearest(self, port: Port, k: int) -> List[Port]:
+        """Get the ``k`` trading ports nearest a port, nearest first, not itself."""
+        keys = self.grid.nearest(port.x, port.y, k + 1)
+        return [self.ports[key] for key in keys if self.ports[key] != port][:k]
+
+    def within(self, port: Port, radius: float) -> List[Port]:
+        """Get the trading ports within ``radius`` degrees of a port, nearest first."""
+        keys = self.grid.within(port.x, port.y, radius)
+        return [self.ports[key] for key in keys if self.ports[key] != port]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain JSON-compatible data; generated worlds store a seed."""
+        if not self.generated:
+            return {}
+        return {"ports": len(self.ports) - 1, "seed": self.seed}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'World':
+        """Create a world from ``to_dict`` output."""
+        if not data:
+            return cls.classic()
+        return cls.generate(data["ports"], data["seed"])
+
+
+def _port_name(rng: random.Random, taken: Set[str]) -> str:
+    """Make up a port name nobody has taken yet."""
+    while True:
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+        if rng.random() < 0.3:
+            name += rng.choice((" Bay", " Island", " Point", " Harbour"))
+        if name not in taken:
+            return name
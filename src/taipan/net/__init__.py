@@ -0,0 +1 @@
+"""Networking support for remote clients."""
@@ -0,0 +1,342 @@
+"""Host process that owns what a launcher's sessions share.
+
+The launcher forks one host before it forks any worker. Workers connect
+to it over a Unix socket with a ``HostClient`` and play against a
+``RemoteMarket``, saving through a ``RemoteStore``:
+- Trades are sent to the host as orders, from a sender thread, so
+  ``submit`` never blocks the session's event loop.
+- The host ticks the one ``SharedMarket`` and pushes each tick's quotes
+  to every worker. A reader thread swaps them in and tells the app.
+- Saves go the same way, as frozen snapshots, to the host's one session
+  store, so a single writer batches every session's saves. Loads are
+  requests that wait for the host's reply.
+
+Messages are pickled tuples over ``multiprocessing.connection``, whose
+first item names the message.
+"""
+
+import itertools
+import logging
+import os
+import queue
+import signal
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from taipan.models.game_engine import GameEngine
+from taipan.models.market import Order, Quotes, SharedMarket
+
+log = logging.getLogger(__name__)
+
+INTERVAL = 1.0  # Seconds between market ticks
+STARTUP = 5.0  # Seconds to wait for a new host to listen
+REQUEST_TIMEOUT = 30.0  # Seconds to wait for the host to answer a request
+
+
+class Host:
+    """Serves one market to every worker that connects."""
+
+    def __init__(self, address: str, market: SharedMarket, interval: float = INTERVAL,
+                 store: Any = None):
+        """Initialize the host; ``serve_forever`` starts listening.
+
+        ``store`` saves every worker's sessions, e.g. a ``SessionStore``.
+        """
+        self.address = address
+        self.market = market
+        self.interval = interval
+        self.store = store
+        self._clients: Dict[Connection, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener = Listener(address, family="AF_UNIX")
+        market.subscribe(self._publish)
+
+    def serve_forever(self) -> None:
+        """Accept workers and tick the market until closed."""
+        ticker = threading.Thread(target=self._tick, name="market", daemon=True)
+        ticker.start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn = self._listener.accept()
+                except OSError:
+                    break  # Closed
+                if self._stop.is_set():
+                    conn.close()  # Only close() waking us up
+                    break
+                with self._lock:
+                    self._clients[conn] = threading.Lock()
+                self._send(conn, ("quotes", self.market.tick_count, self.market.quotes))
+                threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+            if self.store is not None:
+                self.store.close()  # Commits what workers have saved
+
+    def close(self) -> None:
+        """Stop ticking and accepting workers."""
+        if not self._stop.is_set():
+            self._stop.set()
+            try:
+                Client(self.address, family="AF_UNIX").close()  # Wake up accept()
+            except OSError:
+                pass
+        self._listener.close()
+
+    def _tick(self) -> None:
+        """Tick the market every interval."""
+        while not self._stop.wait(self.interval):
+            self.market.tick()
+
+    def _serve(self, conn: Connection) -> None:
+        """Handle one worker's messages until it disconnects."""
+        try:
+            while True:
+                message = conn.recv()
+                self.handle(conn, message)
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self._lock:
+                self._clients.pop(conn, None)
+            conn.close()
+
+    def handle(self, conn: Connection, message: tuple) -> None:
+        """Act on one message from a worker."""
+        kind = message[0]
+        if kind == "orders":
+            for order in message[1]:
+                self.market.submit(order)
+        elif kind == "save":
+            _, name, state, config = message
+            try:
+                self.store.put(name, state, config)
+            except RuntimeError:
+                log.warning("Store closed; dropping a save of %s", name)
+        elif kind == "request":
+            _, key, request, *args = message
+            try:
+                reply = (True, self.answer(request, *args))
+            except Exception as e:
+                log.exception("Failed to answer %r", request)
+                reply = (False, repr(e))
+            self._send(conn, ("reply", key, *reply))
+        else:
+            log.warning("Unknown host message %r", kind)
+
+    def answer(self, request: str, *args: Any) -> Any:
+        """Answer a worker's request to the session store."""
+        if request == "load":
+            engine = self.store.load(*args)
+            return (engine.state, engine.config) if engine is not None else None
+        if request == "latest":
+            return self.store.latest()
+        if request == "flush":
+            return self.store.flush()
+        raise ValueError(f"Unknown request {request!r}")
+
+    def _send(self, conn: Connection, message: tuple) -> None:
+        """Send a message to one worker, dropping it if it has gone."""
+        with self._lock:
+            lock = self._clients.get(conn)
+        if lock is None:
+            return
+        try:
+            with lock:
+                conn.send(message)
+        except OSError:
+            with self._lock:
+                self._clients.pop(conn, None)
+
+    def _publish(self, tick: int, quotes: Quotes) -> None:
+        """Push a tick's quotes to every worker."""
+        with self._lock:
+            clients = list(self._clients)
+        for conn in clients:
+            self._send(conn, ("quotes", tick, quotes))
+
+
+def start_host(address: str, market: Optional[SharedMarket] = None,
+               interval: float = INTERVAL,
+               store: Optional[Callable[[], Any]] = None) -> int:
+    """Fork a host process serving at ``address``; return its pid once it listens.
+
+    ``store`` builds the session store in the host, after the fork, since
+    SQLite connections must not cross one.
+    """
+    parent = os.getpid()
+    pid = os.fork()
+    if pid:
+        deadline = time.monotonic() + STARTUP
+        while not os.path.exists(address) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return pid
+    code = 0
+    try:
+        host = Host(address, market or SharedMarket(), interval,
+                    store() if store is not None else None)
+        # The launcher stops the host with SIGTERM; wind down cleanly.
+        signal.signal(signal.SIGTERM, lambda *_: host.close())
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C is the launcher's
+        threading.Thread(target=_watch, args=(parent, host), daemon=True).start()
+        host.serve_forever()
+    except BaseException:
+        log.exception("Host crashed")
+        code = 1
+    os._exit(code)
+
+
+def _watch(parent: int, host: Host) -> None:
+    """Close the host if the launcher dies without stopping it."""
+    while os.getppid() == parent:
+        time.sleep(1.0)
+    host.close()
+
+
+class HostClient:
+    """A worker's connection to the host."""
+
+    def __init__(self, address: str):
+        """Connect to the host and start the sender and reader threads."""
+        self.market: Optional['RemoteMarket'] = None
+        self.quotes: Optional[Tuple[int, Quotes]] = None  # The latest from the host
+        self._lock = threading.Lock()
+        self._replies: Dict[int, "queue.Queue[tuple]"] = {}  # Request -> its reply
+        self._ids = itertools.count()
+        self._conn = Client(address, family="AF_UNIX")
+        self._outbox: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._sender = threading.Thread(target=self._send, name="host-send",
+                                        daemon=True)
+        self._reader = threading.Thread(target=self._read, name="host-read",
+                                        daemon=True)
+        self._sender.start()
+        self._reader.start()
+
+    def attach(self, market: 'RemoteMarket') -> None:
+        """Publish the host's quotes through a market from now on."""
+        with self._lock:
+            self.market = market
+            latest = self.quotes
+        if latest is not None:
+            market.publish(*latest)
+
+    def send(self, *message: Any) -> None:
+        """Queue a message for the host without waiting."""
+        self._outbox.put(message)
+
+    def request(self, *message: Any) -> Any:
+        """Send a request to the host and wait for its reply."""
+        reply: "queue.Queue[tuple]" = queue.Queue(maxsize=1)
+        with self._lock:
+            key = next(self._ids)
+            self._replies[key] = reply
+        self.send("request", key, *message)
+        try:
+            ok, value = reply.get(timeout=REQUEST_TIMEOUT)
+        except queue.Empty:
+            raise TimeoutError(f"The host did not answer {message[0]!r}") from None
+        finally:
+            with self._lock:
+                self._replies.pop(key, None)
+        if not ok:
+            raise RuntimeError(f"The host failed to answer {message[0]!r}: {value}")
+        return value
+
+    def close(self) -> None:
+        """Send what is queued and disconnect."""
+        self._outbox.put(None)
+        self._sender.join()
+        self._conn.close()
+
+    def _send(self) -> None:
+        """Send queued messages, on the sender thread."""
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            try:
+                self._conn.send(message)
+            except OSError:
+                log.warning("Lost the host; dropping %r", message[0])
+
+    def _read(self) -> None:
+        """Receive quotes and replies from the host, on the reader thread."""
+        try:
+            while True:
+                message = self._conn.recv()
+                if message[0] == "quotes":
+                    with self._lock:
+                        self.quotes = (message[1], message[2])
+                        market = self.market
+                    if market is not None:
+                        market.publish(message[1], message[2])
+                elif message[0] == "reply":
+                    with self._lock:
+                        reply = self._replies.get(message[1])
+                    if reply is not None:
+                        reply.put(message[2:])
+        except (EOFError, OSError):
+            pass
+        # Nobody will answer the requests still waiting.
+        with self._lock:
+            waiting = list(self._replies.values())
+        for reply in waiting:
+            reply.put((False, "lost the host"))
+
+
+class RemoteMarket(SharedMarket):
+    """The host's market as a worker sees it.
+
+    Quotes are the host's, swapped in as they arrive. Orders go to the
+    host, which matches them with every other session's.
+    """
+
+    def __init__(self, client: HostClient):
+        """Initialize the market at the base prices until the host's quotes arrive."""
+        super().__init__()
+        self.client = client
+        client.attach(self)
+
+    def submit(self, order: Order) -> None:
+        """Send a filled trade to the host without waiting."""
+        self.client.send("orders", [order])
+
+    def tick(self) -> Quotes:
+        """Refuse to tick: only the host moves prices."""
+        raise RuntimeError("Only the host ticks the shared market")
+
+
+class RemoteStore:
+    """The host's session store as a worker sees it.
+
+    It stands in for an ``Autosaver`` or a ``SessionStore``. ``save`` queues
+    an O(1) snapshot for the sender thread to pass to the host, so it never
+    blocks the event loop.
+    """
+
+    def __init__(self, client: HostClient):
+        """Initialize the store over a connection to the host."""
+        self.client = client
+
+    def save(self, name: str, engine: GameEngine) -> None:
+        """Send a snapshot of a game to the host without waiting."""
+        self.client.send("save", name, engine.fork().state, engine.config)
+
+    def load(self, name: str) -> Optional[GameEngine]:
+        """Load a session's last save from the host, if it has one."""
+        game = self.client.request("load", name)
+        return GameEngine(state=game[0], config=game[1]) if game is not None else None
+
+    def latest(self) -> Optional[str]:
+        """Get the session the host saved most recently, if there is one."""
+        return self.client.request("latest")
+
+    def flush(self) -> None:
+        """Wait until the host has stored every save sent so far."""
+        self.client.request("flush")
+
+    def close(self) -> None:
+        """Do nothing: the host owns the store and closes it."""
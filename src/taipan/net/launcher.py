@@ -0,0 +1,351 @@
+"""Pre-forked launcher that serves each TCP connection its own game.
+
+The parent imports and warms everything once, by playing a headless game,
+so Textual, Rich, the ``taipan.ui`` modules and the shared CSS cache are
+all loaded before any player connects. It then moves every object it holds
+out of the garbage collector's view with ``gc.freeze`` and forks a pool of
+idle workers. Each worker builds its app, blocks in ``accept`` and serves
+one connection through a pseudo-terminal. The warm state is shared
+copy-on-write, and the collector never touches it, so the pages stay
+shared.
+
+Before any of that it forks a host process (``taipan.net.host``) that
+owns the market every session trades on and the one session store every
+worker saves to. With ``--economy`` NPC merchants trade on that market too.
+
+A client names its session by sending ``TAIPAN <name>`` and a newline
+first; a named session resumes its last save, even across restarts.
+Clients that send nothing else play an anonymous session.
+
+POSIX only. Connect with ``--play``, or any raw terminal, e.g.::
+
+    python -m taipan.net.launcher --port 7070 --workers 8
+    python -m taipan.net.launcher --port 7070 --play alice
+    socat -,raw,echo=0 tcp:localhost:7070
+"""
+
+import argparse
+import fcntl
+import functools
+import gc
+import logging
+import os
+import pty
+import re
+import select
+import shutil
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import termios
+import threading
+import time
+import tty
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+Size = Tuple[int, int]
+
+log = logging.getLogger(__name__)
+
+HELLO = b"TAIPAN "  # Starts the line a client names its session with
+HELLO_WAIT = 0.05  # Seconds to wait for a client to name its session
+SESSION_NAME = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+
+
+def read_hello(conn: socket.socket, wait: float = HELLO_WAIT) -> Optional[str]:
+    """Consume a client's ``TAIPAN <name>`` line, if it sends one first.
+
+    Returns the session's name, or None for an anonymous session. Anything
+    else the client sent is left for the session to read.
+    """
+    longest = len(HELLO) + 64 + 1
+    deadline = time.monotonic() + wait
+    while True:
+        remaining = deadline - time.monotonic()
+        readable, _, _ = select.select([conn], [], [], max(0.0, remaining))
+        if not readable:
+            return None
+        data = conn.recv(longest, socket.MSG_PEEK)
+        if not data or not HELLO.startswith(data[:len(HELLO)]):
+            return None  # Keystrokes, or the client hung up
+        end = data.find(b"\n")
+        if end >= 0:
+            conn.recv(end + 1)
+            name = data[len(HELLO):end].strip().decode("ascii", "replace")
+            return name if SESSION_NAME.fullmatch(name) else None
+        if len(data) == longest or remaining <= 0:
+            return None  # Not a hello after all
+        time.sleep(0.001)  # The rest of the line is on its way
+
+
+def _relay(conn: socket.socket, master: int, on_hangup) -> None:
+    """Copy bytes between a client and the session's terminal until either closes."""
+    try:
+        while True:
+            readable, _, _ = select.select([conn, master], [], [])
+            if conn in readable:
+                data = conn.recv(4096)
+                if not data:
+                    on_hangup()
+                    return
+                os.write(master, data)
+            if master in readable:
+                try:
+                    data = os.read(master, 65536)
+                except OSError:
+                    return  # The app has exited and closed the terminal
+                if not data:
+                    return
+                conn.sendall(data)
+    except OSError:
+        on_hangup()
+
+
+def serve_session(app, conn: socket.socket, size: Size) -> None:
+    """Run an app for one client, with the client as its terminal."""
+    master, slave = pty.openpty()
+    columns, rows = size
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", rows, columns, 0, 0))
+    # Textual reads stdin and writes to stderr; stdout gets stray prints.
+    for fd in (0, 1, 2):
+        os.dup2(slave, fd)
+    os.close(slave)
+
+    relay = threading.Thread(
+        target=_relay, args=(conn, master, lambda: app.call_from_thread(app.exit)),
+        daemon=True,
+    )
+    relay.start()
+    try:
+        app.run()
+    finally:
+        for fd in (0, 1, 2):
+            os.close(fd)  # Lets the relay see the end of the output
+        relay.join(timeout=1.0)
+        conn.close()
+
+
+class Launcher:
+    """Keeps a pool of warm idle workers, each waiting to serve one session."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 7070,
+        workers: int = 4,
+        size: Size = (80, 24),
+        autosave: bool = True,
+        store: Optional[str] = None,
+        economy: int = 0,
+    ):
+        """Initialize the launcher, saving to ``store`` if given, else to files.
+
+        With ``economy`` ships, the market is anchored by an NPC economy.
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.size = size
+        self.autosave = autosave
+        self.store = store
+        self.economy = economy
+        self.idle: Dict[int, bool] = {}  # Worker pid -> still waiting to accept
+        self.host_address = ""
+
+    def _worker(self, listener: socket.socket, notify: int) -> None:
+        """Serve one connection in a forked child, then exit."""
+        gc.enable()
+        from taipan.net.host import HostClient, RemoteMarket, RemoteStore
+        from taipan.ui.app import TaipanApp
+
+        # Saves go to the host's one store, which batches every session's.
+        host = HostClient(self.host_address)
+        autosaver = RemoteStore(host) if self.store or self.autosave else None
+        app = TaipanApp(autosaver=autosaver, session=uuid.uuid4().hex,
+                        market=RemoteMarket(host))
+        conn, _ = listener.accept()
+        listener.close()
+        os.write(notify, struct.pack("i", os.getpid()))
+        try:
+            name = read_hello(conn)
+            if name is not None:
+                app.session = name
+                app.resume = autosaver is not None
+            serve_session(app, conn, self.size)
+        finally:
+            host.close()
+
+    def _spawn(self, listener: socket.socket, notify: int) -> None:
+        """Fork one idle worker."""
+        pid = os.fork()
+        if pid == 0:
+            # The session's terminal takes over fd 2; log to the launcher's.
+            stderr = os.fdopen(os.dup(2), "w", buffering=1)
+            logging.basicConfig(stream=stderr, force=True)
+            code = 0
+            try:
+                self._worker(listener, notify)
+            except KeyboardInterrupt:
+                code = 1  # Ctrl-C in the launcher reaches idle workers too
+            except BaseException:
+                log.exception("Worker %d crashed", os.getpid())
+                code = 1
+            stderr.flush()
+            os._exit(code)
+        self.idle[pid] = True
+
+    def _reap(self) -> None:
+        """Forget workers that have exited."""
+        while self.idle:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            self.idle.pop(pid, None)
+
+    def serve_forever(self) -> None:
+        """Warm up, then keep ``workers`` idle workers ready until interrupted."""
+        from taipan.models.market import SharedMarket
+        from taipan.net.host import start_host
+        from taipan.store.autosave import Autosaver
+        from taipan.store.sessions import SessionStore
+
+        store = None  # Built in the host, after the fork
+        if self.store:
+            store = functools.partial(SessionStore, self.store)
+        elif self.autosave:
+            store = Autosaver
+        market = None
+        if self.economy:
+            from taipan.models.economy import NpcEconomy
+            market = SharedMarket(economy=NpcEconomy(self.economy))
+        # The host forks before this process starts any thread or warms up.
+        directory = tempfile.mkdtemp(prefix="taipan-")
+        self.host_address = os.path.join(directory, "host.sock")
+        host = start_host(self.host_address, market, store=store)
+
+        # Collections during warm-up would leave freed holes in pages the
+        # workers then share; the collector stays off in this process.
+        gc.disable()
+        from taipan.ui.headless import warm_up  # Only now, so the host stays lean
+
+        warm_up()
+        gc.freeze()
+
+        listener = socket.create_server((self.host, self.port), backlog=128)
+        readable, notify = os.pipe()
+        try:
+            while True:
+                self._reap()
+                while sum(self.idle.values()) < self.workers:
+                    self._spawn(listener, notify)
+                ready, _, _ = select.select([readable], [], [], 0.5)
+                if ready:
+                    data = os.read(readable, 4096)
+                    for (pid,) in struct.iter_unpack("i", data):
+                        if pid in self.idle:
+                            self.idle[pid] = False
+        finally:
+            listener.close()
+            # Workers already serving a player finish their session.
+            for pid, idle in self.idle.items():
+                if idle:
+                    os.kill(pid, signal.SIGTERM)
+            os.kill(host, signal.SIGTERM)
+            try:
+                os.waitpid(host, 0)
+            except ChildProcessError:
+                pass  # Already reaped
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def first_frame_times(
+    host: str = "127.0.0.1", port: int = 7070, sessions: int = 8, rows: int = 24
+) -> List[float]:
+    """Time from connecting until the first full screen has arrived, per session."""
+    last_row = f"\x1b[{rows};1H".encode()  # Frames are painted top to bottom
+    times = []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        with socket.create_connection((host, port), timeout=10) as conn:
+            conn.sendall(HELLO + b"\n")  # Anonymous, without waiting to say so
+            received = b""
+            while last_row not in received:
+                data = conn.recv(65536)
+                if not data:
+                    raise ConnectionError("Session closed before its first frame")
+                received += data
+            times.append(time.perf_counter() - start)
+        time.sleep(0.05)  # Give the pool a moment to replace the worker
+    return times
+
+
+def connect(host: str = "127.0.0.1", port: int = 7070,
+            session: Optional[str] = None) -> None:
+    """Play a session on a running launcher from this terminal."""
+    with socket.create_connection((host, port)) as conn:
+        conn.sendall(HELLO + (session or "").encode() + b"\n")
+        stdin, stdout = sys.stdin.fileno(), sys.stdout.fileno()
+        saved = termios.tcgetattr(stdin)
+        tty.setraw(stdin)
+        try:
+            while True:
+                readable, _, _ = select.select([conn, stdin], [], [])
+                if conn in readable:
+                    data = conn.recv(65536)
+                    if not data:
+                        return
+                    os.write(stdout, data)
+                if stdin in readable:
+                    conn.sendall(os.read(stdin, 4096))
+        finally:
+            termios.tcsetattr(stdin, termios.TCSADRAIN, saved)
+
+
+def main() -> None:
+    """Serve Taipan sessions over TCP from a pool of pre-forked workers."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("--workers", type=int, default=4, help="Idle workers to keep")
+    parser.add_argument("--size", default="80x24", help="Terminal size, e.g. 100x40")
+    parser.add_argument("--no-autosave", action="store_true")
+    parser.add_argument("--store", metavar="DB",
+                        help="Save sessions to this SQLite database instead of files")
+    parser.add_argument("--economy", type=int, default=0, metavar="SHIPS",
+                        help="Anchor the shared market with SHIPS NPC merchants")
+    parser.add_argument("--measure", type=int, metavar="SESSIONS",
+                        help="Time first frames against a running launcher instead")
+    parser.add_argument("--play", metavar="NAME",
+                        help="Play session NAME on a running launcher instead")
+    args = parser.parse_args()
+
+    if args.play:
+        if not SESSION_NAME.fullmatch(args.play):
+            parser.error("NAME takes up to 64 letters, digits, '_', '.' or '-'")
+        connect(args.host, args.port, args.play)
+        return
+
+    columns, rows = (int(n) for n in args.size.split("x"))
+    if args.measure:
+        from taipan.bench.loadtest import summarize
+
+        summary = summarize(first_frame_times(args.host, args.port, args.measure, rows))
+        print(f"first frame: p50 {summary['p50']:.1f}ms  p90 {summary['p90']:.1f}ms"
+              f"  max {summary['max']:.1f}ms")
+        return
+
+    launcher = Launcher(
+        args.host, args.port, args.workers, (columns, rows), not args.no_autosave,
+        args.store, args.economy,
+    )
+    try:
+        launcher.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
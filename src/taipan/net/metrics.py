@@ -0,0 +1,335 @@
+"""Operational metrics in Prometheus text format.
+
+Counters, gauges and histograms keep one shard of values per thread.
+Writers only ever touch their own thread's shard, so the hot paths take no
+lock; a scrape sums the shards.
+
+    python -m taipan.net.metrics --port 9108
+    curl localhost:9108/metrics
+"""
+
+import argparse
+import asyncio
+import bisect
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from textual.app import App
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+REGISTRY: List['Metric'] = []
+
+
+class _Shards:
+    """A value per thread, created on the thread's first write."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        """Initialize with a factory for empty shards."""
+        self._factory = factory
+        self._local = threading.local()
+        self._all: List[Any] = []
+        self._lock = threading.Lock()  # Only taken when a thread first writes
+
+    def mine(self) -> Any:
+        """Get the calling thread's shard."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self._factory()
+            with self._lock:
+                self._all.append(shard)
+            return shard
+
+    def all(self) -> List[Any]:
+        """Get every thread's shard, including threads that have exited."""
+        with self._lock:
+            return list(self._all)
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base for registered metrics."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        """Initialize and register the metric."""
+        self.name = name
+        self.help = help
+        REGISTRY.append(self)
+
+    def samples(self) -> List[Tuple[str, float]]:
+        """Get (sample name with labels, value) pairs."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Format the metric in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{sample} {value:g}" for sample, value in self.samples()]
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Monotonic count, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        """Initialize the counter."""
+        super().__init__(name, help)
+        self.labels = tuple(labels)
+        self._shards = _Shards(dict)
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        """Add to the count for a label set."""
+        shard = self._shards.mine()
+        shard[values] = shard.get(values, 0) + amount
+
+    def totals(self) -> Dict[Tuple[str, ...], float]:
+        """Sum the counts across threads."""
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in self._shards.all():
+            for values, count in list(shard.items()):
+                totals[values] = totals.get(values, 0) + count
+        return totals
+
+    def samples(self) -> List[Tuple[str, float]]:
+        """Get the samples."""
+        return [
+            (f"{self.name}_total{_labels(self.labels, values)}", count)
+            for values, count in sorted(self.totals().items())
+        ]
+
+
+class Gauge(Metric):
+    """Value that goes up and down, or is computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, help: str, function: Optional[Callable[[], float]] = None
+    ):
+        """Initialize the gauge."""
+        super().__init__(name, help)
+        self.function = function
+        self._shards = _Shards(lambda: [0.0])
+
+    def inc(self, amount: float = 1) -> None:
+        """Raise the value."""
+        self._shards.mine()[0] += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Lower the value."""
+        self._shards.mine()[0] -= amount
+
+    def value(self) -> float:
+        """Get the current value."""
+        if self.function is not None:
+            return self.function()
+        return sum(shard[0] for shard in self._shards.all())
+
+    def samples(self) -> List[Tuple[str, float]]:
+        """Get the samples."""
+        return [(self.name, self.value())]
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        """Initialize the histogram."""
+        super().__init__(name, help)
+        self.buckets = tuple(buckets)
+        # Per thread: a count for each bucket plus +Inf, then the running sum.
+        self._shards = _Shards(lambda: [0] * (len(self.buckets) + 1) + [0.0])
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        shard = self._shards.mine()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self) -> '_Timer':
+        """Time a block of code into the histogram."""
+        return _Timer(self)
+
+    def samples(self) -> List[Tuple[str, float]]:
+        """Get the samples."""
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for shard in self._shards.all():
+            for i in range(len(counts)):
+                counts[i] += shard[i]
+            total += shard[-1]
+        samples = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            cumulative += count
+            le = bound if isinstance(bound, str) else f"{bound:g}"
+            samples.append((f'{self.name}_bucket{{le="{le}"}}', cumulative))
+        samples.append((f"{self.name}_sum", total))
+        samples.append((f"{self.name}_count", cumulative))
+        return samples
+
+
+class _Timer:
+    """Context manager that observes its duration."""
+
+    def __init__(self, histogram: Histogram):
+        """Initialize the timer."""
+        self.histogram = histogram
+
+    def __enter__(self) -> None:
+        """Start timing."""
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Record the elapsed time."""
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+def resident_bytes() -> float:
+    """Get the process's resident memory."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Peak rather than current, but the best that is portable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+SESSIONS = Gauge("taipan_active_sessions", "Game sessions currently running.")
+COMMANDS = Counter(
+    "taipan_commands", "Game commands executed, by command.", ("command",)
+)
+RENDER_SECONDS = Histogram("taipan_render_seconds", "Time to render a screen update.")
+LOOP_LAG_SECONDS = Histogram(
+    "taipan_event_loop_lag_seconds", "How late the event loop runs a scheduled wakeup."
+)
+SAVE_SECONDS = Histogram("taipan_save_seconds", "Time to write one autosave.")
+SAVE_ERRORS = Counter("taipan_save_errors", "Autosaves that failed to write.")
+STORE_FLUSH_SECONDS = Histogram(
+    "taipan_store_flush_seconds", "Time to commit one batch of dirty sessions."
+)
+STORE_FLUSH_ERRORS = Counter(
+    "taipan_store_flush_errors",
+    "Failed commits of dirty sessions, by whether they were retried or dropped.",
+    ("outcome",),
+)
+FLUSH_SECONDS = Histogram(
+    "taipan_flush_seconds", "Time to encode and write one frame to the terminal."
+)
+QUALITY_CHANGES = Counter(
+    "taipan_quality_changes",
+    "Frame-budget quality level changes, by the level entered.",
+    ("level",),
+)
+DEGRADED_SESSIONS = Gauge(
+    "taipan_degraded_sessions", "Sessions drawing below full quality to keep up."
+)
+RESIDENT_BYTES = Gauge(
+    "taipan_resident_memory_bytes", "Resident memory of the process.", resident_bytes
+)
+SESSION_MEMORY_BYTES = Gauge(
+    "taipan_session_memory_bytes",
+    "Resident memory divided by active sessions.",
+    lambda: resident_bytes() / max(1, SESSIONS.value()),
+)
+
+
+def render() -> str:
+    """Format every registered metric."""
+    return "".join(metric.render() for metric in REGISTRY)
+
+
+def count_command(engine: Any, command: str) -> None:
+    """Engine listener that counts commands."""
+    COMMANDS.inc(command)
+
+
+async def watch_loop_lag(interval: float = 0.25) -> None:
+    """Measure how late the running event loop wakes up, forever."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - start - interval))
+
+
+async def _serve_scrape(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Answer one HTTP request with the metrics."""
+    try:
+        request = await reader.readline()
+        while (await reader.readline()).strip():
+            pass  # Skip the headers
+        if request.split()[1:2] == [b"/metrics"]:
+            status, body = "200 OK", render().encode()
+        else:
+            status, body = "404 Not Found", b"Not found\n"
+        writer.write(
+            f"HTTP/1.0 {status}\r\n"
+            "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_metrics(
+    host: str = "127.0.0.1", port: int = 9108
+) -> asyncio.AbstractServer:
+    """Start the metrics endpoint and the loop-lag probe on the running loop."""
+    server = await asyncio.start_server(_serve_scrape, host, port)
+    asyncio.get_running_loop().create_task(watch_loop_lag())
+    return server
+
+
+async def run_with_metrics(app: App, host: str = "127.0.0.1", port: int = 9108) -> None:
+    """Run an app with the metrics endpoint on the same event loop."""
+    server = await serve_metrics(host, port)
+    async with server:
+        await app.run_async()
+
+
+def main() -> None:
+    """Play Taipan with a Prometheus metrics endpoint."""
+    from taipan.store.autosave import Autosaver
+    from taipan.ui.app import TaipanApp
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9108)
+    args = parser.parse_args()
+
+    autosaver = Autosaver()
+    try:
+        app = TaipanApp(autosaver=autosaver)
+        asyncio.run(run_with_metrics(app, args.host, args.port))
+    finally:
+        autosaver.close()
+
+
+if __name__ == "__main__":
+    main()
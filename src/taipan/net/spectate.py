@@ -0,0 +1,163 @@
+"""Live spectating of a single Taipan session.
+
+The player's app renders exactly as usual. Its driver also hands every write
+to a ``Broadcaster``, which appends it once to a shared, bounded frame log.
+Each viewer only keeps a cursor into that log, so publishing costs the same
+however many viewers are attached. A viewer that falls further behind than
+the log holds is not waited for: it skips ahead to a freshly rendered
+keyframe of the whole screen, which is rendered once and shared by every
+viewer that needs it.
+"""
+
+import argparse
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Optional, Tuple, Type
+
+from textual.app import App
+from textual.driver import Driver
+
+from taipan.ui.compat import render_screen
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+
+class Broadcaster:
+    """Fan out a session's terminal output to read-only viewers."""
+
+    def __init__(
+        self,
+        keyframe: Callable[[], str],
+        max_frames: int = 256,
+        max_lag_bytes: int = 256 * 1024,
+    ):
+        """Initialize the broadcaster.
+
+        ``keyframe`` renders the full current screen. A viewer is dropped to
+        a keyframe once it lags by more than ``max_frames`` writes or
+        ``max_lag_bytes`` of output.
+        """
+        self.keyframe_source = keyframe
+        self.max_frames = max_frames
+        self.max_lag_bytes = max_lag_bytes
+        self.seq = 0  # Sequence number of the next frame
+        self.viewers = 0
+        self._frames: Deque[Tuple[int, str]] = deque(maxlen=max_frames)
+        self._offsets: Deque[int] = deque(maxlen=max_frames)  # Bytes before frame
+        self._total_bytes = 0
+        self._keyframe: Optional[Tuple[int, str]] = None
+        self._new_frame = asyncio.Event()
+
+    def publish(self, data: str) -> None:
+        """Append a chunk of terminal output. O(1) in the number of viewers."""
+        self._frames.append((self.seq, data))
+        self._offsets.append(self._total_bytes)
+        self._total_bytes += len(data)
+        self.seq += 1
+        self._new_frame.set()
+        self._new_frame = asyncio.Event()
+
+    def keyframe(self) -> Tuple[int, str]:
+        """Get a full-screen frame valid as of the current sequence number."""
+        if self._keyframe is None or self._keyframe[0] != self.seq:
+            self._keyframe = (self.seq, CLEAR_SCREEN + self.keyframe_source())
+        return self._keyframe
+
+    def _lagging(self, cursor: int) -> bool:
+        """Check whether a viewer at ``cursor`` must resync from a keyframe."""
+        if not self._frames or cursor < self._frames[0][0]:
+            return cursor < self.seq
+        lag = self._total_bytes - self._offsets[cursor - self._frames[0][0]]
+        return lag > self.max_lag_bytes
+
+    async def watch(self) -> AsyncIterator[str]:
+        """Yield the output a new viewer should write, forever."""
+        self.viewers += 1
+        try:
+            cursor, data = self.keyframe()
+            yield data
+            while True:
+                if cursor == self.seq:
+                    await self._new_frame.wait()
+                    continue
+                if self._lagging(cursor):
+                    cursor, data = self.keyframe()
+                    yield data
+                    continue
+                start = cursor - self._frames[0][0]
+                chunk = "".join(
+                    self._frames[i][1] for i in range(start, len(self._frames))
+                )
+                cursor = self.seq
+                yield chunk
+        finally:
+            self.viewers -= 1
+
+
+def render_keyframe(app: App) -> str:
+    """Render the app's whole current screen as terminal output."""
+    if not app.is_running or not app.screen_stack:
+        return ""
+    screen = render_screen(app)
+    if screen is None:
+        # Textual we cannot render directly: have the app repaint everything
+        # instead, which reaches viewers through the driver like any frame.
+        app.call_later(app.refresh_css, animate=False)
+        return ""
+    return screen
+
+
+def broadcast_driver(broadcaster: Broadcaster, base: Type[Driver]) -> Type[Driver]:
+    """Create a driver class that tees everything it writes to ``broadcaster``."""
+
+    class BroadcastDriver(base):  # type: ignore[valid-type, misc]
+        """Driver that also publishes its output to spectators."""
+
+        def write(self, data: str) -> None:
+            """Write data to the terminal and to spectators."""
+            super().write(data)
+            broadcaster.publish(data)
+
+    return BroadcastDriver
+
+
+async def serve_viewer(
+    broadcaster: Broadcaster,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Stream the session to one viewer connection, ignoring its input."""
+    try:
+        async for data in broadcaster.watch():
+            writer.write(data.encode("utf-8"))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def spectate(app: App, host: str = "127.0.0.1", port: int = 7007) -> None:
+    """Run an app with a spectator server on the same event loop."""
+    broadcaster = Broadcaster(lambda: render_keyframe(app))
+    app.driver_class = broadcast_driver(broadcaster, app.driver_class)
+    server = await asyncio.start_server(
+        lambda r, w: serve_viewer(broadcaster, r, w), host, port
+    )
+    async with server:
+        await app.run_async()
+
+
+def main() -> None:
+    """Play Taipan with spectators allowed to connect over TCP."""
+    from taipan.ui.app import TaipanApp
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7007)
+    args = parser.parse_args()
+    asyncio.run(spectate(TaipanApp(), args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Compact state-delta sync for remote clients and spectators.
+
+The synced view of a game is a fixed vector of integers (see ``FIELDS``).
+Each frame is::
+
+    kind:u8  version:varint  [base:varint]  mask:varint  values:zigzag varint*
+
+A keyframe carries every field and no base. A delta carries only the fields
+set in ``mask``, each as the difference from the client's acknowledged base
+version, which keeps typical frames to a handful of bytes.
+"""
+
+import pickle
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+
+KEYFRAME = 1
+DELTA = 2
+
+FIELDS: Tuple[str, ...] = (
+    "cash", "bank", "debt", "guns", "port", "tick",
+    *(f"hold_{c.name.lower()}" for c in Commodity),
+    *(f"price_{c.name.lower()}" for c in Commodity),
+)
+
+
+def capture(engine: GameEngine) -> Tuple[int, ...]:
+    """Read the synced fields from a game, in ``FIELDS`` order.
+
+    Prices are the engine's quotes, which hold still until the game or its
+    market moves, so capturing an unchanged game gives the same values and
+    draws nothing from any random number generator.
+    """
+    state = engine.state
+    player = state.player
+    return (
+        player.cash,
+        player.bank,
+        player.debt,
+        player.ship.guns,
+        state.current_port.get_port_index(),
+        state.tick,
+        *(player.ship.hold[c] for c in Commodity),
+        *(engine.get_price(c) for c in Commodity),
+    )
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 varint and return (value, new position)."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    """Map a signed integer onto an unsigned one, small magnitudes first."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    """Invert ``zigzag``."""
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def encode_frame(
+    version: int, values: Sequence[int], base: Optional[Sequence[int]] = None,
+    base_version: int = 0,
+) -> bytes:
+    """Encode a keyframe, or a delta against ``base`` when one is given."""
+    out = bytearray()
+    if base is None:
+        out.append(KEYFRAME)
+        write_varint(out, version)
+        write_varint(out, (1 << len(values)) - 1)
+        for value in values:
+            write_varint(out, zigzag(value))
+        return bytes(out)
+
+    out.append(DELTA)
+    write_varint(out, version)
+    write_varint(out, base_version)
+    mask = 0
+    diffs = []
+    for i, (new, old) in enumerate(zip(values, base)):
+        if new != old:
+            mask |= 1 << i
+            diffs.append(new - old)
+    write_varint(out, mask)
+    for diff in diffs:
+        write_varint(out, zigzag(diff))
+    return bytes(out)
+
+
+class DeltaEncoder:
+    """Server side of the sync protocol for one game.
+
+    ``commit`` records a new version whenever the synced fields change.
+    ``encode`` then builds the smallest frame that brings a client from its
+    acknowledged version up to date, falling back to a keyframe when the
+    client is new, too far behind, or a periodic keyframe is due.
+    """
+
+    KEYFRAME_INTERVAL = 100  # Force a keyframe at least this often
+    HISTORY = 64             # Versions kept to diff against
+
+    def __init__(self, engine: GameEngine):
+        """Initialize the encoder for a game."""
+        self.engine = engine
+        self.version = 0
+        self.keyframe_version = 0
+        self._history: "OrderedDict[int, Tuple[int, ...]]" = OrderedDict()
+        self.commit()
+
+    @property
+    def values(self) -> Tuple[int, ...]:
+        """Get the field values at the current version."""
+        return self._history[self.version]
+
+    def commit(self) -> int:
+        """Capture the game and record a new version if anything changed."""
+        values = capture(self.engine)
+        if self._history and values == self.values:
+            return self.version
+        self.version += 1
+        self._history[self.version] = values
+        if len(self._history) > self.HISTORY:
+            self._history.popitem(last=False)
+        if self.version - self.keyframe_version >= self.KEYFRAME_INTERVAL:
+            self.keyframe_version = self.version
+        return self.version
+
+    def encode(self, acked: Optional[int] = None) -> bytes:
+        """Encode the frame a client at version ``acked`` needs."""
+        base = self._history.get(acked) if acked is not None else None
+        if base is None or acked < self.keyframe_version:
+            return encode_frame(self.version, self.values)
+        return encode_frame(self.version, self.values, base, acked)
+
+
+class DeltaDecoder:
+    """Client side of the sync protocol."""
+
+    def __init__(self):
+        """Initialize an empty client view."""
+        self.version: Optional[int] = None
+        self.values: List[int] = [0] * len(FIELDS)
+
+    def apply(self, frame: bytes) -> bool:
+        """Apply a frame. Returns False if it needs a base we do not have."""
+        kind = frame[0]
+        version, pos = read_varint(frame, 1)
+        if kind == DELTA:
+            base, pos = read_varint(frame, pos)
+            if base != self.version:
+                return False
+        mask, pos = read_varint(frame, pos)
+        for i in range(len(FIELDS)):
+            if mask >> i & 1:
+                raw, pos = read_varint(frame, pos)
+                value = unzigzag(raw)
+                self.values[i] = value if kind == KEYFRAME else self.values[i] + value
+        self.version = version
+        return True
+
+    def as_dict(self) -> Dict[str, int]:
+        """Get the client view keyed by field name."""
+        return dict(zip(FIELDS, self.values))
+
+
+def benchmark(actions: int = 1000) -> Dict[str, float]:
+    """Compare delta frames with keyframes and pickled GameState snapshots."""
+    engine = GameEngine.new_game("Benchmark", "cash")
+    encoder = DeltaEncoder(engine)
+    commodities = list(Commodity)
+    sizes = {"delta": 0, "keyframe": 0, "pickle": 0}
+    times = {"delta": 0.0, "keyframe": 0.0, "pickle": 0.0}
+
+    for i in range(actions):
+        acked = encoder.version
+        if i % 2:
+            engine.sell_cargo(commodities[i % 4], 1)
+        else:
+            engine.buy_cargo(commodities[i % 4], 1)
+
+        start = time.perf_counter()
+        encoder.commit()
+        frame = encoder.encode(acked)
+        times["delta"] += time.perf_counter() - start
+        sizes["delta"] += len(frame)
+
+        start = time.perf_counter()
+        frame = encode_frame(encoder.version, capture(engine))
+        times["keyframe"] += time.perf_counter() - start
+        sizes["keyframe"] += len(frame)
+
+        start = time.perf_counter()
+        frame = pickle.dumps(engine.state)
+        times["pickle"] += time.perf_counter() - start
+        sizes["pickle"] += len(frame)
+
+    results = {}
+    for kind in sizes:
+        results[f"{kind}_bytes"] = sizes[kind] / actions
+        results[f"{kind}_us"] = times[kind] / actions * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark().items():
+        print(f"{name:>16}: {value:10.1f}")
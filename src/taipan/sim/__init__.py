@@ -0,0 +1 @@
+"""Offline simulation tools for Taipan."""
@@ -0,0 +1,84 @@
+"""Trading autopilot that plays whole voyages on its own.
+
+A voyage sells the hold, weighs every cargo against the nearest ports,
+buys the cargo with the best expected profit per day at sea and sails to
+where it sells best. Ports on a shared market are valued at their
+published prices, and plain ports at their base prices.
+
+The autopilot only calls ``GameEngine`` commands, so it can play a branch
+of the game on another thread while the player's own game stays untouched.
+"""
+
+import random
+from typing import Callable, Optional, Tuple
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.models.port import Port
+
+CANDIDATES = 32  # Nearest ports weighed as destinations
+
+
+def _expected_price(engine: GameEngine, commodity: Commodity, port: Port) -> int:
+    """Get what a commodity should fetch at another port."""
+    if engine.market is not None and engine.market.covers(port.name):
+        return engine.market.price(port.name, commodity)
+    if engine.economy is not None and engine.economy.covers(port.name):
+        return engine.economy.price(port.name, commodity)
+    return port.base_price(commodity, engine.config.base_prices)
+
+
+def best_trade(engine: GameEngine) -> Tuple[Optional[Commodity], Port]:
+    """Pick the cargo to buy here and the port to sell it at.
+
+    With nothing worth carrying, the cargo is ``None`` and the port is a
+    random nearby one, so the firm still moves on to fresh prices.
+    """
+    world = engine.state.world
+    here = engine.state.current_port
+    ports = world.nearest(here, CANDIDATES)
+    player = engine.state.player
+    space = player.ship.get_available_space()
+    best: Tuple[float, Optional[Commodity], Optional[Port]] = (0, None, None)
+    for commodity in Commodity:
+        price = engine.get_price(commodity) + 2  # Allow for the price fluctuating
+        amount = min(space, player.cash // price)
+        if amount <= 0:
+            continue
+        for port in ports:
+            profit = amount * (_expected_price(engine, commodity, port) - price)
+            profit /= world.passage_days(here, port)
+            if profit > best[0]:
+                best = (profit, commodity, port)
+    _, commodity, port = best
+    if port is None:
+        port = random.choice(ports)
+    return commodity, port
+
+
+def voyage(engine: GameEngine, cancelled: Callable[[], bool] = lambda: False) -> bool:
+    """Play one voyage, checking between commands whether to stop.
+
+    Returns whether the voyage was finished rather than cancelled.
+    """
+    for commodity in Commodity:
+        if cancelled():
+            return False
+        held = engine.state.player.ship.hold[commodity]
+        if held:
+            engine.sell_cargo(commodity, held)
+
+    if cancelled():
+        return False
+    commodity, destination = best_trade(engine)
+    if commodity is not None:
+        player = engine.state.player
+        amount = min(player.ship.get_available_space(),
+                     player.cash // (engine.get_price(commodity) + 2))
+        if amount > 0:
+            engine.buy_cargo(commodity, amount)
+
+    if cancelled():
+        return False
+    engine.travel_to_port(destination)  # Same passage as the travel screen
+    return True
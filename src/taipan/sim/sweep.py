@@ -0,0 +1,247 @@
+"""Game-balance parameter sweeps.
+
+A sweep plays a simple greedy trading bot through many games for each
+candidate ``GameConfig`` and records how the firm fares. Results are cached
+on disk under a hash of the config, the seed set, the voyage count and the
+bot and engine versions, so re-running an overlapping sweep only plays the
+new points.
+
+    python -m taipan.sim.sweep --grid gun_cost=500,1000,2000 \\
+        --grid cash_start_cash=500,1000 --seeds 32
+    python -m taipan.sim.sweep --sample enemy_strength_growth=1.0:1.1 \\
+        --samples 20 --seeds 32
+"""
+
+import argparse
+import dataclasses
+import hashlib
+import itertools
+import json
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from taipan import __version__
+from taipan.models.commodity import Commodity
+from taipan.models.config import DEFAULT_CONFIG, GameConfig
+from taipan.models.game_engine import GameEngine
+
+Result = Dict[str, float]
+
+# Bump whenever the bot or the engine would play a seed differently, so the
+# cache stops serving results from the old rules.
+BOT_VERSION = 2
+
+
+def config_key(config: GameConfig, seeds: Sequence[int], voyages: int) -> str:
+    """Get the content hash identifying one sweep point."""
+    payload = json.dumps(
+        {"config": config.to_dict(), "seeds": sorted(seeds), "voyages": voyages,
+         "bot": BOT_VERSION, "engine": __version__},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def grid(base: GameConfig = DEFAULT_CONFIG, **axes: Iterable[Any]) -> List[GameConfig]:
+    """Build every combination of the given field values."""
+    names = list(axes)
+    return [
+        dataclasses.replace(base, **dict(zip(names, values)))
+        for values in itertools.product(*(list(axes[n]) for n in names))
+    ]
+
+
+def random_samples(
+    count: int,
+    base: GameConfig = DEFAULT_CONFIG,
+    seed: Optional[int] = None,
+    **ranges: Tuple[float, float],
+) -> List[GameConfig]:
+    """Draw configs with each named field uniform in its (low, high) range.
+
+    Integer fields are sampled as integers.
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(count):
+        values = {}
+        for name, (low, high) in ranges.items():
+            if isinstance(getattr(base, name), int):
+                values[name] = rng.randint(int(low), int(high))
+            else:
+                values[name] = rng.uniform(low, high)
+        configs.append(dataclasses.replace(base, **values))
+    return configs
+
+
+def play(
+    config: GameConfig,
+    seed: int,
+    voyages: int,
+    listener: Optional[Callable[[GameEngine, str], None]] = None,
+) -> Result:
+    """Play one game with a greedy bot and report the outcome."""
+    rng = random.Random(seed)  # Leaves the global generator to the caller
+    engine = GameEngine.new_game("Simulation", "cash", config)
+    engine.rng = rng
+    if listener is not None:
+        engine.listeners.append(listener)
+        listener(engine, "start_game")
+    ports = [p for p in engine.state.ports if p.name != "At Sea"]
+    base = config.base_prices
+
+    for _ in range(voyages):
+        ship = engine.state.player.ship
+        for commodity in Commodity:
+            engine.sell_cargo(commodity, ship.hold[commodity])
+
+        # Buy whatever is cheapest here relative to its best base price elsewhere.
+        index = engine.state.get_current_port_index()
+        best = max(
+            Commodity,
+            key=lambda c: max(base[c][1:]) / max(1, engine.get_price(c)),
+        )
+        price = engine.get_price(best) + 2  # Allow for the price fluctuating
+        amount = min(ship.get_available_space(), engine.state.player.cash // price)
+        if amount > 0:
+            engine.buy_cargo(best, amount)
+
+        destination = max(ports, key=lambda p: base[best][p.get_port_index()])
+        if destination.get_port_index() == index:
+            destination = rng.choice([p for p in ports if p != destination])
+        engine.travel_to(destination)
+
+    player = engine.state.player
+    cargo_value = sum(
+        amount * base[c][engine.state.get_current_port_index()]
+        for c, amount in player.ship.hold.items()
+    )
+    return {
+        "net_worth": player.get_net_worth() + cargo_value,
+        "enemy_strength": engine.state.enemy_strength,
+    }
+
+
+def evaluate(config: GameConfig, seeds: Sequence[int], voyages: int) -> Result:
+    """Play a config once per seed and summarize the outcomes."""
+    outcomes = [play(config, seed, voyages) for seed in seeds]
+    worth = [o["net_worth"] for o in outcomes]
+    return {
+        "net_worth_mean": statistics.mean(worth),
+        "net_worth_stdev": statistics.pstdev(worth),
+        "net_worth_min": min(worth),
+        "net_worth_max": max(worth),
+        "enemy_strength": outcomes[0]["enemy_strength"],
+    }
+
+
+class ResultCache:
+    """Sweep results stored as one JSON file per content hash."""
+
+    def __init__(self, directory: str):
+        """Initialize the cache in a directory, creating it if needed."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Get the file for a key."""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Result]:
+        """Get a cached result, if there is one."""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)["result"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, config: GameConfig, result: Result) -> None:
+        """Store a result atomically."""
+        path = self._path(key)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"config": config.to_dict(), "result": result}, f, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+
+def sweep(
+    configs: Sequence[GameConfig],
+    seeds: Sequence[int],
+    voyages: int = 24,
+    cache: Optional[ResultCache] = None,
+    workers: Optional[int] = None,
+) -> List[Tuple[GameConfig, Result]]:
+    """Evaluate configs across a process pool, reusing cached points."""
+    keys = [config_key(c, seeds, voyages) for c in configs]
+    results: Dict[str, Result] = {}
+    missing: Dict[str, GameConfig] = {}
+    for key, config in zip(keys, configs):
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            results[key] = cached
+        else:
+            missing[key] = config
+
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                key: pool.submit(evaluate, config, list(seeds), voyages)
+                for key, config in missing.items()
+            }
+            for key, future in futures.items():
+                results[key] = future.result()
+                if cache is not None:
+                    cache.put(key, missing[key], results[key])
+
+    return [(config, results[key]) for config, key in zip(configs, keys)]
+
+
+def _parse_value(name: str, text: str) -> Any:
+    """Parse a command-line value with the type of the config field."""
+    return type(getattr(DEFAULT_CONFIG, name))(text)
+
+
+def main() -> None:
+    """Run a balance sweep from the command line."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--grid", action="append", default=[],
+                        metavar="FIELD=V1,V2", help="Grid axis")
+    parser.add_argument("--sample", action="append", default=[],
+                        metavar="FIELD=LOW:HIGH", help="Random sampling range")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--seeds", type=int, default=16)
+    parser.add_argument("--voyages", type=int, default=24)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--cache", default=".sweep-cache")
+    args = parser.parse_args()
+
+    axes = {}
+    for spec in args.grid:
+        name, values = spec.split("=", 1)
+        axes[name] = [_parse_value(name, v) for v in values.split(",")]
+    ranges = {}
+    for spec in args.sample:
+        name, bounds = spec.split("=", 1)
+        low, high = bounds.split(":")
+        ranges[name] = (float(low), float(high))
+
+    configs = grid(**axes) if axes else []
+    if ranges:
+        configs += random_samples(args.samples, seed=0, **ranges)
+    if not configs:
+        configs = [DEFAULT_CONFIG]
+
+    fields = sorted(set(axes) | set(ranges))
+    points = sweep(
+        configs, range(args.seeds), args.voyages, ResultCache(args.cache), args.workers
+    )
+    for config, result in points:
+        setting = " ".join(f"{n}={getattr(config, n):g}" for n in fields)
+        print(f"{setting:<50} net worth {result['net_worth_mean']:>12,.0f}"
+              f" ± {result['net_worth_stdev']:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Saved games for Taipan."""
@@ -0,0 +1,164 @@
+"""Background autosave.
+
+``Autosaver.save`` runs on the event loop and does no I/O: it forks the
+engine, which is O(1), and queues the fork's state. That state is frozen
+from then on, because the copy-on-write game copies any node before it
+writes to it. A single writer thread serializes each snapshot, fsyncs it
+to a temporary file and renames it over the save, so a crash at any point
+leaves either the previous save or the new one.
+
+A snapshot for a session that is still waiting to be written replaces the
+waiting one, so a burst of commands costs one write.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from taipan.models.config import GameConfig
+from taipan.models.game_engine import GameEngine
+from taipan.models.game_state import GameState
+from taipan.net.metrics import SAVE_ERRORS, SAVE_SECONDS
+
+SAVE_DIR = os.path.join(os.path.expanduser("~"), ".taipan", "saves")
+FORMAT_VERSION = 1
+
+log = logging.getLogger(__name__)
+
+
+def encode(state: GameState, config: GameConfig) -> bytes:
+    """Serialize a game snapshot."""
+    return json.dumps({
+        "version": FORMAT_VERSION,
+        "config": config.to_dict(),
+        "state": state.to_dict(),
+    }).encode()
+
+
+def decode(data: bytes) -> GameEngine:
+    """Rebuild a game from a serialized snapshot."""
+    snapshot = json.loads(data)
+    return GameEngine(
+        state=GameState.from_dict(snapshot["state"]),
+        config=GameConfig.from_dict(snapshot["config"]),
+    )
+
+
+def _fsync_directory(directory: str) -> None:
+    """Make a rename in a directory durable, where the OS allows it."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows renames cannot be synced this way
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Autosaver:
+    """Writes game snapshots to disk on a background thread."""
+
+    def __init__(self, directory: str = SAVE_DIR):
+        """Initialize the saver and start its writer thread."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.error: Optional[Exception] = None  # Last failed write, if any
+        self.errors = 0
+        self._pending: Dict[str, Tuple[GameState, GameConfig]] = {}
+        self._writing: Dict[str, Tuple[GameState, GameConfig]] = {}  # At most one
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def path(self, name: str) -> str:
+        """Get the save file for a session."""
+        return os.path.join(self.directory, f"{name}.json")
+
+    def save(self, name: str, engine: GameEngine) -> None:
+        """Queue a snapshot of a game, replacing any still waiting."""
+        self.put(name, engine.fork().state, engine.config)
+
+    def put(self, name: str, state: GameState, config: GameConfig) -> None:
+        """Queue a state nothing will write to again, replacing any still waiting."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Autosaver is closed")
+            self._pending[name] = (state, config)
+            self._cond.notify()
+
+    def latest(self) -> Optional[str]:
+        """Get the session saved most recently, if there is one."""
+        saves = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        if not saves:
+            return None
+        newest = max(saves, key=lambda e: e.stat().st_mtime)
+        return newest.name[:-len(".json")]
+
+    def load(self, name: str) -> Optional[GameEngine]:
+        """Load a session's last save, if it has one."""
+        with self._cond:
+            waiting = self._pending.get(name) or self._writing.get(name)
+        if waiting is not None:
+            return GameEngine(state=waiting[0], config=waiting[1])  # Copies on write
+        try:
+            with open(self.path(name), "rb") as f:
+                return decode(f.read())
+        except FileNotFoundError:
+            return None
+
+    def flush(self) -> None:
+        """Wait until every queued snapshot is on disk."""
+        with self._cond:
+            while self._pending or self._busy:
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Write the remaining snapshots and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Write snapshots until closed."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                name = next(iter(self._pending))
+                state, config = self._pending.pop(name)
+                self._writing = {name: (state, config)}
+                self._busy = True
+            try:
+                with SAVE_SECONDS.time():
+                    self._write(name, state, config)
+            except Exception as e:
+                # Keep playing; the next save may succeed.
+                SAVE_ERRORS.inc()
+                log.warning("Autosaving %s failed", name, exc_info=e)
+                with self._cond:
+                    self.error = e
+                    self.errors += 1
+            finally:
+                with self._cond:
+                    self._writing = {}
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, name: str, state: GameState, config: GameConfig) -> None:
+        """Write one snapshot atomically."""
+        data = encode(state, config)
+        path = self.path(name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        _fsync_directory(self.directory)
+
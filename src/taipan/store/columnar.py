@@ -0,0 +1,311 @@
+"""Columnar export of per-turn game records for analytics.
+
+Every command a game runs becomes one record: the game, the day, the port,
+cash, bank and debt, the hold and the local price of each commodity, and
+the command itself. Records are buffered in fixed-size numpy batches, so a
+writer's memory stays bounded however many games it records, and each full
+batch is appended to the part's column files.
+
+A dataset is a directory of parts, one per writer, so parallel simulations
+never share a file::
+
+    dataset/
+        part-<name>/
+            meta.json       schema, codec and the offset of every batch
+            cash.col        the cash column, batch after batch
+            ...
+
+With the default ``zlib`` codec every batch of a column is byte-shuffled
+(the first bytes of all values, then the second bytes, ...) and deflated,
+which packs slowly changing integers tightly. With ``none`` a column file
+is the raw array, and reading memory-maps it without copying.
+
+    python -m taipan.store.columnar export games/ --games 10000 --workers 8
+    python -m taipan.store.columnar scan games/
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from taipan.models.commodity import Commodity
+from taipan.models.config import DEFAULT_CONFIG
+from taipan.models.game_engine import GameEngine
+
+BATCH_SIZE = 65536  # Records per batch
+CODECS = ("zlib", "none")
+
+# Dictionary codes for the action column; anything else is recorded as "other".
+ACTIONS = (
+    "other", "start_game", "buy", "sell", "buy_cargo", "sell_cargo", "travel_to",
+    "travel_to_port", "deposit_money", "withdraw_money", "borrow_money",
+    "repay_debt", "repair_ship", "add_gun", "remove_gun", "autopilot",
+)
+_ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+COLUMNS: List[Tuple[str, str]] = (
+    [("game", "<i8"), ("tick", "<i4"), ("port", "<u4"),  # Worlds can be large
+     ("cash", "<i8"), ("bank", "<i8"), ("debt", "<i8")]
+    + [(f"hold_{c.name.lower()}", "<i4") for c in Commodity]
+    + [(f"price_{c.name.lower()}", "<i4") for c in Commodity]
+    + [("action", "u1")]
+)
+
+
+def _quote(engine: GameEngine, commodity: Commodity) -> int:
+    """Get a commodity's local price without drawing from the game's randomness."""
+    # Quotes hold still within a day at every port, from whichever source
+    # covers it, so recording one never changes the game.
+    return engine.get_price(commodity)
+
+
+def _encode(values: np.ndarray, codec: str, level: int) -> bytes:
+    """Encode one batch of a column."""
+    if codec == "none":
+        return values.tobytes()
+    shuffled = values.view(np.uint8).reshape(-1, values.itemsize).T
+    return zlib.compress(shuffled.tobytes(), level)
+
+
+def _decode(data: bytes, dtype: np.dtype, rows: int, codec: str) -> np.ndarray:
+    """Decode one batch of a column."""
+    if codec == "none":
+        return np.frombuffer(data, dtype, rows)
+    shuffled = np.frombuffer(zlib.decompress(data), np.uint8)
+    shuffled = shuffled.reshape(dtype.itemsize, rows)
+    return np.ascontiguousarray(shuffled.T).view(dtype).reshape(rows)
+
+
+class TurnWriter:
+    """Streams per-turn records into one part of a dataset."""
+
+    def __init__(
+        self,
+        dataset: str,
+        part: Optional[str] = None,
+        batch_size: int = BATCH_SIZE,
+        codec: str = "zlib",
+        level: int = 1,
+    ):
+        """Initialize a writer for a new part of a dataset."""
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}")
+        self.path = os.path.join(dataset, f"part-{part or uuid.uuid4().hex}")
+        os.makedirs(self.path)
+        self.batch_size = batch_size
+        self.codec = codec
+        self.level = level
+        self.rows = 0
+        self.batches: List[Dict] = []
+        self._buffers = {name: np.zeros(batch_size, dtype) for name, dtype in COLUMNS}
+        self._files = {name: open(os.path.join(self.path, f"{name}.col"), "wb")
+                       for name, _ in COLUMNS}
+        self._filled = 0
+        self._next_game = 0
+
+    def append(self, game: int, engine: GameEngine, action: str) -> None:
+        """Record the game as it stands after an action."""
+        state = engine.state
+        player = state.player
+        row = self._filled
+        b = self._buffers
+        b["game"][row] = game
+        b["tick"][row] = state.tick
+        b["port"][row] = state.get_current_port_index()
+        b["cash"][row] = player.cash
+        b["bank"][row] = player.bank
+        b["debt"][row] = player.debt
+        for commodity in Commodity:
+            name = commodity.name.lower()
+            b[f"hold_{name}"][row] = player.ship.hold[commodity]
+            b[f"price_{name}"][row] = _quote(engine, commodity)
+        b["action"][row] = _ACTION_CODES.get(action, 0)
+        self._filled += 1
+        if self._filled == self.batch_size:
+            self.flush()
+
+    def listener(self, game: Optional[int] = None) -> Callable[[GameEngine, str], None]:
+        """Get a listener that records one game, numbered per writer by default."""
+        if game is None:
+            game = self._next_game
+            self._next_game += 1
+        return lambda engine, command: self.append(game, engine, command)
+
+    def flush(self) -> None:
+        """Write the buffered records as a batch."""
+        if not self._filled:
+            return
+        batch: Dict = {"rows": self._filled, "columns": {}}
+        for name, _ in COLUMNS:
+            data = _encode(self._buffers[name][:self._filled], self.codec, self.level)
+            f = self._files[name]
+            batch["columns"][name] = [f.tell(), len(data)]
+            f.write(data)
+        self.batches.append(batch)
+        self.rows += self._filled
+        self._filled = 0
+
+    def close(self) -> None:
+        """Write the last batch and the part's metadata."""
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        meta = {
+            "rows": self.rows,
+            "codec": self.codec,
+            "columns": [[name, dtype] for name, dtype in COLUMNS],
+            "actions": list(ACTIONS),
+            "batches": self.batches,
+        }
+        with open(os.path.join(self.path, "meta.json.tmp"), "w") as f:
+            json.dump(meta, f)
+        # A part without metadata was never finished and is skipped by readers.
+        os.replace(os.path.join(self.path, "meta.json.tmp"),
+                   os.path.join(self.path, "meta.json"))
+
+    def __enter__(self) -> "TurnWriter":
+        """Use the writer as a context manager."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the writer."""
+        self.close()
+
+
+def parts(dataset: str) -> List[str]:
+    """List a dataset's finished parts."""
+    return sorted(
+        os.path.join(dataset, name) for name in os.listdir(dataset)
+        if name.startswith("part-")
+        and os.path.exists(os.path.join(dataset, name, "meta.json"))
+    )
+
+
+def _meta(part: str) -> Dict:
+    """Load a part's metadata."""
+    with open(os.path.join(part, "meta.json")) as f:
+        return json.load(f)
+
+
+def iter_batches(
+    dataset: str, columns: Optional[Sequence[str]] = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield a dataset batch by batch, holding one batch in memory at a time."""
+    for part in parts(dataset):
+        meta = _meta(part)
+        dtypes = {name: np.dtype(dtype) for name, dtype in meta["columns"]}
+        wanted = list(columns or dtypes)
+        files = {name: open(os.path.join(part, f"{name}.col"), "rb") for name in wanted}
+        try:
+            for batch in meta["batches"]:
+                arrays = {}
+                for name in wanted:
+                    offset, size = batch["columns"][name]
+                    f = files[name]
+                    f.seek(offset)
+                    arrays[name] = _decode(f.read(size), dtypes[name], batch["rows"],
+                                           meta["codec"])
+                yield arrays
+        finally:
+            for f in files.values():
+                f.close()
+
+
+def read(
+    dataset: str, columns: Optional[Sequence[str]] = None
+) -> Dict[str, np.ndarray]:
+    """Read whole columns of a dataset into arrays.
+
+    A dataset with a single uncompressed part is memory-mapped, not copied.
+    """
+    found = parts(dataset)
+    if len(found) == 1:
+        meta = _meta(found[0])
+        if meta["codec"] == "none":
+            dtypes = dict(meta["columns"])
+            return {
+                name: np.memmap(os.path.join(found[0], f"{name}.col"), dtypes[name],
+                                mode="r", shape=(meta["rows"],))
+                if meta["rows"] else np.zeros(0, dtypes[name])
+                for name in columns or dtypes
+            }
+    batches = list(iter_batches(dataset, columns))
+    names = list(columns or [name for name, _ in COLUMNS])
+    if not batches:
+        return {name: np.zeros(0, dict(COLUMNS)[name]) for name in names}
+    return {name: np.concatenate([b[name] for b in batches]) for name in names}
+
+
+def _export_games(
+    dataset: str, seeds: Sequence[int], voyages: int, batch_size: int, codec: str
+) -> int:
+    """Play simulated games into one new part and return its record count."""
+    from taipan.sim.sweep import play
+
+    with TurnWriter(dataset, batch_size=batch_size, codec=codec) as writer:
+        for seed in seeds:
+            play(DEFAULT_CONFIG, seed, voyages, listener=writer.listener(seed))
+    return writer.rows
+
+
+def export(
+    dataset: str,
+    games: int,
+    voyages: int = 24,
+    workers: int = 1,
+    batch_size: int = BATCH_SIZE,
+    codec: str = "zlib",
+) -> int:
+    """Export ``games`` simulated games, seeded 0..games-1, across processes."""
+    os.makedirs(dataset, exist_ok=True)
+    chunks = [range(i, games, workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_export_games, dataset, list(seeds), voyages,
+                               batch_size, codec) for seeds in chunks if seeds]
+        return sum(f.result() for f in futures)
+
+
+def main() -> None:
+    """Export simulated games, or scan a dataset and report its size and speed."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    exporting = commands.add_parser("export")
+    exporting.add_argument("dataset")
+    exporting.add_argument("--games", type=int, default=1000)
+    exporting.add_argument("--voyages", type=int, default=24)
+    exporting.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    exporting.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    exporting.add_argument("--codec", choices=CODECS, default="zlib")
+    scanning = commands.add_parser("scan")
+    scanning.add_argument("dataset")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        start = time.perf_counter()
+        rows = export(args.dataset, args.games, args.voyages, args.workers,
+                      args.batch_size, args.codec)
+        elapsed = time.perf_counter() - start
+        print(f"{rows:,} records from {args.games:,} games in {elapsed:.1f}s")
+        return
+
+    start = time.perf_counter()
+    columns = read(args.dataset)
+    elapsed = time.perf_counter() - start
+    rows = len(columns["game"])
+    raw = sum(array.nbytes for array in columns.values())
+    stored = sum(entry.stat().st_size for part in parts(args.dataset)
+                 for entry in os.scandir(part))
+    print(f"{rows:,} records, {len(np.unique(columns['game'])):,} games")
+    print(f"{stored / 2**20:.1f} MiB on disk, {raw / 2**20:.1f} MiB in memory"
+          f" ({raw / max(1, stored):.1f}x), read in {elapsed * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""Compact, seekable recordings of play sessions, for bug reports and replays.
+
+A recording keeps what the terminal was sent, as the diffs Textual already
+writes, alongside the game commands that caused them. The live session only
+appends to in-memory lists; a writer thread encodes and compresses.
+
+The file is a run of independently compressed chunks. Each chunk opens
+with keyframes, the whole screen and a snapshot of the game, and a new one
+is cut every ``interval`` seconds or ``max_bytes`` of output, whichever
+comes first::
+
+    TAIPANREC1
+    chunk:   start:f64  length:u32  zlib(events)
+    ...
+    index:   JSON [[start, offset, length], ...]
+    footer:  index offset:u64  TAIPANREC1
+
+An event is ``kind:u8  ms since chunk start:varint  size:varint  payload``.
+Seeking decodes only the chunk holding the target time, from its keyframe.
+A file cut short by a crash has no index; its finished chunks are found by
+scanning instead.
+
+    python -m taipan.store.recording info session.rec
+    python -m taipan.store.recording play session.rec --at 90 --speed 4
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import struct
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Type
+
+from textual.driver import Driver
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.models.game_state import GameState
+from taipan.net.sync import (
+    DELTA,
+    KEYFRAME,
+    encode_frame,
+    read_varint,
+    unzigzag,
+    write_varint,
+)
+from taipan.store.autosave import decode, encode
+
+if TYPE_CHECKING:
+    from textual.app import App
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"TAIPANREC1"
+CHUNK = struct.Struct("<dI")
+FOOTER = struct.Struct("<Q")
+INTERVAL = 5.0  # Seconds between keyframes
+MAX_BYTES = 256 * 1024  # Output that forces a keyframe sooner
+
+# Event kinds
+SCREEN, GAME, OUTPUT, COMMAND = range(1, 5)
+
+# The game as seen between keyframes: a command's effect on these fields.
+VIEW: Tuple[str, ...] = (
+    "cash", "bank", "debt", "guns", "port", "tick",
+    *(f"hold_{c.name.lower()}" for c in Commodity),
+)
+
+
+def _view(state: GameState) -> Tuple[int, ...]:
+    """Read the recorded fields from a game state, in ``VIEW`` order."""
+    player = state.player
+    return (
+        player.cash, player.bank, player.debt, player.ship.guns,
+        state.get_current_port_index(), state.tick,
+        *(player.ship.hold[c] for c in Commodity),
+    )
+
+
+def recording_driver(recorder: "Recorder", base: Type[Driver]) -> Type[Driver]:
+    """Create a driver class that tees everything it writes to ``recorder``."""
+
+    class RecordingDriver(base):  # type: ignore[valid-type, misc]
+        """Driver that also records its output."""
+
+        def write(self, data: str) -> None:
+            """Write data to the terminal and to the recording."""
+            super().write(data)
+            recorder.output(data)
+
+    return RecordingDriver
+
+
+class Recorder:
+    """Records a session's terminal output and game commands to a file."""
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = INTERVAL,
+        max_bytes: int = MAX_BYTES,
+        level: int = 6,
+    ):
+        """Initialize the recorder and start its writer thread."""
+        self.path = path
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.level = level
+        self.error: Optional[Exception] = None  # Last failed chunk, if any
+        self.errors = 0
+        self.keyframe_source = lambda: ""
+        self.chunks: List[List[float]] = []  # [start, offset, length] per chunk
+        self._start = time.monotonic()
+        self._engine: Optional[GameEngine] = None
+        self._chunk_start: Optional[float] = None
+        self._chunk_bytes = 0
+        self._events: List[Tuple[int, float, object]] = []
+        self._queue: List[Tuple[float, List[Tuple[int, float, object]]]] = []
+        self._closed = False
+        self._cond = threading.Condition()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def attach(self, app: "App") -> None:
+        """Record an app's output, with keyframes of its whole screen."""
+        from taipan.net.spectate import render_keyframe
+
+        self.keyframe_source = lambda: render_keyframe(app)
+        app.driver_class = recording_driver(self, app.driver_class)
+
+    def output(self, data: str) -> None:
+        """Record a chunk of terminal output."""
+        now = time.monotonic() - self._start
+        if (self._chunk_start is None or now - self._chunk_start >= self.interval
+                or self._chunk_bytes >= self.max_bytes):
+            # The screen is already drawn when its output is written, so the
+            # keyframe includes this output.
+            self._cut(now)
+            return
+        self._events.append((OUTPUT, now, data))
+        self._chunk_bytes += len(data)
+
+    def command(self, engine: GameEngine, command: str) -> None:
+        """Record a game command; use as an engine listener."""
+        self._engine = engine
+        now = time.monotonic() - self._start
+        if self._chunk_start is None:
+            self._cut(now)
+        self._events.append((COMMAND, now, (command, _view(engine.state))))
+
+    def _cut(self, now: float) -> None:
+        """Hand the current chunk to the writer and start one with keyframes."""
+        if self._chunk_start is not None:
+            with self._cond:
+                self._queue.append((self._chunk_start, self._events))
+                self._cond.notify()
+        self._chunk_start = now
+        self._chunk_bytes = 0
+        self._events = [(SCREEN, now, self.keyframe_source())]
+        if self._engine is not None:
+            # O(1), and frozen from here on; the writer thread encodes it.
+            game = (self._engine.fork().state, self._engine.config)
+            self._events.append((GAME, now, game))
+
+    def close(self) -> None:
+        """Write the last chunk and the index, and stop the writer thread."""
+        with self._cond:
+            if self._chunk_start is not None:
+                self._queue.append((self._chunk_start, self._events))
+                self._chunk_start = None
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        index = json.dumps(self.chunks).encode()
+        offset = self._file.tell()
+        self._file.write(index + FOOTER.pack(offset) + MAGIC)
+        self._file.close()
+
+    def __enter__(self) -> "Recorder":
+        """Use the recorder as a context manager."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the recorder."""
+        self.close()
+
+    def _run(self) -> None:
+        """Encode, compress and append chunks until closed."""
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                queued, self._queue = self._queue, []
+            for start, events in queued:
+                try:
+                    data = zlib.compress(self._encode(start, events), self.level)
+                    offset = self._file.tell()
+                    self._file.write(CHUNK.pack(start, len(data)) + data)
+                    self._file.flush()
+                except Exception as e:
+                    # Keep playing; the recording just has a gap.
+                    log.warning("Recording the chunk at %.1fs to %s failed",
+                                start, self.path, exc_info=e)
+                    self.error = e
+                    self.errors += 1
+                    continue
+                self.chunks.append([start, offset, CHUNK.size + len(data)])
+
+    @staticmethod
+    def _encode(start: float, events: List[Tuple[int, float, object]]) -> bytes:
+        """Serialize one chunk's events."""
+        out = bytearray()
+        view: Optional[Tuple[int, ...]] = None
+        for kind, when, payload in events:
+            if kind == GAME:
+                state, config = payload
+                view = _view(state)
+                data = encode(state, config)
+            elif kind == COMMAND:
+                name, values = payload
+                data = name.encode() + b"\0" + encode_frame(0, values, view)
+                view = values
+            else:
+                data = payload.encode()
+            out.append(kind)
+            write_varint(out, round((when - start) * 1000))
+            write_varint(out, len(data))
+            out += data
+        return bytes(out)
+
+
+@dataclass
+class Position:
+    """A recorded session as it stood at one moment."""
+    time: float
+    screen: str  # Terminal output that redraws the whole screen
+    game: Optional[GameEngine] = None  # The game at the last keyframe
+    # The game after the last command
+    view: Dict[str, int] = field(default_factory=dict)
+    commands: List[str] = field(default_factory=list)  # Since the last keyframe
+
+
+class Recording:
+    """A recorded session opened for playback."""
+
+    def __init__(self, path: str):
+        """Open a recording and find its chunks."""
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if not self.data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a Taipan recording")
+        if self.data.endswith(MAGIC) and len(self.data) > 2 * len(MAGIC) + FOOTER.size:
+            end = len(self.data) - len(MAGIC) - FOOTER.size
+            (offset,) = FOOTER.unpack_from(self.data, end)
+            self.chunks = [tuple(c) for c in json.loads(self.data[offset:end])]
+        else:
+            self.chunks = self._scan()
+        self.starts = [start for start, _, _ in self.chunks]
+
+    def _scan(self) -> List[Tuple[float, int, int]]:
+        """Find the finished chunks of a recording that has no index."""
+        chunks = []
+        pos = len(MAGIC)
+        while pos + CHUNK.size <= len(self.data):
+            start, length = CHUNK.unpack_from(self.data, pos)
+            end = pos + CHUNK.size + length
+            if end > len(self.data):
+                break  # Cut short mid-write
+            chunks.append((start, pos, CHUNK.size + length))
+            pos = end
+        return chunks
+
+    @property
+    def duration(self) -> float:
+        """Get the time of the last recorded event."""
+        if not self.chunks:
+            return 0.0
+        return max(when for _, when, _ in self.events(len(self.chunks) - 1))
+
+    def events(self, chunk: int) -> Iterator[Tuple[int, float, bytes]]:
+        """Decode one chunk's events as (kind, time, payload)."""
+        start, offset, length = self.chunks[chunk]
+        raw = zlib.decompress(self.data[offset + CHUNK.size:offset + length])
+        pos = 0
+        while pos < len(raw):
+            kind = raw[pos]
+            ms, pos = read_varint(raw, pos + 1)
+            size, pos = read_varint(raw, pos)
+            yield kind, start + ms / 1000, raw[pos:pos + size]
+            pos += size
+
+    def seek(self, when: float) -> Position:
+        """Get the session as it stood at ``when`` seconds in."""
+        chunk = max(0, bisect.bisect_right(self.starts, when) - 1)
+        position = Position(time=when, screen="")
+        if not self.chunks:
+            return position
+        output: List[str] = []
+        values: List[int] = [0] * len(VIEW)
+        for kind, at, payload in self.events(chunk):
+            if at > when:
+                break
+            if kind == SCREEN:
+                output = [payload.decode()]
+            elif kind == GAME:
+                position.game = decode(payload)
+                values = list(_view(position.game.state))
+            elif kind == OUTPUT:
+                output.append(payload.decode())
+            elif kind == COMMAND:
+                name, frame = payload.split(b"\0", 1)
+                _apply_frame(values, frame)
+                position.commands.append(name.decode())
+        position.screen = "".join(output)
+        position.view = dict(zip(VIEW, values))
+        return position
+
+    def play(
+        self, start: float = 0.0, speed: float = 1.0, write=sys.stdout.write
+    ) -> None:
+        """Write the session to a terminal in real time, from ``start`` seconds in."""
+        position = self.seek(start)
+        write(position.screen)
+        began = time.monotonic()
+        first = bisect.bisect_right(self.starts, start) - 1
+        for chunk in range(max(0, first), len(self.chunks)):
+            for kind, at, payload in self.events(chunk):
+                if kind != OUTPUT or at <= start:
+                    continue
+                delay = (at - start) / speed - (time.monotonic() - began)
+                if delay > 0:
+                    time.sleep(delay)
+                write(payload.decode())
+
+
+def _apply_frame(values: List[int], frame: bytes) -> None:
+    """Apply a keyframe or delta frame (from ``encode_frame``) to a view in place."""
+    kind = frame[0]
+    _, pos = read_varint(frame, 1)
+    if kind == DELTA:
+        _, pos = read_varint(frame, pos)
+    mask, pos = read_varint(frame, pos)
+    for i in range(len(values)):
+        if mask >> i & 1:
+            raw, pos = read_varint(frame, pos)
+            value = unzigzag(raw)
+            values[i] = value if kind == KEYFRAME else values[i] + value
+
+
+def main() -> None:
+    """Describe a recording, or play it back from any point."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    info = commands.add_parser("info")
+    info.add_argument("recording")
+    playing = commands.add_parser("play")
+    playing.add_argument("recording")
+    playing.add_argument("--at", type=float, default=0.0, help="Seconds in to start at")
+    playing.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    recording = Recording(args.recording)
+    if args.command == "play":
+        try:
+            recording.play(args.at, args.speed)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    counts = {OUTPUT: 0, COMMAND: 0}
+    raw = 0
+    for chunk in range(len(recording.chunks)):
+        for kind, _, payload in recording.events(chunk):
+            if kind in counts:
+                counts[kind] += 1
+            if kind == OUTPUT:
+                raw += len(payload)
+    print(f"{recording.duration:.1f}s, {len(recording.chunks)} keyframes,"
+          f" {counts[OUTPUT]:,} writes ({raw / 1024:,.0f} KiB),"
+          f" {counts[COMMAND]:,} commands")
+    print(f"{len(recording.data) / 1024:,.0f} KiB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Write-behind session store on SQLite for hosted games.
+
+``SessionStore.save`` runs on the event loop and does no I/O, like
+``Autosaver.save``: it forks the engine in O(1) and marks the session
+dirty, replacing any snapshot of it still waiting. A flusher thread wakes
+every ``interval`` seconds, or sooner once ``max_dirty`` sessions are
+waiting, and commits every dirty session in one transaction. A session's
+change reaches the database at most about one interval plus one commit
+after it was made, so that is all a process crash can lose.
+
+A failed commit is logged, counted and retried with the sessions it held,
+backing off exponentially up to ``MAX_BACKOFF`` seconds. Once the store is
+closing it tries ``CLOSE_ATTEMPTS`` more times, then drops what is left
+rather than hang the shutdown.
+
+The database runs in WAL mode, so loads read alongside the flusher's
+writes; all sessions in a process share a small pool of connections.
+``synchronous=NORMAL`` keeps commits durable across process crashes and
+restarts, though not across power loss.
+
+    python -m taipan.store.sessions --sessions 5000 --rate 1 --seconds 10
+"""
+
+import argparse
+import logging
+import os
+import queue
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from taipan.models.commodity import Commodity
+from taipan.models.config import GameConfig
+from taipan.models.game_engine import GameEngine
+from taipan.models.game_state import GameState
+from taipan.net.metrics import STORE_FLUSH_ERRORS, STORE_FLUSH_SECONDS
+from taipan.store.autosave import decode, encode
+
+log = logging.getLogger(__name__)
+
+STORE_PATH = os.path.join(os.path.expanduser("~"), ".taipan", "sessions.db")
+INTERVAL = 1.0  # Seconds between flushes
+MAX_DIRTY = 10000  # Dirty sessions that trigger an early flush
+MAX_BACKOFF = 30.0  # Most seconds to wait before retrying a failed flush
+CLOSE_ATTEMPTS = 3  # Tries at the final flush before giving its sessions up
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY,
+    saved_at REAL NOT NULL,
+    data BLOB NOT NULL
+)
+"""
+
+
+class ConnectionPool:
+    """A few SQLite connections shared by every session in the process."""
+
+    def __init__(self, path: str, size: int = 2):
+        """Open ``size`` connections to a database, creating it if needed."""
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._all: List[sqlite3.Connection] = []
+        for _ in range(size):
+            conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._all.append(conn)
+            self._idle.put(conn)
+        with self.connection() as conn:
+            conn.execute(SCHEMA)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting for one if all are in use."""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close every connection."""
+        for conn in self._all:
+            conn.close()
+
+
+class SessionStore:
+    """Persists many sessions' games in grouped, write-behind transactions."""
+
+    def __init__(
+        self,
+        path: str = STORE_PATH,
+        interval: float = INTERVAL,
+        connections: int = 2,
+        max_dirty: int = MAX_DIRTY,
+    ):
+        """Initialize the store and start its flusher thread."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.pool = ConnectionPool(path, connections)
+        self.interval = interval
+        self.max_dirty = max_dirty
+        self.error: Optional[Exception] = None  # Last failed flush, if any
+        self.errors = 0  # Failed flushes
+        self.dropped = 0  # Sessions given up on at close
+        self.batches = 0
+        self.written = 0
+        self.flush_seconds = 0.0
+        self.max_window = 0.0  # Longest a change has waited to be committed
+        # Session -> (state, config, when it first became dirty)
+        self._dirty: Dict[str, Tuple[GameState, GameConfig, float]] = {}
+        self._flushing: Dict[str, Tuple[GameState, GameConfig, float]] = {}
+        self._busy = False
+        self._urgent = False  # Someone is waiting in flush()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="session-store",
+                                        daemon=True)
+        self._thread.start()
+
+    def save(self, name: str, engine: GameEngine) -> None:
+        """Mark a session dirty with a snapshot of its game."""
+        self.put(name, engine.fork().state, engine.config)
+
+    def put(self, name: str, state: GameState, config: GameConfig) -> None:
+        """Mark a session dirty with a state nothing will write to again."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SessionStore is closed")
+            waiting = self._dirty.get(name)
+            since = waiting[2] if waiting else time.monotonic()
+            self._dirty[name] = (state, config, since)
+            if len(self._dirty) >= self.max_dirty:
+                self._cond.notify()
+
+    def load(self, name: str) -> Optional[GameEngine]:
+        """Load a session's last saved game, if it has one."""
+        with self._cond:
+            waiting = self._dirty.get(name) or self._flushing.get(name)
+        if waiting is not None:
+            # Not committed yet. The snapshot stays frozen: its nodes are owned
+            # by the engine that saved it, so the new engine copies on write.
+            return GameEngine(state=waiting[0], config=waiting[1])
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM sessions WHERE name = ?", (name,)
+            ).fetchone()
+        return decode(row[0]) if row else None
+
+    def latest(self) -> Optional[str]:
+        """Get the session saved most recently, if there is one."""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT name FROM sessions ORDER BY saved_at DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def flush(self) -> None:
+        """Wait until every dirty session is committed.
+
+        Raises the error if a commit fails in the meantime.
+        """
+        with self._cond:
+            errors = self.errors
+            self._urgent = True
+            self._cond.notify_all()
+            while self._dirty or self._busy:
+                self._cond.wait()
+                if self.errors > errors:
+                    raise self.error
+
+    def close(self) -> None:
+        """Commit the remaining sessions and stop the flusher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self.pool.close()
+
+    def _backoff(self, failures: int) -> float:
+        """Seconds to wait before the next flush after ``failures`` in a row."""
+        return min(self.interval * 2 ** failures, MAX_BACKOFF)
+
+    def _ready(self, failures: int) -> bool:
+        """Whether to flush before the interval is up."""
+        if failures:
+            return False  # A failing database is left alone until the backoff ends
+        return self._closed or self._urgent or len(self._dirty) >= self.max_dirty
+
+    def _run(self) -> None:
+        """Commit dirty sessions every interval until closed."""
+        failures = 0  # In a row
+        closing_failures = 0
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self._backoff(failures)
+                while not self._ready(failures):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._dirty:
+                    if self._closed:
+                        return
+                    self._urgent = False
+                    continue
+                dirty, self._dirty = self._dirty, {}
+                self._flushing = dirty
+                self._busy = True
+                self._urgent = False
+                closed = self._closed
+            try:
+                start = time.perf_counter()
+                with STORE_FLUSH_SECONDS.time():
+                    self._commit(dirty)
+                self.flush_seconds += time.perf_counter() - start
+                failures = 0
+            except Exception as e:
+                # Keep playing; the next flush may succeed.
+                failures += 1
+                closing_failures += closed
+                if closing_failures >= CLOSE_ATTEMPTS:
+                    STORE_FLUSH_ERRORS.inc("dropped")
+                    log.error("Dropping %d sessions after %d failed flushes at close",
+                              len(dirty), closing_failures, exc_info=e)
+                    self.dropped += len(dirty)
+                    dirty, failures = {}, 0  # Nothing left to retry
+                else:
+                    STORE_FLUSH_ERRORS.inc("retried")
+                    log.warning("Flushing %d sessions failed; retrying in %.1fs",
+                                len(dirty), self._backoff(failures), exc_info=e)
+                with self._cond:
+                    self.error = e
+                    self.errors += 1
+                    for name, entry in dirty.items():
+                        self._dirty.setdefault(name, entry)
+            with self._cond:
+                self._flushing = {}
+                self._busy = False
+                self._cond.notify_all()
+
+    def _commit(self, dirty: Dict[str, Tuple[GameState, GameConfig, float]]) -> None:
+        """Write one batch of sessions in a single transaction."""
+        now = time.time()
+        rows = [(name, now, encode(state, config))
+                for name, (state, config, _) in dirty.items()]
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sessions (name, saved_at, data)"
+                    " VALUES (?, ?, ?)",
+                    rows,
+                )
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        oldest = min(since for _, _, since in dirty.values())
+        self.max_window = max(self.max_window, time.monotonic() - oldest)
+        self.batches += 1
+        self.written += len(rows)
+
+
+def _random_command(engine: GameEngine, ports: List) -> None:
+    """Play one random trade or voyage."""
+    commodity = random.choice(list(Commodity))
+    roll = random.random()
+    if roll < 0.4:
+        engine.buy_cargo(commodity, 1)
+    elif roll < 0.8:
+        engine.sell_cargo(commodity, engine.state.player.ship.hold[commodity])
+    else:
+        engine.travel_to_port(random.choice(ports))
+
+
+def throughput(
+    sessions: int = 5000,
+    rate: float = 1.0,
+    seconds: float = 10.0,
+    interval: float = INTERVAL,
+    connections: int = 2,
+) -> Dict[str, float]:
+    """Play ``sessions`` games at ``rate`` commands per second each into a store."""
+    engines = [GameEngine.new_game(f"Firm {i}", "cash") for i in range(sessions)]
+    ports = [p for p in engines[0].state.ports if p.name != "At Sea"]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.db")
+        store = SessionStore(path, interval, connections)
+        for i, engine in enumerate(engines):
+            engine.session = f"session-{i}"
+            engine.listeners.append(lambda e, command: store.save(e.session, e))
+
+        commands = 0
+        save_seconds = 0.0
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < seconds:
+            # Catch up with the target rate, then yield to the flusher.
+            for _ in range(int(elapsed * rate * sessions) - commands):
+                engine = random.choice(engines)
+                before = time.perf_counter()
+                _random_command(engine, ports)
+                save_seconds += time.perf_counter() - before
+                commands += 1
+            time.sleep(0.001)
+        played = time.perf_counter() - start
+        before = time.perf_counter()
+        store.close()
+        drained = time.perf_counter() - before
+        with sqlite3.connect(os.path.join(directory, "sessions.db")) as conn:
+            (stored,) = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()
+
+    return {
+        "sessions": sessions,
+        "commands_per_second": commands / played,
+        "command_us": save_seconds / max(1, commands) * 1e6,
+        "batches": store.batches,
+        "sessions_per_batch": store.written / max(1, store.batches),
+        "rows_per_second": store.written / (played + drained),
+        "flush_ms": store.flush_seconds / max(1, store.batches) * 1000,
+        "max_window_s": store.max_window,
+        "stored": stored,
+    }
+
+
+def main() -> None:
+    """Measure the store's throughput with thousands of active sessions."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="Commands per second per session")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=INTERVAL)
+    parser.add_argument("--connections", type=int, default=2)
+    args = parser.parse_args()
+
+    result = throughput(args.sessions, args.rate, args.seconds, args.interval,
+                        args.connections)
+    for key, value in result.items():
+        shown = f"{value:,.2f}" if isinstance(value, float) else f"{value:,}"
+        print(f"{key:<22} {shown}")
+
+
+if __name__ == "__main__":
+    main()
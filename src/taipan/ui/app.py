@@ -1,46 +1,98 @@
 """Main Textual application for Taipan."""
 
-from textual.app import App, ComposeResult
+import asyncio
+import uuid
+from typing import TYPE_CHECKING, Optional
+
+from textual.actions import SkipAction
+from textual.app import ComposeResult
+from textual.binding import Binding
 from textual.containers import Container, Vertical
 from textual.widgets import Header, Footer, Static
 
+from ..models.commands import AUTOPILOT, CommandError, execute, parse
+from ..models.events import MESSAGES
 from ..models.game_engine import GameEngine
-from .screens import WelcomeScreen, PortScreen, TradeScreen
+from ..models.market import Quotes, SharedMarket
+from ..models.world import World
+from ..net.metrics import SESSIONS, count_command
+from ..store.autosave import Autosaver
+from .autopilot import Autopilot
+from .pool import ScreenPool
+from .quality import FrameBudget, TimedApp
+from .port import PortScreen
+from .screens import WelcomeScreen
 from .splash import ShipSplash, CreditsSplash
-from .widgets import StatusBar
+from .styles import STYLESHEET_PATH, SharedStylesheet
+from .trade import TradeScreen
+from .travel import TravelScreen
+from .widgets import CommandLine, StatusBar
+
+if TYPE_CHECKING:
+    from ..models.economy import NpcEconomy
+    from ..store.columnar import TurnWriter
+    from ..store.recording import Recorder
 
-class TaipanApp(App):
+class TaipanApp(TimedApp):
     """Main Taipan application."""
     
-    CSS = """
-    Screen {
-        background: $surface;
-    }
-    
-    StatusBar {
-        height: 1;
-        width: 100%;
-        layout: horizontal;
-    }
-    
-    StatusBar Static {
-        width: 25%;
-        content-align: center middle;
-    }
-    """
+    CSS_PATH = STYLESHEET_PATH
     
     SCREENS = {
         "welcome": WelcomeScreen,
         "ship": ShipSplash,
         "credits": CreditsSplash,
+    }
+
+    # Game screens, built once per game and rebound to the state on each visit
+    POOLED_SCREENS = {
         "port": PortScreen,
         "trade": TradeScreen,
+        "travel": TravelScreen,
     }
+
+    BINDINGS = [
+        ("colon", "command_line", "Orders"),
+        # Ahead of the screens' own Esc, but only while the autopilot sails
+        Binding("escape", "take_helm", "Take the helm", show=False, priority=True),
+    ]
     
-    def __init__(self):
-        """Initialize the application."""
+    def __init__(
+        self,
+        autosaver: Optional[Autosaver] = None,
+        session: str = "",
+        resume: bool = False,
+        splash: bool = True,
+        exporter: Optional['TurnWriter'] = None,
+        recorder: Optional['Recorder'] = None,
+        world: Optional[World] = None,
+        market: Optional[SharedMarket] = None,
+        economy: Optional['NpcEconomy'] = None,
+    ):
+        """Initialize the application, optionally resuming the last saved game.
+
+        Games trade on ``market`` when one is given, e.g. the market every
+        session of a launcher shares, and otherwise against ``economy``'s
+        NPC merchants if given.
+        """
         super().__init__()
+        self.stylesheet = SharedStylesheet(variables=self.get_css_variables())
         self.engine = None  # Will be initialized after welcome screen
+        self.autosaver = autosaver
+        self.session = session
+        self.resume = resume and autosaver is not None
+        self.splash = splash
+        self.exporter = exporter
+        self.recorder = recorder
+        self.world = world  # For new games; loaded games keep their own
+        self.market = market
+        self.economy = economy
+        self._ui_loop: Optional[asyncio.AbstractEventLoop] = None
+        if recorder is not None:
+            recorder.attach(self)
+        self.autopilot: Optional[Autopilot] = None
+        self.quality = FrameBudget(self)
+        self.pool = ScreenPool(self, self.POOLED_SCREENS)
     
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -49,8 +101,62 @@ class TaipanApp(App):
     
     def on_mount(self) -> None:
         """Handle app start-up."""
-        # Start with the ship splash screen
-        self.push_screen("ship")
+        SESSIONS.inc()
+        if self.market is not None:
+            self._ui_loop = asyncio.get_running_loop()
+            self.market.subscribe(self._market_ticked)
+        if self.resume:
+            # Read the save on a thread while the first frame is drawn
+            self.run_worker(self._load_last_game, thread=True)
+        else:
+            self._show_intro()
+
+    def _show_intro(self) -> None:
+        """Start a new game with the splash screens, or without them."""
+        self.push_screen("ship" if self.splash else "welcome")
+
+    def _load_last_game(self) -> None:
+        """Load this session's save, or else the most recent, on a worker thread."""
+        engine = None
+        try:
+            name = self.session or self.autosaver.latest()
+            if name is not None:
+                engine = self.autosaver.load(name)
+        except (OSError, ValueError, KeyError, RuntimeError):
+            # Unreadable, from an older version, or the host is gone; start afresh
+            name = self.session or None
+        self.call_from_thread(self._resume_game, name, engine)
+
+    def _resume_game(self, name: Optional[str], engine: Optional[GameEngine]) -> None:
+        """Go straight to the port with a loaded game, or start a new one."""
+        if engine is None:
+            self._show_intro()
+            return
+        self.session = name
+        self.start_game(engine)
+
+    def on_unmount(self) -> None:
+        """Handle app shutdown."""
+        SESSIONS.dec()
+        if self.market is not None:
+            self.market.unsubscribe(self._market_ticked)
+        if self.autopilot is not None:
+            self.autopilot.close()
+        self.quality.close()
+
+    def _market_ticked(self, tick: int, quotes: Quotes) -> None:
+        """Redraw the prices after a market tick, which may come from any thread."""
+        self._ui_loop.call_soon_threadsafe(self._show_prices)
+
+    def _show_prices(self) -> None:
+        """Redraw the active game screen with the latest prices."""
+        if self.engine is not None:
+            self.pool.rebind(self.engine.state)
+
+    def quality_changed(self) -> None:
+        """Redraw the active game screen for a new quality level."""
+        if self.engine is not None:
+            self.pool.rebind(self.engine.state)
     
     def update_status(self) -> None:
         """Update the status bar with current game state."""
@@ -58,7 +164,10 @@ class TaipanApp(App):
             return
             
         player = self.engine.state.player
-        status = self.query_one(StatusBar)
+        bars = self.screen.query(StatusBar)
+        if not bars:
+            return  # Screen has no status bar, or it is not mounted yet
+        status = bars.first()
         
         status.query_one("#cash").update(f"Cash: {player.cash}")
         status.query_one("#cargo").update(
@@ -68,6 +177,81 @@ class TaipanApp(App):
         status.query_one("#location").update(
             f"Location: {self.engine.state.current_port.name.replace('_', ' ').title()}"
         )
+        autopilot = status.query_one("#autopilot")
+        autopilot.display = self.autopilot is not None
+        if self.autopilot is not None:
+            autopilot.update(
+                f"Autopilot: {self.autopilot.done}/{self.autopilot.voyages} (Esc)"
+            )
+
+    def action_command_line(self) -> None:
+        """Focus the command line, if the screen has one."""
+        lines = self.screen.query(CommandLine)
+        if lines:
+            lines.first().focus()
+
+    def run_command_line(self, line: str) -> None:
+        """Run a line of orders against the game and repaint once."""
+        if self.engine is None:
+            return
+        try:
+            commands = parse(line)
+        except CommandError as e:
+            self.notify(str(e), severity="error")
+            return
+        voyages = None
+        if commands and commands[-1].verb == AUTOPILOT:
+            voyages = commands.pop().amount
+        # Hold every repaint until the whole batch has run.
+        with self.batch_update():
+            try:
+                done = execute(self.engine, commands)
+            except CommandError as e:
+                done = e.done
+                self.notify(f"{e} ({e.done} of {len(commands)} done)", severity="error")
+            else:
+                if commands:
+                    self.notify(f"{done} of {len(commands)} done")
+                if voyages is not None:
+                    self.start_autopilot(voyages)
+            if any(command.verb == "t" for command in commands[:done]):
+                self.report_voyage()
+            self.pool.rebind(self.engine.state)
+            self.update_status()
+
+    def report_voyage(self) -> None:
+        """Tell the player what befell the last voyage."""
+        for event in self.engine.voyage_events:
+            if event in MESSAGES:
+                self.notify(MESSAGES[event], severity="warning")
+
+    def start_autopilot(self, voyages: int) -> None:
+        """Let the autopilot sail the firm for a number of voyages."""
+        if self.engine is None or voyages < 1:
+            return
+        if self.autopilot is not None:
+            self.autopilot.close()
+        self.autopilot = Autopilot(self, voyages)
+        self.autopilot.start()
+        self.notify(f"Autopilot sailing {voyages} voyages; Esc takes the helm")
+
+    def autopilot_progress(self, autopilot: Autopilot) -> None:
+        """Show the autopilot's latest voyage, or that it has handed back the helm."""
+        if autopilot is not self.autopilot:
+            return
+        if not autopilot.running:
+            self.autopilot = None
+            self.notify(f"Autopilot sailed {autopilot.done} of {autopilot.voyages}"
+                        " voyages; you have the helm")
+        with self.batch_update():
+            self.pool.rebind(self.engine.state)
+            self.update_status()
+
+    def action_take_helm(self) -> None:
+        """Stop the autopilot, or let Esc through when it is not sailing."""
+        if self.autopilot is None:
+            raise SkipAction()
+        self.autopilot.cancel()
 
     def on_ship_splash_complete(self) -> None:
         """Handle ship splash completion."""
@@ -80,14 +264,36 @@ class TaipanApp(App):
     def on_welcome_complete(self, firm_name: str, starting_option: str) -> None:
         """Handle welcome completion."""
         # Create the game engine with the player's choices
-        self.engine = GameEngine.new_game(firm_name, starting_option)
-        
-        # Update the status bar
-        self.update_status()
+        engine = GameEngine.new_game(firm_name, starting_option, world=self.world)
+        self.start_game(engine)
+
+    def start_game(self, engine: GameEngine) -> None:
+        """Play a new or loaded game, starting at the port."""
+        self.engine = engine
+        self.engine.session = self.session
+        self.engine.market = self.market
+        self.engine.economy = self.economy
+        self.engine.listeners.append(count_command)
+        if self.autosaver is not None:
+            self.engine.listeners.append(self._autosave)
+            self._autosave(self.engine, "start_game")
+        if self.exporter is not None:
+            # Random game ids, so games exported by different runs never clash
+            record = self.exporter.listener(uuid.uuid4().int >> 65)
+            self.engine.listeners.append(record)
+            record(self.engine, "start_game")
+        if self.recorder is not None:
+            self.engine.listeners.append(self.recorder.command)
+            self.recorder.command(self.engine, "start_game")
         
-        # Push the port screen
+        # Build this game's screens, then show the port
+        self.pool.install(self.engine.state)
         self.push_screen("port")
 
+    def _autosave(self, engine: GameEngine, command: str) -> None:
+        """Queue a background save of the game."""
+        self.autosaver.save(engine.session or "autosave", engine)
+
     def on_key(self, event):
         """Handle key events."""
         if event.key == "?":
@@ -0,0 +1,98 @@
+"""Autopilot that runs the firm for a number of voyages.
+
+Voyages are played on a worker thread, each on a fresh branch of the game,
+so the event loop only ever does the O(1) fork and commit between them and
+the UI stays responsive throughout. Each finished voyage is committed on
+the event loop, where the listeners (autosave, metrics, export) hear of it
+as an ``autopilot`` command and the screens redraw.
+
+Pressing Esc, or running any command of one's own, takes the helm back at
+once: the game stays as the last finished voyage left it, and the voyage
+in progress on the worker is thrown away. A voyage's trades reach the
+shared market only when it is committed, so one thrown away never moves
+prices.
+"""
+
+import os
+import threading
+from typing import Optional
+
+from textual.app import App
+
+from taipan.models.game_engine import GameEngine
+from taipan.sim.autopilot import voyage
+
+# Seconds between voyages, so the player can follow along.
+PACE = float(os.environ.get("TAIPAN_AUTOPILOT_PACE", "0.25"))
+
+
+class Autopilot:
+    """Plays voyages on a worker thread and lands each one in the app's game."""
+
+    def __init__(self, app: App, voyages: int, pace: Optional[float] = None):
+        """Initialize the autopilot for the app's current game."""
+        self.app = app
+        self.engine: GameEngine = app.engine
+        self.voyages = voyages
+        self.pace = PACE if pace is None else pace
+        self.done = 0
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the autopilot still has the helm."""
+        return not self._stop.is_set() and self.done < self.voyages
+
+    def start(self) -> None:
+        """Take the helm and start sailing."""
+        self.engine.listeners.append(self._overridden)
+        self.app.run_worker(self._run, thread=True, group="autopilot",
+                            exit_on_error=False)
+
+    def cancel(self) -> None:
+        """Hand the helm back, keeping every finished voyage."""
+        if not self._stop.is_set():
+            self.close()
+            self.app.autopilot_progress(self)
+
+    def close(self) -> None:
+        """Stop sailing without reporting back, e.g. when the app exits."""
+        self._stop.set()
+        if self._overridden in self.engine.listeners:
+            self.engine.listeners.remove(self._overridden)
+
+    def _overridden(self, engine: GameEngine, command: str) -> None:
+        """Give up the helm when the player runs a command of their own."""
+        if command != "autopilot":
+            self.cancel()
+
+    def _run(self) -> None:
+        """Sail voyage after voyage, on the worker thread."""
+        branch: Optional[GameEngine] = self.app.call_from_thread(self._fork)
+        while branch is not None:
+            if not voyage(branch, self._stop.is_set) or self._stop.is_set():
+                return  # The helm was taken back; drop the voyage in progress
+            branch = self.app.call_from_thread(self._land, branch)
+            if branch is not None and self.pace:
+                self._stop.wait(self.pace)
+
+    def _fork(self) -> Optional[GameEngine]:
+        """Branch off the game for the next voyage, unless the helm was taken back."""
+        if not self.running:
+            return None
+        branch = self.engine.fork()
+        branch.session = self.engine.session
+        return branch
+
+    def _land(self, branch: GameEngine) -> Optional[GameEngine]:
+        """Commit a finished voyage on the event loop and fork for the next one."""
+        if self._stop.is_set():
+            self.engine.discard(branch)
+            return None
+        self.engine.commit(branch, "autopilot")
+        self.done += 1
+        if not self.running:
+            self.cancel()
+            return None
+        self.app.autopilot_progress(self)
+        return self._fork()
@@ -0,0 +1,145 @@
+"""The Textual internals Taipan leans on, kept in one place behind a version check.
+
+Textual has no public way to render a whole screen to terminal output, so
+spectator and recording keyframes borrow the compositor's own, and no
+public hook for reusing parsed CSS, so the shared stylesheet overrides the
+parser, and none for timing frames, so the frame budget wraps the screen's
+update timer and the app's terminal write. Those calls are only made on
+the Textual versions in ``SUPPORTED``, the ones they were written against;
+on any other version ``render_screen`` returns None, the class factories
+return the plain Textual classes and callers fall back to public APIs.
+"""
+
+import time
+from importlib import metadata
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from rich.console import RenderableType
+    from textual.app import App
+    from textual.css.model import RuleSet
+    from textual.css.stylesheet import Stylesheet
+    from textual.screen import Screen
+
+SUPPORTED = ("0.47",)  # Textual major.minor versions the internals match
+
+TEXTUAL_VERSION = metadata.version("textual")
+INTERNALS = ".".join(TEXTUAL_VERSION.split(".")[:2]) in SUPPORTED
+
+
+def render_screen(app: "App") -> Optional[str]:
+    """Render the app's whole current screen as terminal output.
+
+    Returns None on Textual versions whose internals we have not checked.
+    """
+    if not INTERNALS:
+        return None
+    from textual._compositor import LayoutUpdate
+    from textual._context import visible_screen_stack
+    from textual.strip import Strip
+
+    # Same as Compositor.render_full_update, minus clearing the dirty regions
+    # the player's own next update still has to paint.
+    visible_screen_stack.set(app._background_screens)
+    compositor = app.screen._compositor
+    region = compositor.size.region
+    chops = compositor._render_chops(region, lambda y: True)
+    strips = [Strip.join(chop.values()) for chop in chops]
+    return LayoutUpdate(strips, region).render_segments(app.console)
+
+
+def shared_stylesheet(rules: Dict[Tuple, List["RuleSet"]]) -> Type["Stylesheet"]:
+    """Make a stylesheet class that reuses any rules already parsed into ``rules``.
+
+    Returns the plain Stylesheet on Textual versions whose internals we have
+    not checked, so every app parses its own CSS there.
+    """
+    from textual.css.stylesheet import Stylesheet
+
+    if not INTERNALS:
+        return Stylesheet
+
+    class SharedStylesheet(Stylesheet):
+        """Stylesheet that reuses rules already parsed by any app in the process."""
+
+        def __init__(self, *, variables: Optional[Dict[str, str]] = None) -> None:
+            """Initialize the stylesheet."""
+            super().__init__(variables=variables)
+            self._variables_key = tuple(sorted((variables or {}).items()))
+
+        def set_variables(self, variables: Dict[str, str]) -> None:
+            """Set CSS variables, e.g. when switching between dark and light."""
+            super().set_variables(variables)
+            self._variables_key = tuple(sorted(variables.items()))
+
+        def _parse_rules(
+            self,
+            css: str,
+            read_from: Tuple[str, str],
+            is_default_rules: bool = False,
+            tie_breaker: int = 0,
+            scope: str = "",
+        ) -> List["RuleSet"]:
+            """Parse CSS into rules, or reuse the rules from an earlier parse."""
+            key = (css, read_from, is_default_rules, tie_breaker, scope,
+                   self._variables_key)
+            parsed = rules.get(key)
+            if parsed is None:
+                parsed = rules[key] = super()._parse_rules(
+                    css, read_from, is_default_rules, tie_breaker, scope
+                )
+            return parsed
+
+    return SharedStylesheet
+
+
+def timed_screen(
+    update: Callable[["Screen", Callable[[], None]], None]
+) -> Type["Screen"]:
+    """Make a screen class whose every update runs through ``update``.
+
+    ``update(screen, paint)`` must call ``paint()`` once to paint the pending
+    updates. Returns the plain Screen on Textual versions whose internals we
+    have not checked, so frames go untimed there.
+    """
+    from textual.screen import Screen
+
+    if not INTERNALS:
+        return Screen
+
+    class TimedScreen(Screen):
+        """Screen that hands its update timer to a hook."""
+
+        def _on_timer_update(self) -> None:
+            """Paint pending updates through the hook."""
+            update(self, super()._on_timer_update)
+
+    return TimedScreen
+
+
+def timed_app(flushed: Callable[["App", float], None]) -> Type["App"]:
+    """Make an app class that reports the seconds each frame took to write.
+
+    Returns the plain App on Textual versions whose internals we have not
+    checked, so writes go untimed there.
+    """
+    from textual.app import App
+
+    if not INTERNALS:
+        return App
+
+    class TimedApp(App):
+        """App that times its writes to the terminal."""
+
+        def _display(
+            self, screen: "Screen", renderable: Optional["RenderableType"]
+        ) -> None:
+            """Write a frame to the terminal, timing the write."""
+            if renderable is None:
+                super()._display(screen, renderable)
+                return
+            start = time.perf_counter()
+            super()._display(screen, renderable)
+            flushed(self, time.perf_counter() - start)
+
+    return TimedApp
@@ -0,0 +1,88 @@
+"""Headless play of a Taipan app through scripted input.
+
+A script is a list of steps such as ``("press", "space")``,
+``("focus", "#travel-button")`` or ``("screen", "PortScreen")``, played
+against a headless ``TaipanApp`` through Textual's test pilot. The load
+test and the startup and allocation benchmarks time scripts this way,
+and ``warm_up`` plays one to load everything a session needs.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from taipan.ui.app import TaipanApp
+
+Step = Tuple[str, str]
+
+# From launch through the splash screens and the welcome dialog to the port.
+NEW_GAME: List[Step] = [
+    ("screen", "ShipSplash"),
+    ("press", "space"),
+    ("screen", "CreditsSplash"),
+    ("press", "space"),
+    ("screen", "WelcomeScreen"),
+    ("click", "#firm-name"),
+    ("type", "Jardine"),
+    ("click", "Button#cash"),
+    ("screen", "PortScreen"),
+]
+TIMEOUT = 10.0  # Seconds to wait for an expected screen
+
+
+async def play(steps: Sequence[Step], size: Tuple[int, int], **options) -> Dict:
+    """Play a script on an app built with ``options``; return its latency samples.
+
+    Samples are in seconds, per key under ``keys`` and per screen change
+    under ``transitions``.
+    """
+    keys: Dict[str, List[float]] = {}
+    transitions: Dict[str, List[float]] = {}
+    app = TaipanApp(**options)
+    async with app.run_test(size=size) as pilot:
+        screen = "launch"
+        since = time.perf_counter()
+        for action, arg in steps:
+            start = time.perf_counter()
+            if action == "press":
+                await pilot.press(arg)
+                keys.setdefault(arg, []).append(time.perf_counter() - start)
+            elif action == "type":
+                for char in arg:
+                    start = time.perf_counter()
+                    await pilot.press(char)
+                    keys.setdefault("char", []).append(time.perf_counter() - start)
+            elif action == "click":
+                await pilot.click(arg)
+                keys.setdefault("click", []).append(time.perf_counter() - start)
+            elif action == "focus":
+                # As tabbing to it would, which also scrolls it into view.
+                app.screen.query_one(arg).focus()
+                await pilot.pause()
+                continue
+            elif action == "screen":
+                # Time from the input that left the previous screen until
+                # the expected one is active and idle.
+                deadline = start + TIMEOUT
+                while type(app.screen).__name__ != arg:
+                    if time.perf_counter() > deadline:
+                        raise TimeoutError(f"Never reached {arg} from {screen}")
+                    await pilot.pause()
+                await pilot.wait_for_scheduled_animations()
+                transitions.setdefault(f"{screen}->{arg}", []).append(
+                    time.perf_counter() - since
+                )
+                screen = arg
+                continue
+            else:
+                raise ValueError(f"Unknown step {action!r}")
+            since = start
+    return {"keys": keys, "transitions": transitions}
+
+
+def warm_up() -> None:
+    """Load and cache everything a session needs by playing one headlessly."""
+    from textual.drivers.linux_driver import LinuxDriver  # noqa: F401
+
+    # The scripted clicks need a screen this big, whatever size sessions get.
+    asyncio.run(play(NEW_GAME, (100, 60)))
@@ -0,0 +1,119 @@
+"""Pooled game screens, rebound to the current state instead of rebuilt."""
+
+from typing import Callable, Dict, Hashable, Tuple
+
+from rich.console import RenderableType
+from rich.table import Table
+from textual.app import App
+from textual.widgets import Static
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_state import GameState
+from taipan.ui.quality import TimedScreen, frame
+
+
+class StateScreen(TimedScreen):
+    """Screen that shows the game state and is reused for a whole session.
+
+    Each name in ``PANELS`` is a ``#<name>-panel`` Static drawn by
+    ``_render_<name>``, with ``_key_<name>`` returning the data it shows.
+    Rebinding redraws only the panels whose key, or the app's quality
+    level, has changed.
+    """
+
+    PANELS: Tuple[str, ...] = ()
+
+    def __init__(self, game_state: GameState) -> None:
+        """Initialize the screen for a game state."""
+        super().__init__()
+        self._panel_keys: Dict[str, Hashable] = {}
+        self._rebound_early = False
+        self.bind_state(game_state)
+
+    def bind_state(self, game_state: GameState) -> None:
+        """Point the screen at a game state without redrawing anything."""
+        self.game_state = game_state
+        self.current_port = game_state.current_port
+
+    def price(self, commodity: Commodity) -> int:
+        """Get the price a commodity trades at here, as the engine fills it."""
+        return self.app.engine.get_price(commodity)
+
+    def _key_prices(self) -> Hashable:
+        """Get what the prices shown depend on besides the port and the day."""
+        engine = self.app.engine
+        if engine.market is not None:
+            return engine.market.tick_count
+        return engine.economy.revision if engine.economy is not None else None
+
+    def _panel_key(self, name: str) -> Hashable:
+        """Get the data a panel currently shows."""
+        return (self.app.quality.level, getattr(self, f"_key_{name}")())
+
+    def _frame(self, table: Table, title: str) -> RenderableType:
+        """Wrap a panel's table for the app's quality level."""
+        return frame(table, title, self.app.quality.level)
+
+    def on_mount(self) -> None:
+        """Remember what the freshly composed panels show."""
+        if self._rebound_early:
+            # Rebound while mounting, so the panels may show an older state.
+            self._rebound_early = False
+            self._panel_keys = {}
+            self.rebind(self.game_state)
+            return
+        self._panel_keys = {name: self._panel_key(name) for name in self.PANELS}
+
+    def on_screen_resume(self) -> None:
+        """Catch up with the game whenever the screen becomes active."""
+        if self.app.engine is not None:
+            self.rebind(self.app.engine.state)
+            self.app.update_status()
+
+    def rebind(self, game_state: GameState) -> int:
+        """Bind to a game state and redraw the panels that changed; return how many."""
+        self.bind_state(game_state)
+        if not self.is_mounted:
+            self._rebound_early = True  # The autopilot may land a voyage mid-push
+            return 0
+        redrawn = 0
+        for name in self.PANELS:
+            key = self._panel_key(name)
+            if key == self._panel_keys.get(name):
+                continue
+            self._panel_keys[name] = key
+            self.query_one(f"#{name}-panel", Static).update(
+                getattr(self, f"_render_{name}")()
+            )
+            redrawn += 1
+        return redrawn
+
+
+class ScreenPool:
+    """Keeps one installed instance of each state screen for a session."""
+
+    def __init__(
+        self, app: App, factories: Dict[str, Callable[[GameState], StateScreen]]
+    ):
+        """Initialize the pool with a factory per screen name."""
+        self.app = app
+        self.factories = factories
+        self.screens: Dict[str, StateScreen] = {}
+
+    def install(self, game_state: GameState) -> None:
+        """Build the screens for a new game and install them under their names.
+
+        Installed screens survive being popped, so pushing one by name again
+        resumes the same instance, which then rebinds to the current state.
+        """
+        for name, factory in self.factories.items():
+            if name in self.screens:
+                self.app.uninstall_screen(name)
+            self.screens[name] = factory(game_state)
+            self.app.install_screen(self.screens[name], name)
+
+    def rebind(self, game_state: GameState) -> None:
+        """Rebind the active screen, if it is one of the pool's."""
+        screen = self.app.screen
+        if screen in self.screens.values():
+            screen.rebind(game_state)
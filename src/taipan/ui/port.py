@@ -3,77 +3,36 @@
 from typing import Dict, List, Optional
 
 from rich.console import RenderableType
-from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from textual.app import ComposeResult
 from textual.containers import Container, Vertical
-from textual.screen import Screen
 from textual.widgets import Button, Header, Static
 
+from taipan.models.commodity import Commodity
 from taipan.models.game_state import GameState
 from taipan.models.port import Port
 from taipan.models.ship import Ship
+from taipan.ui.pool import StateScreen
+from taipan.ui.widgets import CommandLine, StatusBar
 
 
-class PortScreen(Screen):
+class PortScreen(StateScreen):
     """Screen for port operations."""
 
-    CSS = """
-    Screen {
-        align: center middle;
-    }
-
-    #port-container {
-        width: 80%;
-        height: 80%;
-        border: solid $accent;
-    }
-
-    #status-panel {
-        width: 100%;
-        height: 20%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    #cargo-panel {
-        width: 100%;
-        height: 40%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    #actions-panel {
-        width: 100%;
-        height: 20%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    Button {
-        width: 100%;
-        margin: 1;
-    }
-
-    .highlight {
-        background: $accent;
-        color: $text;
-    }
-    """
+    PANELS = ("status", "cargo")
 
     def __init__(self, game_state: GameState) -> None:
         """Initialize the port screen."""
-        super().__init__()
-        self.game_state = game_state
-        self.current_port = game_state.current_port
-        self.selected_cargo: Optional[str] = None
+        super().__init__(game_state)
+        self.selected_cargo: Optional[Commodity] = None
         self.trade_amount = 0
 
     def compose(self) -> ComposeResult:
         """Compose the port screen."""
         yield Header()
         with Container(id="port-container"):
+            yield StatusBar()
             yield Static(self._render_status(), id="status-panel")
             yield Static(self._render_cargo(), id="cargo-panel")
             with Vertical(id="actions-panel"):
@@ -81,6 +40,7 @@ class PortScreen(Screen):
                 yield Button("Repair Ship", id="repair-button")
                 yield Button("Pay Debt", id="debt-button")
                 yield Button("Travel", id="travel-button")
+        yield CommandLine()
 
     def _render_status(self) -> RenderableType:
         """Render the status panel."""
@@ -88,37 +48,47 @@ class PortScreen(Screen):
         table.add_column("Label", style="bold")
         table.add_column("Value")
 
+        ship = self.game_state.player.ship
         table.add_row("Port", self.current_port.name)
         table.add_row("Cash", f"${self.game_state.player.cash:,}")
         table.add_row("Debt", f"${self.game_state.player.debt:,}")
-        table.add_row("Ship Condition", f"{self.game_state.ship.condition}%")
-        table.add_row("Cargo Space", f"{self.game_state.ship.used_cargo_space}/{self.game_state.ship.max_cargo_space}")
+        table.add_row("Ship Status", ship.get_status())
+        table.add_row("Cargo Space", f"{ship.get_total_cargo()}/{ship.capacity}")
 
-        return Panel(table, title="Status")
+        return self._frame(table, "Status")
+
+    def _key_status(self) -> tuple:
+        """Get the data the status panel shows."""
+        player = self.game_state.player
+        return (self.current_port.name, player.cash, player.debt, player.ship.damage,
+                player.ship.get_total_cargo(), player.ship.capacity)
 
     def _render_cargo(self) -> RenderableType:
         """Render the cargo panel."""
         table = Table(show_header=True, box=None)
         table.add_column("Cargo")
         table.add_column("Price", justify="right")
-        table.add_column("Available", justify="right")
         table.add_column("Your Cargo", justify="right")
 
-        for cargo in self.current_port.available_cargo:
-            price = self.current_port.cargo_prices[cargo]
-            available = self.current_port.cargo_quantities[cargo]
-            player_cargo = self.game_state.ship.cargo.get(cargo, 0)
+        for cargo in Commodity:
+            price = self.price(cargo)
+            player_cargo = self.game_state.player.ship.hold[cargo]
             
-            row_style = "highlight" if cargo == self.selected_cargo else ""
+            row_style = "reverse" if cargo == self.selected_cargo else ""
             table.add_row(
-                cargo,
+                str(cargo),
                 f"${price:,}",
-                str(available),
                 str(player_cargo),
                 style=row_style
             )
 
-        return Panel(table, title="Cargo Market")
+        return self._frame(table, "Cargo Market")
+
+    def _key_cargo(self) -> tuple:
+        """Get the data the cargo panel shows."""
+        # Prices are drawn once per port per tick, not on every visit.
+        return (self.current_port.name, self.game_state.tick, self._key_prices(),
+                self.selected_cargo, tuple(self.game_state.player.ship.hold.items()))
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -134,10 +104,9 @@ class PortScreen(Screen):
 
     def _repair_ship(self) -> None:
         """Repair the ship."""
-        cost = (100 - self.game_state.ship.condition) * 10
-        if self.game_state.player.cash >= cost:
-            self.game_state.player.cash -= cost
-            self.game_state.ship.condition = 100
+        cost = self.game_state.player.ship.damage * 10
+        if self.app.engine.repair_ship(cost):
+            self.rebind(self.app.engine.state)
             self.notify(f"Ship repaired for ${cost:,}")
         else:
             self.notify("Not enough cash to repair ship!")
@@ -146,8 +115,8 @@ class PortScreen(Screen):
         """Pay off debt."""
         if self.game_state.player.debt > 0:
             amount = min(self.game_state.player.cash, self.game_state.player.debt)
-            self.game_state.player.cash -= amount
-            self.game_state.player.debt -= amount
+            self.app.engine.repay_debt(amount)
+            self.rebind(self.app.engine.state)
             self.notify(f"Paid ${amount:,} towards debt")
         else:
             self.notify("You have no debt to pay!")
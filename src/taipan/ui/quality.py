@@ -0,0 +1,166 @@
+"""Frame-budget quality levels for slow terminals and links.
+
+Every painted frame of a ``TimedScreen`` is timed from layout to the
+write to the terminal, and the times are smoothed into a moving average.
+While the average is over the budget the app steps down one quality level
+every few frames, and once it has stayed under half the budget for a long
+run of frames it steps back up:
+
+- ``full``: everything,
+- ``borderless``: no borders on containers or panels,
+- ``plain``: panel tables drawn as plain text lines,
+- ``bare``: no ASCII art either.
+
+Each level below ``full`` adds a class to the app (``-no-borders``,
+``-plain-tables``, ``-no-art``) for the stylesheet to match, and panels
+drawn with ``frame`` follow the level.
+"""
+
+import os
+import time
+from typing import Callable, Optional
+
+from rich.console import Group, RenderableType
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+from textual.app import App
+from textual.screen import Screen
+
+from taipan.net.metrics import (
+    DEGRADED_SESSIONS,
+    FLUSH_SECONDS,
+    QUALITY_CHANGES,
+    RENDER_SECONDS,
+)
+from taipan.ui.compat import timed_app, timed_screen
+from taipan.ui.throttle import FRAME_RATE
+
+LEVELS = ("full", "borderless", "plain", "bare")
+FULL, BORDERLESS, PLAIN, BARE = range(len(LEVELS))
+CLASSES = {BORDERLESS: "-no-borders", PLAIN: "-plain-tables", BARE: "-no-art"}
+
+# Seconds a frame may take before it counts as slow.
+FRAME_BUDGET = float(os.environ.get("TAIPAN_FRAME_BUDGET", str(1 / FRAME_RATE)))
+SMOOTHING = 0.2  # Weight of the newest frame in the moving average
+DOWN_AFTER = 3  # Frames at a level before it may step down
+UP_AFTER = 120  # Frames at a level before it may step up
+
+
+class FrameBudget:
+    """Moves an app between quality levels to keep its frames within budget."""
+
+    def __init__(self, app: App, budget: Optional[float] = None):
+        """Initialize the monitor at full quality."""
+        self.app = app
+        self.budget = budget or FRAME_BUDGET
+        self.level = FULL
+        self.average = 0.0  # Smoothed frame time in seconds
+        self.frames = 0
+        self._since_change = 0
+        self._painted = False
+
+    def observe(self, seconds: float) -> None:
+        """Account for one painted frame."""
+        if self.frames:
+            self.average += SMOOTHING * (seconds - self.average)
+        else:
+            self.average = seconds
+        self.frames += 1
+        self._since_change += 1
+        if self.average > self.budget:
+            if self._since_change >= DOWN_AFTER and self.level < BARE:
+                self.set_level(self.level + 1)
+        elif self.average <= self.budget / 2:
+            if self._since_change >= UP_AFTER and self.level > FULL:
+                self.set_level(self.level - 1)
+
+    def set_level(self, level: int) -> None:
+        """Switch to a quality level and redraw what depends on it."""
+        if level == self.level:
+            return
+        if self.level == FULL:
+            DEGRADED_SESSIONS.inc()
+        elif level == FULL:
+            DEGRADED_SESSIONS.dec()
+        QUALITY_CHANGES.inc(LEVELS[level])
+        self.level = level
+        self._since_change = 0
+        for threshold, name in CLASSES.items():
+            self.app.set_class(level >= threshold, name)
+        self.app.quality_changed()
+
+    def flushed(self, seconds: float) -> None:
+        """Account for a frame written to the terminal in ``seconds``."""
+        FLUSH_SECONDS.observe(seconds)
+        self._painted = True
+
+    def close(self) -> None:
+        """Stop counting the session as degraded."""
+        if self.level != FULL:
+            DEGRADED_SESSIONS.dec()
+            self.level = FULL
+
+
+def frame(table: Table, title: str, level: int) -> RenderableType:
+    """Wrap a panel's table in as much decoration as the quality level allows."""
+    if level >= PLAIN:
+        return _plain(table, title)
+    if level >= BORDERLESS:
+        return Group(Text(title, style="bold"), table)
+    return Panel(table, title=title)
+
+
+def _plain(table: Table, title: str) -> Text:
+    """Draw a table as padded text lines, skipping Rich's table layout."""
+    columns = [[str(cell) for cell in column.cells] for column in table.columns]
+    if table.show_header:
+        for column, cells in zip(table.columns, columns):
+            cells.insert(0, str(column.header))
+    widths = [max(map(len, cells), default=0) for cells in columns]
+    text = Text()
+    text.append(title, style="bold")
+    for row in range(len(columns[0]) if columns else 0):
+        line = "  ".join(
+            cells[row].rjust(width) if column.justify == "right"
+            else cells[row].ljust(width)
+            for column, cells, width in zip(table.columns, columns, widths)
+        )
+        body = row - table.show_header
+        style = table.rows[body].style if body >= 0 and table.rows[body].style else ""
+        text.append("\n" + line.rstrip(), style=style)
+    return text
+
+
+def _time_update(screen: Screen, paint: Callable[[], None]) -> None:
+    """Paint a screen's pending updates, timing the frame if one is written."""
+    budget: Optional[FrameBudget] = getattr(screen.app, "quality", None)
+    if budget is not None:
+        budget._painted = False
+    start = time.perf_counter()
+    paint()
+    seconds = time.perf_counter() - start
+    RENDER_SECONDS.observe(seconds)
+    if budget is not None and budget._painted:
+        budget.observe(seconds)
+
+
+def _time_write(app: App, seconds: float) -> None:
+    """Account for a frame an app wrote to the terminal."""
+    budget: Optional[FrameBudget] = getattr(app, "quality", None)
+    if budget is not None:
+        budget.flushed(seconds)
+
+
+class TimedScreen(timed_screen(_time_update)):
+    """Screen whose frames are timed into its app's ``FrameBudget``.
+
+    A frame runs from the screen's update timer through layout to the
+    write, which a ``TimedApp`` reports with ``FrameBudget.flushed``. Both
+    hooks go through Textual's private frame methods, so on Textual
+    versions ``taipan.ui.compat`` has not checked frames simply go untimed.
+    """
+
+
+class TimedApp(timed_app(_time_write)):
+    """App that reports each frame's write to its ``FrameBudget``."""
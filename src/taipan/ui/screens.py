@@ -2,12 +2,12 @@
 
 from textual.app import ComposeResult
 from textual.containers import Container, Vertical
-from textual.screen import Screen
 from textual.widgets import Button, Input, Label, Static
 
-from taipan.ui.widgets import StatusBar
+from taipan.ui.quality import TimedScreen
+from taipan.ui.widgets import CommandLine, StatusBar
 
-class BaseGameScreen(Screen):
+class BaseGameScreen(TimedScreen):
     """Base game screen with status bar."""
     
     def compose(self) -> ComposeResult:
@@ -19,18 +19,9 @@ class BaseGameScreen(Screen):
             )
         )
     
-    CSS = """
-    BaseGameScreen {
-        align: center middle;
-    }
-    
-    #screen-content {
-        width: 40;
-        height: auto;
-        border: solid $accent;
-        padding: 1;
-    }
-    """
+    def on_screen_resume(self) -> None:
+        """Refresh the status bar whenever the screen becomes active."""
+        self.app.update_status()
 
 class WelcomeScreen(BaseGameScreen):
     """Welcome screen with game setup."""
@@ -64,36 +55,8 @@ class WelcomeScreen(BaseGameScreen):
         starting_option = event.button.id
         
         # Notify the app that welcome is complete with the firm name and starting option
-        self.app.on_welcome_complete(firm_name, starting_option)
         self.app.pop_screen()
-    
-    CSS = """
-    WelcomeScreen {
-        align: center middle;
-    }
-    
-    #welcome-dialog {
-        width: 40;
-        height: auto;
-        border: solid $accent;
-        padding: 1;
-    }
-    
-    #title {
-        text-align: center;
-        text-style: bold;
-    }
-    
-    #subtitle {
-        text-align: center;
-        margin-bottom: 1;
-    }
-    
-    Button {
-        margin: 1 0;
-        width: 100%;
-    }
-    """
+        self.app.on_welcome_complete(firm_name, starting_option)
 
 class PortScreen(BaseGameScreen):
     """Main port interface screen."""
@@ -111,24 +74,7 @@ class PortScreen(BaseGameScreen):
                 id="port-actions"
             )
         )
-    
-    CSS = """
-    PortScreen {
-        align: center middle;
-    }
-    
-    #port-actions {
-        width: 30;
-        height: auto;
-        border: solid $accent;
-        padding: 1;
-    }
-    
-    Button {
-        margin: 1 0;
-        width: 100%;
-    }
-    """
+        yield CommandLine()
 
 class TradeScreen(BaseGameScreen):
     """Trading interface screen."""
@@ -143,16 +89,4 @@ class TradeScreen(BaseGameScreen):
                 id="trade-interface"
             )
         )
-    
-    CSS = """
-    TradeScreen {
-        align: center middle;
-    }
-    
-    #trade-interface {
-        width: 40;
-        height: auto;
-        border: solid $accent;
-        padding: 1;
-    }
-    """ 
\ No newline at end of file
+        yield CommandLine()
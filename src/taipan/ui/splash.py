@@ -2,11 +2,12 @@
 
 from textual.app import ComposeResult
 from textual.containers import Container, Center
-from textual.screen import Screen
 from textual.widgets import Static
 from textual import events
 
-class ShipSplash(Screen):
+from taipan.ui.quality import TimedScreen
+
+class ShipSplash(TimedScreen):
     """First splash screen showing the ship ASCII art."""
     
     BINDINGS = [("space", "next_screen", "Continue")]
@@ -44,32 +45,8 @@ class ShipSplash(Screen):
     def action_next_screen(self) -> None:
         """Move to the credits screen."""
         self.app.push_screen("credits")
-    
-    CSS = """
-    ShipSplash {
-        background: $surface;
-    }
-    
-    #splash-container {
-        width: 60;
-        height: auto;
-        border: solid $accent;
-        padding: 1;
-    }
-    
-    #ship-art {
-        text-align: center;
-        color: $text;
-    }
-    
-    #prompt {
-        text-align: center;
-        margin-top: 1;
-        color: $text-muted;
-    }
-    """
 
-class CreditsSplash(Screen):
+class CreditsSplash(TimedScreen):
     """Second splash screen showing credits."""
     
     BINDINGS = [("space", "next_screen", "Continue")]
@@ -100,27 +77,3 @@ class CreditsSplash(Screen):
     def action_next_screen(self) -> None:
         """Move to the welcome screen."""
         self.app.push_screen("welcome")
-    
-    CSS = """
-    CreditsSplash {
-        background: $surface;
-    }
-    
-    #credits-container {
-        width: 40;
-        height: auto;
-        border: solid $accent;
-        padding: 1;
-    }
-    
-    #credits {
-        text-align: center;
-        color: $text;
-    }
-    
-    #prompt {
-        text-align: center;
-        margin-top: 1;
-        color: $text-muted;
-    }
-    """ 
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Shared stylesheet for Taipan."""
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from textual.css.model import RuleSet
+
+from taipan.ui.compat import shared_stylesheet
+
+STYLESHEET_PATH = Path(__file__).with_name("taipan.tcss")
+
+# Parsed rules for every CSS source seen in this process, keyed by the source
+# and the CSS variables it was parsed with. Shared by all apps, so a hosted
+# session after the first one never parses CSS at all.
+_RULES: Dict[Tuple, List[RuleSet]] = {}
+
+# Reuses rules already parsed by any app in the process, on Textual versions
+# whose parser we have checked; a plain Stylesheet on any other.
+SharedStylesheet = shared_stylesheet(_RULES)
+
+
+def warm_up(variables: Dict[str, str]) -> None:
+    """Parse the Taipan stylesheet ahead of the first session."""
+    stylesheet = SharedStylesheet(variables=variables)
+    stylesheet.read(STYLESHEET_PATH)
+    stylesheet.parse()
@@ -0,0 +1,60 @@
+"""Frame-rate throttling for derived UI state."""
+
+import os
+import time
+from typing import Callable, Optional
+
+from textual.message_pump import MessagePump
+
+# Frames per second for recomputing and repainting derived state.
+FRAME_RATE = float(os.environ.get("TAIPAN_FPS", "30"))
+
+
+class FrameThrottle:
+    """Runs a callback at most once per frame, however often it is requested.
+
+    The first request in a quiet period runs on the next turn of the message
+    loop, after whatever input is already queued; requests made before then,
+    or within the same frame, fold into that one run.
+    """
+
+    def __init__(
+        self,
+        owner: MessagePump,
+        callback: Callable[[], None],
+        fps: Optional[float] = None,
+    ):
+        """Initialize the throttle for a widget or screen."""
+        self.owner = owner
+        self.callback = callback
+        self.interval = 1 / (fps or FRAME_RATE)
+        self.requests = 0
+        self.runs = 0
+        self._last = float("-inf")
+        self._pending = False
+
+    def request(self) -> None:
+        """Ask for the callback to run in the next frame."""
+        self.requests += 1
+        if self._pending:
+            return
+        self._pending = True
+        delay = self._last + self.interval - time.monotonic()
+        if delay > 0:
+            self.owner.set_timer(delay, self._run)
+        else:
+            # Textual skips zero-interval timers, so queue a callback instead.
+            self.owner.call_later(self._run)
+
+    def flush(self) -> None:
+        """Run a pending callback now, e.g. before acting on derived state."""
+        self._run()
+
+    def _run(self) -> None:
+        """Run the callback for every request made since the last run."""
+        if not self._pending:
+            return  # Flushed before the frame came round
+        self._pending = False
+        self._last = time.monotonic()
+        self.runs += 1
+        self.callback()
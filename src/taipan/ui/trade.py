@@ -3,74 +3,30 @@
 from typing import Dict, List, Optional
 
 from rich.console import RenderableType
-from rich.panel import Panel
 from rich.table import Table
 from textual.app import ComposeResult
 from textual.containers import Container, Vertical
-from textual.screen import Screen
 from textual.widgets import Button, Header, Input, Static
 
+from taipan.models.commodity import Commodity
 from taipan.models.game_state import GameState
+from taipan.ui.pool import StateScreen
+from taipan.ui.throttle import FrameThrottle
+from taipan.ui.widgets import CoalescingInput, CommandLine
 
 
-class TradeScreen(Screen):
+class TradeScreen(StateScreen):
     """Screen for trading cargo."""
 
-    CSS = """
-    Screen {
-        align: center middle;
-    }
-
-    #trade-container {
-        width: 80%;
-        height: 80%;
-        border: solid $accent;
-    }
-
-    #status-panel {
-        width: 100%;
-        height: 20%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    #cargo-panel {
-        width: 100%;
-        height: 40%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    #actions-panel {
-        width: 100%;
-        height: 20%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    Button {
-        width: 100%;
-        margin: 1;
-    }
-
-    Input {
-        width: 100%;
-        margin: 1;
-    }
-
-    .highlight {
-        background: $accent;
-        color: $text;
-    }
-    """
+    PANELS = ("status", "cargo")
 
     def __init__(self, game_state: GameState) -> None:
         """Initialize the trade screen."""
-        super().__init__()
-        self.game_state = game_state
-        self.current_port = game_state.current_port
-        self.selected_cargo: Optional[str] = None
+        super().__init__(game_state)
+        self.selected_cargo: Optional[Commodity] = None
         self.trade_amount = 0
+        self._amount_text = ""
+        self._amount_throttle = FrameThrottle(self, self._apply_amount)
 
     def compose(self) -> ComposeResult:
         """Compose the trade screen."""
@@ -79,10 +35,12 @@ class TradeScreen(Screen):
             yield Static(self._render_status(), id="status-panel")
             yield Static(self._render_cargo(), id="cargo-panel")
             with Vertical(id="actions-panel"):
-                yield Input(placeholder="Enter amount to trade", id="amount-input")
+                yield CoalescingInput(placeholder="Enter amount to trade",
+                                      id="amount-input")
                 yield Button("Buy", id="buy-button")
                 yield Button("Sell", id="sell-button")
                 yield Button("Back", id="back-button")
+        yield CommandLine()
 
     def _render_status(self) -> RenderableType:
         """Render the status panel."""
@@ -90,13 +48,25 @@ class TradeScreen(Screen):
         table.add_column("Label", style="bold")
         table.add_column("Value")
 
+        ship = self.game_state.player.ship
         table.add_row("Cash", f"${self.game_state.player.cash:,}")
-        table.add_row("Cargo Space", f"{self.game_state.ship.used_cargo_space}/{self.game_state.ship.max_cargo_space}")
+        table.add_row("Cargo Space", f"{ship.get_total_cargo()}/{ship.capacity}")
         if self.selected_cargo:
-            price = self.current_port.cargo_prices[self.selected_cargo]
+            price = self.price(self.selected_cargo)
             table.add_row("Selected Cargo", f"{self.selected_cargo} (${price:,})")
+            if self.trade_amount:
+                table.add_row(
+                    "Order", f"{self.trade_amount:,} for ${price * self.trade_amount:,}"
+                )
 
-        return Panel(table, title="Status")
+        return self._frame(table, "Status")
+
+    def _key_status(self) -> tuple:
+        """Get the data the status panel shows."""
+        ship = self.game_state.player.ship
+        return (self.current_port.name, self.game_state.tick, self._key_prices(),
+                self.game_state.player.cash, ship.get_total_cargo(), ship.capacity,
+                self.selected_cargo, self.trade_amount)
 
     def _render_cargo(self) -> RenderableType:
         """Render the cargo panel."""
@@ -105,27 +75,40 @@ class TradeScreen(Screen):
         table.add_column("Price", justify="right")
         table.add_column("Your Cargo", justify="right")
 
-        for cargo in self.current_port.available_cargo:
-            price = self.current_port.cargo_prices[cargo]
-            player_cargo = self.game_state.ship.cargo.get(cargo, 0)
+        for cargo in Commodity:
+            price = self.price(cargo)
+            player_cargo = self.game_state.player.ship.hold[cargo]
             
-            row_style = "highlight" if cargo == self.selected_cargo else ""
+            row_style = "reverse" if cargo == self.selected_cargo else ""
             table.add_row(
-                cargo,
+                str(cargo),
                 f"${price:,}",
                 str(player_cargo),
                 style=row_style
             )
 
-        return Panel(table, title="Cargo Market")
+        return self._frame(table, "Cargo Market")
+
+    def _key_cargo(self) -> tuple:
+        """Get the data the cargo panel shows."""
+        return (self.current_port.name, self.game_state.tick, self._key_prices(),
+                self.selected_cargo, tuple(self.game_state.player.ship.hold.items()))
 
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle input changes."""
         if event.input.id == "amount-input":
-            try:
-                self.trade_amount = int(event.value)
-            except ValueError:
-                self.trade_amount = 0
+            # Parsing and repainting wait for the frame, so a burst of keys
+            # costs one update.
+            self._amount_text = event.value
+            self._amount_throttle.request()
+
+    def _apply_amount(self) -> None:
+        """Parse the latest amount and redraw the status panel."""
+        try:
+            self.trade_amount = int(self._amount_text)
+        except ValueError:
+            self.trade_amount = 0
+        self.rebind(self.game_state)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -139,13 +122,14 @@ class TradeScreen(Screen):
 
     def _buy_cargo(self) -> None:
         """Buy cargo."""
+        self._amount_throttle.flush()
         if not self.selected_cargo or self.trade_amount <= 0:
             self.notify("Select cargo and enter amount to buy!")
             return
 
-        price = self.current_port.cargo_prices[self.selected_cargo]
+        price = self.price(self.selected_cargo)
         total_cost = price * self.trade_amount
-        available_space = self.game_state.ship.max_cargo_space - self.game_state.ship.used_cargo_space
+        available_space = self.game_state.player.ship.get_available_space()
 
         if self.trade_amount > available_space:
             self.notify(f"Not enough cargo space! Available: {available_space}")
@@ -155,37 +139,44 @@ class TradeScreen(Screen):
             self.notify(f"Not enough cash! Need ${total_cost:,}")
             return
 
-        # Complete the transaction
-        self.game_state.player.cash -= total_cost
-        self.game_state.ship.cargo[self.selected_cargo] = self.game_state.ship.cargo.get(self.selected_cargo, 0) + self.trade_amount
-        self.game_state.ship.used_cargo_space += self.trade_amount
+        # Complete the transaction through the engine, which copies any state
+        # it shares with a snapshot before writing to it. The price may have
+        # moved since it was shown, so report what was actually charged.
+        engine = self.app.engine
+        cash = engine.state.player.cash
+        bought = engine.buy_cargo(self.selected_cargo, self.trade_amount)
+        self.rebind(engine.state)
+        if not bought:
+            self.notify("The price has risen beyond your cash!")
+            return
 
-        self.notify(f"Bought {self.trade_amount} {self.selected_cargo} for ${total_cost:,}")
-        self.refresh()
+        cost = cash - engine.state.player.cash
+        self.notify(f"Bought {self.trade_amount} {self.selected_cargo} for ${cost:,}")
 
     def _sell_cargo(self) -> None:
         """Sell cargo."""
+        self._amount_throttle.flush()
         if not self.selected_cargo or self.trade_amount <= 0:
             self.notify("Select cargo and enter amount to sell!")
             return
 
-        price = self.current_port.cargo_prices[self.selected_cargo]
-        total_value = price * self.trade_amount
-        player_cargo = self.game_state.ship.cargo.get(self.selected_cargo, 0)
+        player_cargo = self.game_state.player.ship.hold[self.selected_cargo]
 
         if player_cargo < self.trade_amount:
             self.notify(f"Not enough cargo to sell! You have {player_cargo}")
             return
 
         # Complete the transaction
-        self.game_state.player.cash += total_value
-        self.game_state.ship.cargo[self.selected_cargo] -= self.trade_amount
-        if self.game_state.ship.cargo[self.selected_cargo] == 0:
-            del self.game_state.ship.cargo[self.selected_cargo]
-        self.game_state.ship.used_cargo_space -= self.trade_amount
-
-        self.notify(f"Sold {self.trade_amount} {self.selected_cargo} for ${total_value:,}")
-        self.refresh()
+        engine = self.app.engine
+        cash = engine.state.player.cash
+        sold = engine.sell_cargo(self.selected_cargo, self.trade_amount)
+        self.rebind(engine.state)
+        if not sold:
+            self.notify("The sale fell through!")
+            return
+
+        paid = engine.state.player.cash - cash
+        self.notify(f"Sold {self.trade_amount} {self.selected_cargo} for ${paid:,}")
 
     def on_key(self, event) -> None:
         """Handle key presses."""
@@ -1,71 +1,67 @@
 """Travel screen for Taipan."""
 
-from typing import Dict, List, Optional
+import math
+from typing import List, Optional, Tuple
 
 from rich.console import RenderableType
-from rich.panel import Panel
 from rich.table import Table
 from textual.app import ComposeResult
 from textual.containers import Container, Vertical
-from textual.screen import Screen
 from textual.widgets import Button, Header, Static
 
 from taipan.models.game_state import GameState
 from taipan.models.port import Port
+from taipan.ui.pool import StateScreen
 
 
-class TravelScreen(Screen):
-    """Screen for traveling between ports."""
-
-    CSS = """
-    Screen {
-        align: center middle;
-    }
-
-    #travel-container {
-        width: 80%;
-        height: 80%;
-        border: solid $accent;
-    }
-
-    #status-panel {
-        width: 100%;
-        height: 20%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    #ports-panel {
-        width: 100%;
-        height: 40%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    #actions-panel {
-        width: 100%;
-        height: 20%;
-        border: solid $accent;
-        padding: 1;
-    }
-
-    Button {
-        width: 100%;
-        margin: 1;
-    }
-
-    .highlight {
-        background: $accent;
-        color: $text;
-    }
+PAGE_SIZE = 10  # Ports listed at a time
+
+
+class TravelScreen(StateScreen):
+    """Screen for traveling between ports.
+
+    Ports are listed nearest first, a page at a time, and only the ports on
+    the page are drawn, however large the world is. The nearest ports found
+    so far are kept for the current port and at least doubled when a page
+    needs more, so turning pages in order costs O(PAGE_SIZE) amortized.
     """
 
-    def __init__(self, game_state: GameState) -> None:
-        """Initialize the travel screen."""
-        super().__init__()
-        self.game_state = game_state
-        self.current_port = game_state.current_port
-        self.selected_port: Optional[Port] = None
+    PANELS = ("status", "ports")
+
+    BINDINGS = [
+        ("up", "select(-1)", "Previous"),
+        ("down", "select(1)", "Next"),
+        ("pageup", "page(-1)", "Nearer"),
+        ("pagedown", "page(1)", "Farther"),
+    ]
+
+    def bind_state(self, game_state: GameState) -> None:
+        """Point the screen at a game state, back at the first page after a voyage."""
+        moved = getattr(self, "current_port", None) != game_state.current_port
+        super().bind_state(game_state)
+        if moved:
+            self.page = 0
+            self.selected_port: Optional[Port] = None
+            self._nearest: Tuple[str, List[Port]] = ("", [])  # Port -> nearest first
+
+    @property
+    def pages(self) -> int:
+        """Get how many pages the other ports fill."""
+        others = len(self.game_state.ports) - 2  # Not at sea, nor here
+        return max(1, math.ceil(others / PAGE_SIZE))
+
+    def _page_ports(self) -> List[Port]:
+        """Get the ports on the current page, nearest first."""
+        start = self.page * PAGE_SIZE
+        name, nearest = self._nearest
+        if name != self.current_port.name:
+            nearest = []
+        others = len(self.game_state.ports) - 2  # Not at sea, nor here
+        if len(nearest) < min(start + PAGE_SIZE, others):
+            wanted = max(start + PAGE_SIZE, 2 * len(nearest))
+            nearest = self.game_state.world.nearest(self.current_port, wanted)
+        self._nearest = (self.current_port.name, nearest)
+        return nearest[start:start + PAGE_SIZE]
 
     def compose(self) -> ComposeResult:
         """Compose the travel screen."""
@@ -84,34 +80,68 @@ class TravelScreen(Screen):
         table.add_column("Value")
 
         table.add_row("Current Port", self.current_port.name)
-        table.add_row("Ship Condition", f"{self.game_state.ship.condition}%")
+        table.add_row("Ship Status", self.game_state.player.ship.get_status())
         if self.selected_port:
-            distance = self.current_port.distance_to(self.selected_port)
-            table.add_row("Distance", f"{distance} miles")
-            table.add_row("Fuel Cost", f"${distance * 10:,}")
+            table.add_row("Destination", self.selected_port.name)
 
-        return Panel(table, title="Status")
+        return self._frame(table, "Status")
+
+    def _key_status(self) -> tuple:
+        """Get the data the status panel shows."""
+        return (self.current_port.name, self.game_state.player.ship.get_status(),
+                self.selected_port and self.selected_port.name)
 
     def _render_ports(self) -> RenderableType:
         """Render the ports panel."""
         table = Table(show_header=True, box=None)
+        table.add_column("#", justify="right")
         table.add_column("Port")
-        table.add_column("Distance", justify="right")
-        table.add_column("Fuel Cost", justify="right")
-
-        for port in self.game_state.ports:
-            if port != self.current_port:
-                distance = self.current_port.distance_to(port)
-                fuel_cost = distance * 10
-                row_style = "highlight" if port == self.selected_port else ""
-                table.add_row(
-                    port.name,
-                    f"{distance} miles",
-                    f"${fuel_cost:,}",
-                    style=row_style
-                )
-
-        return Panel(table, title="Available Ports")
+        table.add_column("Days", justify="right")
+
+        world = self.game_state.world
+        for port in self._page_ports():
+            row_style = "reverse" if port == self.selected_port else ""
+            table.add_row(
+                str(port.get_port_index()),
+                port.name,
+                str(world.passage_days(self.current_port, port)),
+                style=row_style
+            )
+
+        title = "Available Ports"
+        if self.pages > 1:
+            title += f" ({self.page + 1}/{self.pages}, PgUp/PgDn)"
+        return self._frame(table, title)
+
+    def _key_ports(self) -> tuple:
+        """Get the data the ports panel shows."""
+        return (self.current_port.name, self.page,
+                self.selected_port and self.selected_port.name)
+
+    def action_page(self, delta: int) -> None:
+        """Turn to a nearer or farther page of ports."""
+        page = min(max(0, self.page + delta), self.pages - 1)
+        if page != self.page:
+            self.page = page
+            self.selected_port = None
+            self.rebind(self.game_state)
+
+    def action_select(self, delta: int) -> None:
+        """Select the previous or next port, turning the page at either end."""
+        ports = self._page_ports()
+        if self.selected_port in ports:
+            row = ports.index(self.selected_port) + delta
+        else:
+            row = 0 if delta > 0 else len(ports) - 1
+        if not 0 <= row < len(ports):
+            page = self.page + (1 if row >= len(ports) else -1)
+            if not 0 <= page < self.pages:
+                return
+            self.page = page
+            ports = self._page_ports()
+            row = 0 if delta > 0 else len(ports) - 1
+        self.selected_port = ports[row]
+        self.rebind(self.game_state)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -127,25 +157,20 @@ class TravelScreen(Screen):
             self.notify("Select a port to travel to!")
             return
 
-        distance = self.current_port.distance_to(self.selected_port)
-        fuel_cost = distance * 10
-
-        if self.game_state.player.cash < fuel_cost:
-            self.notify(f"Not enough cash for fuel! Need ${fuel_cost:,}")
-            return
-
-        # Deduct fuel cost and update current port
-        self.game_state.player.cash -= fuel_cost
-        self.game_state.current_port = self.selected_port
-
-        # Update ship condition (random damage during travel)
-        damage = self.game_state.random.randint(1, 5)
-        self.game_state.ship.condition = max(0, self.game_state.ship.condition - damage)
-
-        self.notify(f"Traveled to {self.selected_port.name} for ${fuel_cost:,}")
+        self.app.engine.travel_to_port(self.selected_port)
+        self.notify(f"Arrived in {self.selected_port.name}")
+        self.app.report_voyage()
+        self.selected_port = None
         self.app.pop_screen()  # Return to port screen
 
     def on_key(self, event) -> None:
         """Handle key presses."""
         if event.key == "escape":
-            self.app.pop_screen() 
\ No newline at end of file
+            self.app.pop_screen()
+        elif event.key.isdigit():
+            # 1-9 pick a row on the page, 0 the tenth.
+            ports = self._page_ports()
+            row = (int(event.key) - 1) % PAGE_SIZE
+            if row < len(ports):
+                self.selected_port = ports[row]
+                self.rebind(self.game_state) 
\ No newline at end of file
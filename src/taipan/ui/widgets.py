@@ -1,6 +1,6 @@
 """Custom widgets for Taipan."""
 
-from textual.widgets import Static
+from textual.widgets import Input, Static
 from textual.app import ComposeResult
 
 class StatusBar(Static):
@@ -11,4 +11,34 @@ class StatusBar(Static):
         yield Static("Cash: 0", id="cash")
         yield Static("Cargo: 0/60", id="cargo")
         yield Static("Guns: 0", id="guns")
-        yield Static("Location: Hong Kong", id="location") 
\ No newline at end of file
+        yield Static("Location: Hong Kong", id="location")
+        yield Static("", id="autopilot")
+
+class CoalescingInput(Input):
+    """Input whose queued change messages collapse into the latest one.
+    
+    A paste or a held key queues a change per character; the message loop
+    drops every one that a newer change to the same input supersedes.
+    """
+    
+    class Changed(Input.Changed, namespace="input"):
+        """Posted when the value changes."""
+        
+        def can_replace(self, message) -> bool:
+            """Check if this change supersedes a pending one."""
+            return isinstance(message, Input.Changed) and message.input is self.input
+
+
+class CommandLine(CoalescingInput):
+    """Input for terse multi-command lines, e.g. ``b o 50; s s all; t 3``."""
+    
+    def __init__(self) -> None:
+        """Initialize the command line."""
+        super().__init__(placeholder="Orders, e.g. b o 50; s s all; d 10000; t 3",
+                         id="command-line")
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Run the submitted orders and clear the line."""
+        event.stop()
+        self.app.run_command_line(event.value)
+        self.value = ""
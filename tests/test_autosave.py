@@ -0,0 +1,68 @@
+"""Tests for background autosaves."""
+
+import multiprocessing
+import os
+import random
+import time
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.store.autosave import Autosaver
+
+ROUNDS = 5
+
+
+def _crash_child(directory: str) -> None:
+    """Play and autosave as fast as possible until killed."""
+    saver = Autosaver(directory)
+    engine = GameEngine.new_game("Crash", "cash")
+    engine.listeners.append(lambda e, command: saver.save("crash", e))
+    ports = [p for p in engine.state.ports if p.name != "At Sea"]
+    while True:
+        commodity = random.choice(list(Commodity))
+        if not engine.buy_cargo(commodity, 1):
+            engine.sell_cargo(commodity, engine.state.player.ship.hold[commodity])
+        engine.travel_to_port(random.choice(ports))
+
+
+def test_saves_survive_the_writer_being_killed(tmp_path):
+    directory = str(tmp_path)
+    saver = Autosaver(directory)
+    context = multiprocessing.get_context("spawn")
+    try:
+        for _ in range(ROUNDS):
+            process = context.Process(target=_crash_child, args=(directory,))
+            process.start()
+            deadline = time.monotonic() + 30
+            while not os.path.exists(saver.path("crash")):
+                assert time.monotonic() < deadline, "the game never saved"
+                time.sleep(0.01)
+            time.sleep(random.uniform(0, 0.2))
+            process.kill()
+            process.join()
+
+            engine = saver.load("crash")
+            assert engine is not None
+            assert engine.state.player.firm_name == "Crash"
+            os.remove(saver.path("crash"))
+    finally:
+        saver.close()
+
+
+
+def test_a_failed_encode_does_not_stop_later_saves(tmp_path):
+    saver = Autosaver(str(tmp_path))
+    try:
+        broken = GameEngine.new_game("Broken", "cash")
+        broken.schedule(1, "storm", object())  # Timer data that is not JSON
+        saver.save("broken", broken)
+        saver.flush()
+        assert isinstance(saver.error, TypeError)
+        assert saver.errors == 1
+        assert not os.path.exists(saver.path("broken"))
+
+        saver.save("good", GameEngine.new_game("Good", "cash"))
+        saver.flush()
+        assert saver.load("good").state.player.firm_name == "Good"
+    finally:
+        saver.close()
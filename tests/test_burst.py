@@ -0,0 +1,15 @@
+"""Tests that the trade screen keeps up with a burst of keys."""
+
+import asyncio
+
+from taipan.bench.burst import check, replay
+
+KEYS = 1000
+MAX_LATENCY = 1.0  # Seconds, as for python -m taipan.bench.burst
+
+
+def test_a_thousand_key_burst_stays_within_the_frame_caps():
+    result = asyncio.run(replay(KEYS))
+    assert check(result, MAX_LATENCY) == {
+        "latency": True, "renders": True, "recomputes": True,
+    }, result
@@ -0,0 +1,33 @@
+"""Tests for the columnar turn records."""
+
+import os
+
+import pytest
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.store.columnar import ACTIONS, TurnWriter, iter_batches, read
+
+
+@pytest.mark.parametrize("codec", ["zlib", "none"])
+def test_records_read_back_batch_by_batch(tmp_path, codec):
+    dataset = str(tmp_path)
+    engine = GameEngine.new_game("Test", "cash")
+    cash = []
+    with TurnWriter(dataset, "a", batch_size=4, codec=codec) as writer:
+        for turn in range(10):
+            engine.buy_cargo(Commodity.GENERAL, 1)
+            writer.append(7, engine, "buy_cargo" if turn % 2 else "mystery")
+            cash.append(engine.state.player.cash)
+    # A part that was still being written when its writer died.
+    TurnWriter(dataset, "b", batch_size=4, codec=codec).append(8, engine, "buy")
+
+    batches = list(iter_batches(dataset, ["game", "hold_general", "action"]))
+    assert [len(b["game"]) for b in batches] == [4, 4, 2]
+
+    columns = read(dataset)
+    assert columns["game"].tolist() == [7] * 10
+    assert columns["hold_general"].tolist() == list(range(1, 11))
+    assert columns["action"].tolist() == [0, ACTIONS.index("buy_cargo")] * 5
+    assert columns["cash"].tolist() == cash
+    assert os.path.exists(os.path.join(dataset, "part-b", "game.col"))
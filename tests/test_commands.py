@@ -0,0 +1,77 @@
+"""Tests for terse command lines."""
+
+import pytest
+
+from taipan.models.commands import CommandError, execute, parse
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+
+
+def _run(engine: GameEngine, line: str) -> int:
+    """Parse and run a line."""
+    return execute(engine, parse(line))
+
+
+@pytest.mark.parametrize("line, message", [
+    ("x 5", "unknown command 'x'"),
+    ("b", "which cargo?"),
+    ("b q 5", "unknown cargo 'q'"),
+    ("b o", "how much?"),
+    ("b o five", "'five' is not an amount"),
+    ("d -5", "amount cannot be negative"),
+    ("d 5 6", "too many words"),
+    ("l all", "'all' is not allowed here"),
+    ("t all", "'all' is not allowed here"),
+])
+def test_parse_errors_name_the_command(line, message):
+    with pytest.raises(CommandError, match=message):
+        parse(f"d 1; {line}")
+
+
+def test_the_autopilot_must_come_last():
+    assert [c.verb for c in parse("b o 1; a 3")] == ["b", "a"]
+    with pytest.raises(CommandError, match="a 3: the autopilot must be the last"):
+        parse("a 3; b o 1")
+
+
+def test_all_buys_sells_deposits_withdraws_and_repays_the_most_possible():
+    engine = GameEngine.new_game("Test", "cash")
+    price = engine.get_price(Commodity.OPIUM)
+    _run(engine, "b o all")
+    player = engine.state.player
+    assert player.ship.hold[Commodity.OPIUM] > 0
+    assert player.cash < price or player.ship.get_available_space() == 0
+
+    _run(engine, "s o all")
+    player = engine.state.player
+    assert player.ship.hold[Commodity.OPIUM] == 0
+
+    cash = player.cash
+    _run(engine, "d all")
+    assert (engine.state.player.cash, engine.state.player.bank) == (0, cash)
+    _run(engine, "w all")
+    assert (engine.state.player.cash, engine.state.player.bank) == (cash, 0)
+
+    _run(engine, f"l {cash}; d all; w 300; r all")
+    assert (engine.state.player.cash, engine.state.player.debt) == (0, cash - 300)
+
+
+def test_borrowing_is_capped_at_twice_the_cash():
+    engine = GameEngine.new_game("Test", "cash")
+    cash = engine.state.player.cash
+    with pytest.raises(CommandError, match="at most"):
+        _run(engine, f"l {2 * cash + 1}")
+    with pytest.raises(CommandError, match="at most"):
+        _run(engine, "l 99999999999999999999999")
+    _run(engine, f"l {2 * cash}")
+    assert engine.state.player.debt == 2 * cash
+
+
+def test_a_failure_reports_how_many_commands_ran():
+    engine = GameEngine.new_game("Test", "cash")
+    cash = engine.state.player.cash
+    with pytest.raises(CommandError) as failure:
+        _run(engine, f"d 100; w 50; d {cash}; d 1")
+    assert failure.value.done == 2
+    assert "Not enough cash" in str(failure.value)
+    assert engine.state.player.bank == 50  # The first two kept their effect
@@ -0,0 +1,64 @@
+"""Tests for the NPC economy and how games trade against it."""
+
+from taipan.models.commodity import Commodity
+from taipan.models.economy import NpcEconomy
+from taipan.models.game_engine import GameEngine
+from taipan.models.market import Order, SharedMarket
+
+
+def _engine(economy: NpcEconomy) -> GameEngine:
+    """Start a rich game in Hong Kong trading against an economy."""
+    engine = GameEngine.new_game("Test", "cash")
+    engine.economy = economy
+    engine.state.player.cash = 10 ** 6
+    engine.state.player.ship.capacity = 10 ** 4
+    return engine
+
+
+def test_player_trades_move_economy_prices():
+    economy = NpcEconomy(ships=100, seed=1)
+    engine = _engine(economy)
+    before = engine.get_price(Commodity.SILK)
+    assert engine.buy_cargo(Commodity.SILK, 500)
+    assert engine.get_price(Commodity.SILK) > before
+
+    dear = engine.get_price(Commodity.SILK)
+    assert engine.sell_cargo(Commodity.SILK, 500)
+    assert engine.get_price(Commodity.SILK) < dear
+
+
+def test_voyages_advance_the_economy():
+    economy = NpcEconomy(ships=100, seed=1)
+    engine = _engine(economy)
+    start = engine.state.tick
+    engine.travel_to_port(engine.state.ports[2])
+    assert economy.ticks == engine.state.tick - start > 0
+
+
+def test_spent_branches_leave_the_economy_alone():
+    economy = NpcEconomy(ships=100, seed=1)
+    engine = _engine(economy)
+    branch = engine.fork()
+    engine.commit(branch)
+    discarded = engine.fork()
+    engine.discard(discarded)
+
+    for spent in (branch, discarded):
+        stock, ticks = economy.stock.copy(), economy.ticks
+        assert spent.buy_cargo(Commodity.SILK, 500)
+        spent.travel_to_port(spent.state.ports[2])
+        assert (economy.stock == stock).all()
+        assert economy.ticks == ticks
+
+
+def test_market_fills_orders_from_its_economy():
+    economy = NpcEconomy(ships=100, seed=1)
+    market = SharedMarket(economy=economy)
+    stock = economy.stock.copy()
+    market.submit(Order("buyer", "Hong Kong", Commodity.OPIUM, 300))
+    market.submit(Order("seller", "Hong Kong", Commodity.OPIUM, -100))
+    market.tick()
+    cell = (1, Commodity.OPIUM.value - 1)
+    # The net 200 bought comes out of stock before the tick's restocking.
+    assert economy.stock[cell] < stock[cell]
+    assert economy.prices[cell] > economy.base[cell]
@@ -0,0 +1,76 @@
+"""Tests for random events and their effects."""
+
+import random
+
+import numpy as np
+import pytest
+
+from taipan.models.commodity import Commodity
+from taipan.models.events import AliasTable, Event, EventRule, EventScheduler
+from taipan.models.game_engine import GameEngine
+from taipan.models.game_state import GameState
+
+
+def test_alias_table_follows_the_weights():
+    table = AliasTable([Event.NOTHING, Event.STORM], [0.75, 0.25])
+    rng = random.Random(1)
+    storms = sum(table.sample(rng) is Event.STORM for _ in range(20000))
+    assert storms / 20000 == pytest.approx(0.25, abs=0.02)
+
+    picks = table.sample_many(np.random.default_rng(1).random(20000))
+    assert (picks == Event.STORM).mean() == pytest.approx(0.25, abs=0.02)
+
+
+def test_draw_batch_draws_per_game_tables():
+    at_sea = frozenset({"At Sea"})
+    scheduler = EventScheduler([EventRule(Event.STORM, 1.0, ports=at_sea)])
+    games = [GameEngine.new_game("Test", "cash").state for _ in range(100)]
+    assert set(scheduler.draw_batch(games)) == {Event.NOTHING}
+    assert set(scheduler.draw_batch(games, port="At Sea")) == {Event.STORM}
+
+
+def _engine(*events: Event) -> GameEngine:
+    """Start a game in which every roll is one of the given events."""
+    rules = [EventRule(event, 1.0) for event in events]
+    engine = GameEngine.new_game("Test", "cash")
+    engine.events = EventScheduler(rules)
+    engine.rng = random.Random(7)
+    return engine
+
+
+def test_voyages_apply_their_events():
+    engine = _engine(Event.STORM)
+    engine.travel_to_port(engine.state.ports[2])
+    assert engine.voyage_events == [Event.STORM, Event.STORM]
+    assert engine.state.player.ship.damage > 0
+
+    engine = _engine(Event.ROBBERY)
+    engine.state.player.cash = 100000
+    engine.travel_to_port(engine.state.ports[2])
+    assert engine.state.player.cash < 100000
+
+
+def test_li_yuen_takes_half_the_cargo_unless_paid():
+    engine = _engine(Event.LI_YUEN)
+    engine.buy_cargo(Commodity.GENERAL, 10)
+    engine.apply_event(Event.LI_YUEN)
+    assert engine.state.player.ship.hold[Commodity.GENERAL] == 5
+
+    engine.state.li_yuen_visited = True
+    engine.apply_event(Event.LI_YUEN)
+    assert engine.state.player.ship.hold[Commodity.GENERAL] == 5
+
+
+def test_price_shock_moves_one_price_until_the_ship_sails():
+    engine = _engine(Event.PRICE_SHOCK)
+    engine.apply_event(Event.PRICE_SHOCK)
+    commodity, factor = engine.state.price_shock
+    base = engine.state.current_port.base_price(commodity)
+    assert abs(engine.get_price(commodity) - base * factor) <= 2 * factor + 1
+
+    restored = GameState.from_dict(engine.state.to_dict())
+    assert restored.price_shock == engine.state.price_shock
+
+    engine.events = EventScheduler([])
+    engine.travel_to_port(engine.state.ports[2])
+    assert engine.state.price_shock is None
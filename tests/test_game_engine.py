@@ -0,0 +1,123 @@
+"""Tests for the copy-on-write game engine."""
+
+import random
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.models.market import SharedMarket
+
+
+def test_fork_shares_state_until_a_write():
+    engine = GameEngine.new_game("Test", "cash")
+    branch = engine.fork()
+    assert branch.state is engine.state
+
+    branch.buy_cargo(Commodity.GENERAL, 1)
+    assert branch.state is not engine.state
+    assert branch.state.player.ship.hold[Commodity.GENERAL] == 1
+    assert engine.state.player.ship.hold[Commodity.GENERAL] == 0
+
+
+def test_commit_adopts_the_branch_and_discard_drops_it():
+    engine = GameEngine.new_game("Test", "cash")
+    kept = engine.fork()
+    kept.buy_cargo(Commodity.GENERAL, 2)
+    engine.commit(kept)
+    assert engine.state.player.ship.hold[Commodity.GENERAL] == 2
+
+    dropped = engine.fork()
+    dropped.buy_cargo(Commodity.GENERAL, 3)
+    engine.discard(dropped)
+    assert engine.state.player.ship.hold[Commodity.GENERAL] == 2
+
+    # Neither side may write through state the other still holds.
+    engine.buy_cargo(Commodity.GENERAL, 1)
+    assert kept.state.player.ship.hold[Commodity.GENERAL] == 2
+
+
+def test_failed_sale_keeps_the_state_shared():
+    engine = GameEngine.new_game("Test", "cash")
+    branch = engine.fork()
+    assert not branch.sell_cargo(Commodity.SILK, 1)
+    assert branch.state is engine.state
+    assert branch.state.player.ship is engine.state.player.ship
+
+
+def test_branches_draw_from_their_own_random_numbers():
+    engine = GameEngine.new_game("Test", "cash")
+    engine.rng = random.Random(7)
+    expected = random.Random(7)
+    rolls = [expected.random() for _ in range(3)]
+
+    dropped = engine.fork()
+    for _ in range(5):
+        dropped.roll_event()
+    engine.discard(dropped)
+    assert engine._mutable_rng().random() == rolls[0]  # Untouched by the branch
+
+    kept = engine.fork()
+    assert kept._mutable_rng().random() == rolls[1]
+    engine.commit(kept)
+    assert engine._mutable_rng().random() == rolls[2]  # Carries on from the branch
+
+
+def test_branches_price_from_the_market_and_hold_their_orders():
+    market = SharedMarket()
+    engine = GameEngine.new_game("Test", "cash")
+    engine.market = market
+    branch = engine.fork()
+    assert branch.get_price(Commodity.SILK) == market.price("Hong Kong", Commodity.SILK)
+
+    assert branch.buy_cargo(Commodity.SILK, 1)
+    assert not market._orders
+    engine.commit(branch)
+    assert [order.amount for order in market._orders] == [1]
+
+
+def test_timers_fire_in_due_order_then_scheduling_order():
+    engine = GameEngine.new_game("Test", "cash")
+    start = engine.state.tick
+    seen = []
+    engine.effect_handlers["note"] = lambda game, timer: seen.append(
+        (timer.data, game.state.tick))
+    engine.schedule(5, "note", "late")
+    engine.schedule(2, "note", "first")
+    engine.schedule(2, "note", "second")
+    engine.schedule(9, "note", "later")
+
+    fired = engine.advance_time(5)
+    assert [t.data for t in fired] == ["first", "second", "late"]
+    assert seen == [("first", start + 2), ("second", start + 2), ("late", start + 5)]
+    assert engine.state.tick == start + 5
+    assert engine.state.timers.next_due() == start + 9
+
+
+def test_cancel_drops_every_timer_for_an_effect():
+    engine = GameEngine.new_game("Test", "cash")
+    engine.schedule(1, "loan_due")
+    engine.schedule(3, "loan_due")
+    engine.schedule(2, "storm")
+    assert engine.cancel("loan_due") == 2
+    assert engine.cancel("loan_due") == 0
+    assert [t.effect for t in engine.advance_time(10)] == ["storm"]
+    assert len(engine.state.timers) == 0
+
+
+def test_branch_timers_are_copied_on_write():
+    engine = GameEngine.new_game("Test", "cash")
+    engine.schedule(4, "storm")
+    timers = engine.state.timers
+
+    branch = engine.fork()
+    branch.schedule(1, "pirates")
+    branch.cancel("storm")
+    assert [t.effect for t in branch.advance_time(5)] == ["pirates"]
+    assert engine.state.timers is timers
+    assert [t.effect for t in timers.heap] == ["storm"]
+    engine.discard(branch)
+
+    kept = engine.fork()
+    kept.schedule(1, "pirates")
+    engine.commit(kept)
+    assert [t.effect for t in engine.advance_time(5)] == ["pirates", "storm"]
+    assert [t.effect for t in timers.heap] == ["storm"]
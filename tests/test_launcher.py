@@ -0,0 +1,37 @@
+"""Tests for the pre-forked launcher."""
+
+import os
+import socket
+
+from taipan.net.launcher import HELLO, Launcher, read_hello
+
+
+def test_worker_crashes_are_logged_to_the_launchers_stderr(capfd):
+    launcher = Launcher()
+
+    def crash(listener, notify):
+        os.dup2(os.open(os.devnull, os.O_WRONLY), 2)  # As a session's terminal does
+        raise RuntimeError("boom")
+
+    launcher._worker = crash
+    launcher._spawn(None, -1)
+    (pid,) = launcher.idle
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 1
+    err = capfd.readouterr().err
+    assert "Worker" in err and "RuntimeError: boom" in err
+
+
+def test_hello_names_the_session_and_leaves_keystrokes():
+    server, client = socket.socketpair()
+    with server, client:
+        client.sendall(HELLO + b"alice\n" + b"q")
+        assert read_hello(server) == "alice"
+        assert server.recv(16) == b"q"
+
+        client.sendall(b"q")  # A raw terminal's first keystroke
+        assert read_hello(server) is None
+        assert server.recv(16) == b"q"
+
+        client.sendall(HELLO + b"../etc\n")
+        assert read_hello(server) is None
@@ -0,0 +1,128 @@
+"""Tests for the shared market and the host that serves it to workers."""
+
+import os
+import threading
+import time
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.models.market import SharedMarket
+from taipan.net.host import Host, HostClient, RemoteMarket, RemoteStore
+from taipan.sim.autopilot import voyage
+from taipan.store.sessions import SessionStore
+from taipan.ui.autopilot import Autopilot
+
+
+def _session(market: SharedMarket, name: str) -> GameEngine:
+    """Start a rich game in Hong Kong trading on a market."""
+    engine = GameEngine.new_game(name, "cash")
+    engine.market = market
+    engine.session = name
+    engine.state.player.cash = 10 ** 6
+    engine.state.player.ship.capacity = 10 ** 4
+    return engine
+
+
+def test_trades_in_one_session_move_prices_in_another():
+    market = SharedMarket()
+    buyer, other = _session(market, "buyer"), _session(market, "other")
+    before = other.get_price(Commodity.OPIUM)
+    quotes = dict(market.quotes)
+
+    assert buyer.buy_cargo(Commodity.OPIUM, 2000)
+    assert other.get_price(Commodity.OPIUM) == before  # Not until the tick
+    market.tick()
+    assert other.get_price(Commodity.OPIUM) > before
+
+    # Markets nobody traded in keep their quotes.
+    moved = {key for key in quotes if market.quotes[key] != quotes[key]}
+    assert moved == {("Hong Kong", Commodity.OPIUM)}
+
+
+def test_prices_settle_back_to_base():
+    market = SharedMarket()
+    _session(market, "buyer").buy_cargo(Commodity.SILK, 2000)
+    for _ in range(100):
+        market.tick()
+    assert not market._moving
+    assert abs(market.price("Hong Kong", Commodity.SILK) - 11) <= 2
+
+
+def test_autopilot_orders_reach_the_market_only_on_commit():
+    market = SharedMarket()
+
+    class App:
+        engine = _session(market, "pilot")
+
+        def autopilot_progress(self, autopilot):
+            pass
+
+    autopilot = Autopilot(App(), voyages=2)
+    thrown = autopilot._fork()
+    assert voyage(thrown)
+    autopilot.engine.discard(thrown)
+    assert not market._orders  # A voyage thrown away never reaches the market
+
+    branch = autopilot._fork()
+    assert voyage(branch)
+    orders = list(branch.market.orders)
+    assert orders and not market._orders  # Held back until the commit
+    autopilot._land(branch)
+    assert list(market._orders) == orders
+
+
+def test_host_shares_one_market_between_workers(tmp_path):
+    address = os.path.join(tmp_path, "host.sock")
+    host = Host(address, SharedMarket(), interval=0.02)
+    thread = threading.Thread(target=host.serve_forever, daemon=True)
+    thread.start()
+    clients = [HostClient(address), HostClient(address)]
+    try:
+        buyer = _session(RemoteMarket(clients[0]), "buyer")
+        other = _session(RemoteMarket(clients[1]), "other")
+        before = host.market.price("Hong Kong", Commodity.OPIUM)
+        assert buyer.buy_cargo(Commodity.OPIUM, 2000)
+
+        deadline = time.monotonic() + 5
+        while other.get_price(Commodity.OPIUM) <= before + 2:
+            assert time.monotonic() < deadline, "the other worker never saw the trade"
+            time.sleep(0.01)
+    finally:
+        for client in clients:
+            client.close()
+        host.close()
+        thread.join(timeout=5)
+
+
+def test_workers_save_to_the_hosts_one_store(tmp_path):
+    address = os.path.join(tmp_path, "host.sock")
+    store = SessionStore(os.path.join(tmp_path, "sessions.db"), interval=60)
+    host = Host(address, SharedMarket(), interval=60, store=store)
+    thread = threading.Thread(target=host.serve_forever, daemon=True)
+    thread.start()
+    clients = [HostClient(address), HostClient(address)]
+    try:
+        saver, other = RemoteStore(clients[0]), RemoteStore(clients[1])
+        engine = _session(SharedMarket(), "alice")
+        saver.save("alice", engine)
+        engine.buy_cargo(Commodity.SILK, 10)  # After the save; not in it
+
+        # The save loads before the store has committed it...
+        loaded = saver.load("alice")
+        assert loaded.state.player.ship.hold[Commodity.SILK] == 0
+        assert loaded.state.player.cash == 10 ** 6
+        assert store.written == 0
+        # ...and every worker sees it once it has.
+        saver.flush()
+        assert other.latest() == "alice"
+        assert other.load("alice").state.player.cash == 10 ** 6
+    finally:
+        for client in clients:
+            client.close()
+        host.close()
+        thread.join(timeout=5)
+    reopened = SessionStore(os.path.join(tmp_path, "sessions.db"))
+    try:
+        assert reopened.load("alice").state.player.cash == 10 ** 6
+    finally:
+        reopened.close()
@@ -0,0 +1,68 @@
+"""Tests for the Prometheus metrics."""
+
+import asyncio
+import threading
+
+from taipan.net import metrics
+from taipan.net.metrics import Counter, Histogram
+
+
+def test_histograms_render_cumulative_buckets(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+    histogram = Histogram("test_seconds", "Test timings.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert metrics.render().splitlines() == [
+        "# HELP test_seconds Test timings.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="1"} 3',
+        'test_seconds_bucket{le="+Inf"} 4',
+        "test_seconds_sum 6.05",
+        "test_seconds_count 4",
+    ]
+
+
+def test_shards_from_every_thread_are_summed(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+    counter = Counter("test_events", "Test events.", ("kind",))
+    histogram = Histogram("test_seconds", "Test timings.", buckets=(1.0,))
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc("a")
+            histogram.observe(0.5)
+        counter.inc("b", amount=2)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.totals() == {("a",): 4000, ("b",): 8}
+    assert ('test_events_total{kind="a"}', 4000) in counter.samples()
+    samples = dict(histogram.samples())
+    assert samples["test_seconds_count"] == 4000
+    assert samples["test_seconds_sum"] == 2000
+
+
+def test_scrapes_answer_only_the_metrics_path(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+    Counter("test_events", "Test events.").inc()
+
+    async def get(path: str) -> bytes:
+        server = await asyncio.start_server(metrics._serve_scrape, "127.0.0.1", 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.0\r\nHost: test\r\n\r\n".encode())
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(get("/metrics"))
+    assert response.startswith(b"HTTP/1.0 200 OK\r\n")
+    assert response.endswith(b"test_events_total 1\n")
+    assert asyncio.run(get("/")).startswith(b"HTTP/1.0 404 Not Found\r\n")
@@ -0,0 +1,30 @@
+"""Tests for frame timing and quality levels."""
+
+import asyncio
+
+from taipan.models.game_engine import GameEngine
+from taipan.ui import quality
+from taipan.ui.app import TaipanApp
+
+
+def test_painted_frames_are_timed_per_app():
+    async def run():
+        app = TaipanApp(splash=False)
+        async with app.run_test(size=(100, 60)) as pilot:
+            app.start_game(GameEngine.new_game("Budget", "cash"))
+            await pilot.pause()
+            frames = app.quality.frames
+            for _ in range(3):
+                app.screen.refresh()
+                await pilot.pause()
+            return app.quality.frames - frames
+
+    assert asyncio.run(run()) >= 3
+
+
+def test_slow_frames_step_quality_down():
+    budget = quality.FrameBudget(TaipanApp(), budget=0.01)
+    for _ in range(quality.DOWN_AFTER):
+        budget.observe(0.05)
+    assert budget.level == quality.BORDERLESS
+    budget.close()
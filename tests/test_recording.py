@@ -0,0 +1,83 @@
+"""Tests for session recordings."""
+
+import time
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.store.recording import Recorder, Recording
+
+
+def _record(path: str, engine: GameEngine) -> Recorder:
+    """Record two chunks: a purchase, then a keyframe of the game after it."""
+    recorder = Recorder(path, interval=3600, max_bytes=10)
+    screens = iter(["first screen", "second screen"])
+    recorder.keyframe_source = lambda: next(screens)
+    engine.listeners.append(recorder.command)
+    recorder.output("drawn into the first keyframe")
+    time.sleep(0.01)
+    engine.buy_cargo(Commodity.GENERAL, 3)
+    recorder.output(" then a diff")
+    time.sleep(0.01)
+    recorder.output("drawn into the second keyframe")
+    recorder.close()
+    return recorder
+
+
+def test_seeking_finds_the_screen_and_game_at_any_time(tmp_path):
+    path = str(tmp_path / "session.rec")
+    engine = GameEngine.new_game("Test", "cash")
+    recorder = _record(path, engine)
+    assert recorder.error is None
+
+    recording = Recording(path)
+    assert len(recording.chunks) == 2
+    first = recording.seek(recording.starts[0])
+    assert first.game is None
+    assert first.screen == "first screen"
+    assert first.commands == []
+
+    before = recording.seek(recording.starts[1] - 0.001)
+    assert before.screen == "first screen then a diff"
+    assert before.commands == ["buy_cargo"]
+    assert before.view["cash"] == engine.state.player.cash
+    assert before.view["hold_general"] == 3
+
+    last = recording.seek(recording.duration)
+    assert last.screen == "second screen"
+    assert last.game.state.player.ship.hold[Commodity.GENERAL] == 3
+
+
+def test_a_recording_without_an_index_is_scanned(tmp_path):
+    path = str(tmp_path / "session.rec")
+    _record(path, GameEngine.new_game("Test", "cash"))
+    whole = Recording(path)
+    _, offset, length = whole.chunks[1]
+
+    crashed = tmp_path / "crashed.rec"
+    crashed.write_bytes(whole.data[:offset + length])
+    assert Recording(str(crashed)).chunks == whole.chunks
+
+    crashed.write_bytes(whole.data[:offset + length // 2])  # Mid-write
+    recording = Recording(str(crashed))
+    assert recording.chunks == whole.chunks[:1]
+    assert recording.seek(recording.duration).screen == "first screen then a diff"
+
+
+def test_a_chunk_that_fails_to_encode_leaves_a_gap(tmp_path):
+    path = str(tmp_path / "session.rec")
+    engine = GameEngine.new_game("Test", "cash")
+    engine.schedule(1, "storm", object())  # Timer data that is not JSON
+    recorder = Recorder(path, interval=3600, max_bytes=1)
+    engine.listeners.append(recorder.command)
+    recorder.output("first")
+    engine.buy_cargo(Commodity.GENERAL, 1)
+    recorder.output("x")
+    recorder.output("second")  # Its game snapshot cannot be encoded
+    engine.cancel("storm")
+    recorder.output("x")
+    recorder.output("third")
+    recorder.close()
+
+    assert isinstance(recorder.error, TypeError)
+    assert recorder.errors == 1
+    assert len(Recording(path).chunks) == 2
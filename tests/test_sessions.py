@@ -0,0 +1,49 @@
+"""Tests for the write-behind session store."""
+
+import os
+import sqlite3
+
+import pytest
+
+from taipan.models.game_engine import GameEngine
+from taipan.net.metrics import STORE_FLUSH_ERRORS
+from taipan.store import sessions
+from taipan.store.sessions import SessionStore
+
+
+def test_failed_flushes_back_off_and_retry(tmp_path, monkeypatch):
+    store = SessionStore(os.path.join(tmp_path, "sessions.db"), interval=0.01)
+    commit = store._commit
+    calls = []
+
+    def flaky(dirty):
+        calls.append(len(dirty))
+        if len(calls) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        commit(dirty)
+
+    monkeypatch.setattr(store, "_commit", flaky)
+    store.save("alice", GameEngine.new_game("Alice", "cash"))
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    store.close()
+    assert calls == [1, 1, 1]
+    assert store.errors == 2 and store.dropped == 0
+    assert store.written == 1
+
+
+def test_close_gives_up_on_a_broken_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(sessions, "MAX_BACKOFF", 0.01)
+    store = SessionStore(os.path.join(tmp_path, "sessions.db"), interval=60)
+    dropped = STORE_FLUSH_ERRORS.totals().get(("dropped",), 0)
+
+    def broken(dirty):
+        raise ValueError("unencodable")  # Not only sqlite3.Error
+
+    monkeypatch.setattr(store, "_commit", broken)
+    store.save("alice", GameEngine.new_game("Alice", "cash"))
+    store.close()  # Returns instead of retrying forever
+    assert store.dropped == 1
+    assert store.errors == sessions.CLOSE_ATTEMPTS
+    assert isinstance(store.error, ValueError)
+    assert STORE_FLUSH_ERRORS.totals()[("dropped",)] == dropped + 1
@@ -0,0 +1,42 @@
+"""Tests for spectator keyframes."""
+
+import asyncio
+
+from textual.app import App, ComposeResult
+from textual.widgets import Static
+
+from taipan.net.spectate import render_keyframe
+from taipan.ui import compat
+
+
+class _Hello(App):
+    """An app with one line of text."""
+
+    def compose(self) -> ComposeResult:
+        """Compose the app."""
+        yield Static("Hello, Taipan")
+
+
+def test_keyframes_render_the_whole_screen():
+    async def run() -> str:
+        app = _Hello()
+        async with app.run_test(size=(40, 5)):
+            return render_keyframe(app)
+
+    assert "Hello, Taipan" in asyncio.run(run())
+
+
+def test_unchecked_textual_versions_repaint_instead(monkeypatch):
+    monkeypatch.setattr(compat, "INTERNALS", False)
+    repaints = []
+
+    async def run() -> str:
+        app = _Hello()
+        async with app.run_test(size=(40, 5)) as pilot:
+            monkeypatch.setattr(app, "refresh_css", lambda animate: repaints.append(1))
+            keyframe = render_keyframe(app)
+            await pilot.pause()
+            return keyframe
+
+    assert asyncio.run(run()) == ""
+    assert repaints == [1]
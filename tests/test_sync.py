@@ -0,0 +1,54 @@
+"""Tests for state-delta sync."""
+
+import random
+
+from taipan.models.commodity import Commodity
+from taipan.models.game_engine import GameEngine
+from taipan.net.sync import (
+    DeltaDecoder,
+    DeltaEncoder,
+    capture,
+    read_varint,
+    unzigzag,
+    write_varint,
+    zigzag,
+)
+
+
+def test_capturing_an_unchanged_game_sends_an_empty_delta():
+    engine = GameEngine.new_game("Test", "cash")
+    engine_rng, global_rng = engine.rng.getstate(), random.getstate()
+    encoder = DeltaEncoder(engine)
+    version = encoder.version
+
+    assert capture(engine) == capture(engine)
+    assert encoder.commit() == version
+    frame = encoder.encode(acked=version)
+    assert frame[-1] == 0  # No fields in the mask, and so no values
+    assert engine.rng.getstate() == engine_rng
+    assert random.getstate() == global_rng
+
+
+def test_deltas_bring_a_client_up_to_date():
+    engine = GameEngine.new_game("Test", "cash")
+    encoder = DeltaEncoder(engine)
+    client = DeltaDecoder()
+    assert client.apply(encoder.encode())
+
+    engine.buy_cargo(Commodity.GENERAL, 5)
+    acked = client.version
+    encoder.commit()
+    assert client.apply(encoder.encode(acked))
+    assert client.values == list(capture(engine))
+
+
+def test_varints_round_trip():
+    values = [0, 1, -1, 63, -64, 64, 300, -(2 ** 40), 2 ** 63]
+    out = bytearray()
+    for value in values:
+        write_varint(out, zigzag(value))
+    pos, decoded = 0, []
+    while pos < len(out):
+        raw, pos = read_varint(out, pos)
+        decoded.append(unzigzag(raw))
+    assert decoded == values
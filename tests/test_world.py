@@ -0,0 +1,77 @@
+"""Tests for generated worlds."""
+
+import math
+
+import pytest
+
+from taipan.models.commodity import Commodity
+from taipan.models.economy import NpcEconomy
+from taipan.models.game_engine import GameEngine
+from taipan.models.market import OrderBuffer, SharedMarket
+from taipan.models.world import World
+from taipan.sim.autopilot import _expected_price, best_trade
+from taipan.store.columnar import _quote
+
+
+def _market():
+    """A shared market alone."""
+    return SharedMarket()
+
+
+def _economy():
+    """An economy alone."""
+    return NpcEconomy(100, seed=0)
+
+
+def _both():
+    """A shared market anchored by an economy."""
+    return SharedMarket(economy=NpcEconomy(100, seed=0))
+
+
+def _buffer():
+    """An autopilot branch's view of a shared market."""
+    return OrderBuffer(SharedMarket())
+
+
+@pytest.mark.parametrize("source", [None, _market, _economy, _both, _buffer])
+def test_trading_at_a_generated_port(source):
+    world = World.generate(200, seed=1)
+    engine = GameEngine.new_game("Test", "cash", world=world)
+    market = economy = None
+    if source is not None:
+        made = source()
+        if isinstance(made, NpcEconomy):
+            engine.economy = economy = made
+        else:
+            engine.market = market = made
+    port = world.ports[100]
+    assert world.port(port.name) is port and port.prices is not None
+    engine.state.current_port = port
+
+    # Sources that do not cover the port fall back to its own base prices.
+    base = port.base_price(Commodity.SILK)
+    price = engine.get_price(Commodity.SILK)
+    assert abs(price - base) <= 2
+    assert _quote(engine, Commodity.SILK) == price
+    assert _expected_price(engine, Commodity.SILK, port) == base
+    best_trade(engine)
+
+    assert engine.buy_cargo(Commodity.SILK, 10)
+    assert engine.sell_cargo(Commodity.SILK, 10)
+    if isinstance(market, OrderBuffer):
+        market.release()
+        market = market.market
+    if market is not None:
+        assert not market._orders
+        market.tick()
+    if economy is not None:
+        economy.step()
+
+
+def test_nearest_ports_agree_with_a_scan_at_any_depth():
+    world = World.generate(2000, seed=2)
+    here = world.ports[50]
+    others = [p for p in world.ports if p.name not in ("At Sea", here.name)]
+    others.sort(key=lambda p: (math.hypot(p.x - here.x, p.y - here.y), p.index))
+    for k in (1, 10, 500, len(others)):
+        assert world.nearest(here, k) == others[:k]